@@ -1,28 +1,25 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from dataclasses import dataclass
-from typing import Any
+from collections import deque
+from typing import Any, Sequence
 
+import numpy as np
 from mesa import Agent
 
+# v0.8.3: Lainat sarakkeina; LoanRecord on näkymä lainakannan riviin
+from agents.loans import (
+    ACTIVE,
+    DEFAULTED,
+    REPAID,
+    LoanArchive,
+    LoanBook,
+    LoanRecord,
+    annuity_factor,
+    annuity_payment,
+    annuity_payments,
+)
 
-@dataclass
-class LoanRecord:
-    borrower: Any
-    borrower_type: str
-    balance: float
-    annual_rate: float
-    term_months: int
-    remaining_term: int
-    status: str = "active"
-    age_months: int = 0
-    purpose: str = "general"
-    original_balance: float = 0.0
-
-    @property
-    def monthly_rate(self) -> float:
-        return self.annual_rate / 12.0
+__all__ = ["BankAgent", "LoanArchive", "LoanBook", "LoanRecord"]
 
 
 class BankAgent(Agent):
@@ -49,7 +46,6 @@ class BankAgent(Agent):
         self.initial_equity: float = float(config.get("initial_equity", 100000.0))
 
         self.deposit_rate_monthly: float = self.deposit_rate_annual / 12.0
-        self.loans: list[LoanRecord] = []
         self.total_loans: float = 0.0
         self.total_deposits: float = 0.0
         self.total_defaulted: float = 0.0
@@ -57,13 +53,20 @@ class BankAgent(Agent):
         self.cash_reserves: float = self.initial_equity
         self.stop_lending: bool = False
         self.loan_metrics: dict[str, float] = {}
-        self.loan_metrics_history: list[dict[str, float]] = []
+        # v0.8.3: Mittarihistorian säilytys (None = koko ajo) ja suljettujen lainojen arkisto
+        history_months = config.get("metrics_history_months")
+        self.loan_metrics_history: list[dict[str, float]] | deque[dict[str, float]] = (
+            [] if history_months is None else deque(maxlen=max(1, int(history_months)))
+        )
+        self.loan_archive: LoanArchive | None = LoanArchive() if config.get("loan_archive", True) else None
         self._loan_age_buckets: tuple[tuple[str, int, float], ...] = (
             ("0_6", 0, 6),
             ("6_12", 6, 12),
             ("12_24", 12, 24),
             ("24_plus", 24, float("inf")),
         )
+        # v0.8.3: Lainakanta ylläpitää mittarien summat ikäluokittain (ks. PortfolioTotals)
+        self.loans: LoanBook = LoanBook(age_bucket_starts=[start for _, start, _ in self._loan_age_buckets])
 
         # Mittarit viimeiseltä stepiltä (debug)
         self.last_interest_income: float = 0.0
@@ -97,17 +100,14 @@ class BankAgent(Agent):
             return False
 
         rate = self._loan_rate_for(borrower_type)
-        record = LoanRecord(
+        self.loans.add(
             borrower=borrower,
             borrower_type=borrower_type,
             balance=amount,
             annual_rate=rate,
             term_months=term_months,
-            remaining_term=term_months,
             purpose=purpose,
-            original_balance=amount,
         )
-        self.loans.append(record)
 
         self.total_loans += amount
         self.total_deposits += amount
@@ -116,6 +116,177 @@ class BankAgent(Agent):
         self._update_loan_metrics()
         return True
 
+    def request_loans_batch(
+        self,
+        borrowers: Sequence[Any],
+        amounts: np.ndarray,
+        borrower_types: str | Sequence[str] = "household",
+        term_months: int | np.ndarray = 24,
+        purposes: str | Sequence[str] = "general",
+        priority: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """v0.8.3: Käsittele joukko lainahakemuksia kerralla; palauttaa hyväksytyt (bool, syöttöjärjestys).
+
+        Hakijakohtaiset ehdot (tulot, LTI, velanhoitosuhde, asuntolainan
+        stressitesti, startup-ehdot) lasketaan vektoroituna. Pääoma- ja
+        likviditeettiehdot riippuvat jo hyväksytyistä lainoista, joten ne
+        tarkistetaan prioriteettijärjestyksessä (suurin `priority` ensin,
+        tasatilanteessa syöttöjärjestys) juoksevilla summilla. Tulos on sama
+        kuin `request_loan`-kutsuilla samassa järjestyksessä; mittarit
+        päivitetään kerran erän lopuksi.
+        """
+        n = len(borrowers)
+        approved = np.zeros(n, dtype=bool)
+        if n == 0:
+            return approved
+        amounts = np.asarray(amounts, dtype=np.float64)
+        types = np.broadcast_to(np.asarray(borrower_types, dtype=object), (n,))
+        purposes_arr = np.broadcast_to(np.asarray(purposes, dtype=object), (n,))
+        terms = np.broadcast_to(np.asarray(term_months, dtype=np.int64), (n,))
+        terms = np.where(terms <= 0, 12, terms)
+        if self.stop_lending:
+            return approved
+
+        household = types == "household"
+        firm = types == "firm"
+        mortgage = household & (purposes_arr == "mortgage")
+        startup = firm & (purposes_arr == "startup")
+        consumer = household & ~mortgage
+        ok = amounts > 0
+        incomes, debts = self._batch_incomes_and_debts(borrowers, household)
+        ok &= ~household | (incomes > 0)
+
+        # Asuntolainat: LTI 4.5x vuositulot ja stressitesti (korko + 2 %, max 35 % tuloista)
+        stressed_rate = (self._loan_rate_for("household") + 0.02) / 12.0
+        stressed_payment = self._cached_annuity_payments(amounts, np.full(n, stressed_rate), terms, mortgage)
+        ok &= ~mortgage | ((amounts <= incomes * 12 * 4.5) & (stressed_payment <= incomes * 0.35))
+
+        # Kulutusluotot: velanhoitosuhde (LTI tarkistetaan juoksevalla velalla alla)
+        household_rate = self._loan_rate_for("household") / 12.0
+        payment = self._cached_annuity_payments(amounts, np.full(n, household_rate), terms, consumer)
+        ok &= ~consumer | (payment <= self.max_debt_service_ratio * incomes)
+        max_by_income = self.max_loan_to_income * incomes * 12.0
+
+        # Startup-yritysluotot: omaa pääomaa ja laina enintään 3x oma pääoma
+        for i in np.flatnonzero(startup & ok).tolist():
+            firm_equity = getattr(borrowers[i], "equity", 0.0)
+            ok[i] = firm_equity > 0 and amounts[i] <= firm_equity * 3.0
+        needs_liquidity = ~(mortgage | startup)
+
+        if priority is None:
+            order = np.arange(n)
+        else:
+            order = np.argsort(-np.asarray(priority, dtype=np.float64), kind="stable")
+        total_loans, total_deposits = self.total_loans, self.total_deposits
+        added_debt: dict[int, float] = {}
+        for i in order[ok[order]].tolist():
+            amount = float(amounts[i])
+            projected_loans = total_loans + amount
+            if projected_loans > 0 and self.equity / projected_loans < self.capital_ratio_min:
+                continue
+            if consumer[i] and debts[i] + added_debt.get(id(borrowers[i]), 0.0) + amount > max_by_income[i]:
+                continue
+            if (
+                needs_liquidity[i]
+                and self.deposit_rate_monthly > 0
+                and self.cash_reserves < total_deposits * self.deposit_rate_monthly * self.liquidity_buffer_months
+            ):
+                continue
+            total_loans += amount
+            total_deposits += amount
+            if household[i]:
+                added_debt[id(borrowers[i])] = added_debt.get(id(borrowers[i]), 0.0) + amount
+            approved[i] = True
+
+            borrower = borrowers[i]
+            self.loans.add(
+                borrower=borrower,
+                borrower_type=str(types[i]),
+                balance=amount,
+                annual_rate=self._loan_rate_for(str(types[i])),
+                term_months=int(terms[i]),
+                purpose=str(purposes_arr[i]),
+            )
+            self.total_loans += amount
+            self.total_deposits += amount
+            borrower.receive_loan(amount)
+            borrower.increase_debt(amount)
+
+        if approved.any():
+            self._update_loan_metrics()
+        return approved
+
+    def _batch_incomes_and_debts(
+        self, borrowers: Sequence[Any], household: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Kotitaloushakijoiden odotetut kuukausitulot ja velat; populaation riveiltä sarakkeina."""
+        n = len(borrowers)
+        incomes = np.zeros(n, dtype=np.float64)
+        debts = np.zeros(n, dtype=np.float64)
+        population = getattr(self.model, "household_population", None)
+        rows = np.array([LoanBook._population_row(b) for b in borrowers], dtype=np.int64)
+        ids = np.array([getattr(b, "unique_id", -1) for b in borrowers], dtype=np.int64)
+        columnar = household & (rows >= 0)
+        if population is not None and columnar.any():
+            candidate = np.flatnonzero(columnar)
+            in_range = rows[candidate] < population.size
+            candidate = candidate[in_range]
+            candidate = candidate[population.agent_id[rows[candidate]] == ids[candidate]]
+            columnar[:] = False
+            columnar[candidate] = True
+            pop_rows = rows[candidate]
+            benefit = getattr(self.model, "unemployment_benefit", 0.0)
+            incomes[candidate] = np.where(population.employed[pop_rows], population.wage[pop_rows], benefit)
+            debts[candidate] = population.debt[pop_rows]
+        else:
+            columnar[:] = False
+        for i in np.flatnonzero(household & ~columnar).tolist():
+            incomes[i] = getattr(borrowers[i], "expected_monthly_income", lambda: 0.0)()
+            debts[i] = getattr(borrowers[i], "debt", 0.0)
+        return incomes, debts
+
+    @staticmethod
+    def _cached_annuity_payments(
+        amounts: np.ndarray, monthly_rates: np.ndarray, terms: np.ndarray, mask: np.ndarray
+    ) -> np.ndarray:
+        """Erät maskatuille riveille jaetuista annuiteettikertoimista (sama kuin `_annuity_payment`)."""
+        payments = np.zeros(amounts.size, dtype=np.float64)
+        rows = np.flatnonzero(mask)
+        if rows.size == 0:
+            return payments
+        keys = np.stack([monthly_rates[rows], terms[rows].astype(np.float64)])
+        pairs, inverse = np.unique(keys, axis=1, return_inverse=True)
+        for k, (rate, term) in enumerate(pairs.T.tolist()):
+            selected = rows[inverse.ravel() == k]
+            if rate <= 0:
+                payments[selected] = amounts[selected] / max(int(term), 1)
+            else:
+                payments[selected] = amounts[selected] * annuity_factor(rate, int(term))
+        return payments
+
+    def set_bounded_memory(self, history_months: int) -> None:
+        """v0.8.3: Ei lainarkistoa ja enintään `history_months` mittaririviä muistissa.
+
+        Päättyneiden lainojen vaikutus mittareihin säilyy: epäsuoriutuneiden
+        lainojen alkuperäiset pääomat jäävät salkun tilasummiin.
+        """
+        self.loan_archive = None
+        maxlen = max(1, int(history_months))
+        current = getattr(self.loan_metrics_history, "maxlen", None)
+        if current is not None:
+            maxlen = min(maxlen, current)
+        self.loan_metrics_history = deque(self.loan_metrics_history, maxlen=maxlen)
+
+    def prune_closed_loans(self) -> None:
+        """Siirrä maksetut ja epäsuoriutuneet lainat pois lainakannasta (järjestys säilyy).
+
+        Rivit kirjataan arkistoon, jos se on käytössä. Epäsuoriutuneiden
+        lainojen alkuperäiset pääomat jäävät salkun tilasummiin.
+        """
+        book = self.loans
+        month = getattr(self.model, "month", 0)
+        book.compact(book.column("status") == ACTIVE, archive=self.loan_archive, month=month)
+
     def record_new_deposit(self, amount: float) -> None:
         if amount <= 0:
             return
@@ -131,71 +302,108 @@ class BankAgent(Agent):
         self._pay_deposit_interest()
         self._update_stop_lending_flag()
         self._update_loan_metrics(log_snapshot=True)
+        self.prune_closed_loans()
 
     # --- Sisäiset apurit ---
     def _collect_payments(self) -> None:
-        for loan in list(self.loans):
-            if loan.status != "active":
-                continue
-            if loan.balance <= 1e-6:
-                loan.status = "repaid"
-                continue
-
-            if loan.age_months == 0:
-                loan.age_months += 1
-                continue
-
-            payment_target = self._annuity_payment(loan.balance, loan.monthly_rate, loan.remaining_term)
-            interest_due = loan.balance * loan.monthly_rate
-            principal_due = max(payment_target - interest_due, 0.0)
-            total_due = interest_due + principal_due
-
-            paid = loan.borrower.pay_debt(total_due)
-            if paid + 1e-9 < interest_due:
-                self._apply_default(loan)
-                continue
-
-            interest_paid = min(interest_due, paid)
-            principal_paid = max(0.0, paid - interest_paid)
-
-            loan.balance -= principal_paid
-            loan.remaining_term = max(loan.remaining_term - 1, 0)
-            loan.age_months += 1
-            loan.borrower.decrease_debt(principal_paid)
-
-            self.total_loans = max(0.0, self.total_loans - principal_paid)
-            self.total_deposits = max(0.0, self.total_deposits - paid)
-            self.cash_reserves += paid
-            self.equity += interest_paid
-            self.last_interest_income += interest_paid
-
-            if loan.balance <= 1e-6 or loan.remaining_term <= 0:
-                loan.status = "repaid"
+        """Kuukauden lyhennykset ja korot koko lainakannalle kerralla.
+
+        Sama sääntö kuin lainakohtaisesti: ensimmäinen kuukausi on
+        armahduskuukausi, annuiteettierä peritään lainanottajalta, ja jos
+        maksu ei kata korkoa, laina epäsuoriutuu. Saman lainanottajan lainat
+        maksetaan lainakannan järjestyksessä niin kauan kuin käteistä riittää.
+        Lainanottajien kassat ja velat päivitetään yhdellä hajautuksella.
+        Salkun summat päivitetään aktiivisten rivien vanhan ja uuden tilan
+        erotuksena, joten ikäluokkien vaihdokset tulevat samalla.
+        """
+        book = self.loans
+        with book.updating(book.active_rows()):
+            self._amortize_active_loans()
+        # Lyhennykset muuttivat eriä: lainanottajakohtaiset erät kerralla uusiksi
+        book.refresh_scheduled_payments()
         self._update_loan_metrics()
 
-    def _apply_default(self, loan: LoanRecord) -> None:
-        balance = loan.balance
-        loss = balance * (1.0 - self.default_recovery_rate)
-        recovery = balance * self.default_recovery_rate
+    def _amortize_active_loans(self) -> None:
+        book = self.loans
+        status = book.column("status")
+        balance = book.column("balance")
+        active = status == ACTIVE
+        paid_off = active & (balance <= 1e-6)
+        book.set_status(np.flatnonzero(paid_off), REPAID, refresh=False)
+        active &= ~paid_off
+
+        ages = book.column("age_months")
+        grace = active & (ages == 0)
+        ages[grace] = 1
+        rows = np.flatnonzero(active & ~grace)
+        if rows.size == 0:
+            return
 
-        self.total_loans = max(0.0, self.total_loans - balance)
-        self.cash_reserves += recovery
-        self.equity -= loss
+        loan_balance = balance[rows]
+        monthly_rate = book.annual_rate[rows] / 12.0
+        remaining_term = book.remaining_term[rows]
+        # Erä lainan omasta sarakkeesta; viimeinen erä saldosta, ettei pyöristysjäämää jää
+        payment_target = book.installment[rows].copy()
+        last = remaining_term <= 1
+        if last.any():
+            payment_target[last] = annuity_payments(loan_balance[last], monthly_rate[last], remaining_term[last])
+        interest_due = loan_balance * monthly_rate
+        principal_due = np.maximum(payment_target - interest_due, 0.0)
+        total_due = interest_due + principal_due
+
+        payers = _PayerGroups(self, rows)
+        paid = payers.allocate(total_due)
+
+        defaulted = paid + 1e-9 < interest_due
+        performing = ~defaulted
+        interest_paid = np.where(performing, np.minimum(interest_due, paid), 0.0)
+        principal_paid = np.where(performing, np.maximum(0.0, paid - np.minimum(interest_due, paid)), 0.0)
+        payers.settle(paid, np.where(defaulted, loan_balance, principal_paid))
+
+        # Maksukyvyttömyydet: vakuudesta palautuu osa, loppu on tappiota
+        defaulted_balance = float(loan_balance[defaulted].sum())
+        loss = defaulted_balance * (1.0 - self.default_recovery_rate)
+        recovery = defaulted_balance * self.default_recovery_rate
+        received = float(paid[performing].sum())
+        interest_income = float(interest_paid.sum())
+
+        self.total_loans = max(0.0, self.total_loans - float(principal_paid.sum()) - defaulted_balance)
+        self.total_deposits = max(0.0, self.total_deposits - received)
+        self.cash_reserves += received + recovery
+        self.equity += interest_income - loss
         self.total_defaulted += loss
         self.last_defaults += loss
-
-        loan.borrower.decrease_debt(balance)
-        loan.balance = 0.0
-        loan.remaining_term = 0
-        loan.status = "defaulted"
-        self._update_loan_metrics()
+        self.last_interest_income += interest_income
+
+        defaulted_rows = rows[defaulted]
+        balance[defaulted_rows] = 0.0
+        book.remaining_term[defaulted_rows] = 0
+        book.set_status(defaulted_rows, DEFAULTED, refresh=False)
+
+        performing_rows = rows[performing]
+        balance[performing_rows] = loan_balance[performing] - principal_paid[performing]
+        terms_left = np.maximum(remaining_term[performing] - 1, 0)
+        book.remaining_term[performing_rows] = terms_left
+        ages[performing_rows] += 1
+        finished = (balance[performing_rows] <= 1e-6) | (terms_left <= 0)
+        book.set_status(performing_rows[finished], REPAID, refresh=False)
+        # Vajaa maksu muuttaa maksusuunnitelmaa: erä lasketaan uudelleen
+        partial = (paid[performing] + 1e-9 < total_due[performing]) & ~finished
+        book.reschedule(performing_rows[partial])
 
     def _pay_deposit_interest(self) -> None:
         if self.deposit_rate_monthly <= 0 or self.total_deposits <= 0:
             return
 
         total_interest = 0.0
-        for hh in getattr(self.model, "households", []):
+        if getattr(self.model, "household_engine", "agents") == "vectorized":
+            total_interest += self.model.household_population.pay_deposit_interest(
+                self.deposit_rate_monthly
+            )
+            households = []
+        else:
+            households = getattr(self.model, "households", [])
+        for hh in households:
             if not getattr(hh, "alive", True):
                 continue
             if hh.cash <= 0:
@@ -330,11 +538,19 @@ class BankAgent(Agent):
             firm: Konkurssiin mennyt yritys
             recovery_value: Konkurssipesän arvo (varat)
         """
-        # Etsi yrityksen lainat
-        firm_loans = [loan for loan in self.loans if loan.borrower == firm and loan.status == "active"]
-        
-        for loan in firm_loans:
-            balance = loan.balance
+        # Etsi yrityksen lainat lainanottajaindeksistä
+        book = self.loans
+        firm_loans = book.rows_for(getattr(firm, "unique_id", -1))
+        with book.updating(firm_loans):
+            self._write_off_firm_loans(firm_loans, recovery_value)
+            book.set_status(firm_loans, DEFAULTED)
+
+        self._update_loan_metrics()
+
+    def _write_off_firm_loans(self, firm_loans: np.ndarray, recovery_value: float) -> None:
+        book = self.loans
+        for row in firm_loans.tolist():
+            balance = float(book.balance[row])
             # Recovery jakautuu suhteellisesti velkojien kesken (tässä vain pankki)
             recovery = min(recovery_value, balance)
             loss = balance - recovery
@@ -346,11 +562,8 @@ class BankAgent(Agent):
             self.total_defaulted += loss
             
             # Merkitse laina epäsuoriutuneeksi
-            loan.balance = 0.0
-            loan.remaining_term = 0
-            loan.status = "defaulted"
-        
-        self._update_loan_metrics()
+            book.balance[row] = 0.0
+            book.remaining_term[row] = 0
 
     def _liquidity_stressed(self) -> bool:
         if self.deposit_rate_monthly <= 0:
@@ -365,21 +578,47 @@ class BankAgent(Agent):
         return self.loan_rate_base_annual + self.household_spread
 
     def expected_payment_for(self, borrower: Any) -> float:
-        total = 0.0
-        for loan in self.loans:
-            if loan.borrower is not borrower or loan.status != "active":
-                continue
-            total += self._annuity_payment(loan.balance, loan.monthly_rate, max(loan.remaining_term, 1))
-        return total
+        """Lainanottajan aktiivisten lainojen kuukausierä lainanottajaindeksistä (O(1))."""
+        return self.loans.scheduled_payment(getattr(borrower, "unique_id", -1))
+
+    def expected_payments_by_row(self, n_rows: int) -> np.ndarray:
+        """Kotitalouksien odotetut kuukausierät populaation rivijärjestyksessä.
+
+        Vastaa `expected_payment_for`-kutsua jokaiselle kotitaloudelle:
+        rivin id:llä haetaan lainanottajakohtainen erä suoraan.
+        """
+        population = getattr(self.model, "household_population", None)
+        if population is None:
+            return np.zeros(n_rows, dtype=np.float64)
+        payments = np.zeros(n_rows, dtype=np.float64)
+        n = min(n_rows, population.size)
+        payments[:n] = self.loans.scheduled_payments(population.agent_id[:n])
+        return payments
+
+    def _valid_population_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Lainojen kotitalousrivit populaatiossa; -1, jos lainanottaja ei ole (enää) rivillä.
+
+        Rivi on voimassa, kun populaation id-sarake vastaa lainanottajan id:tä
+        (rajatun muistin tilassa kuolleen rivi vapautetaan ja käytetään uudelleen).
+        """
+        book = self.loans
+        population_rows = book.borrower_row[rows].copy()
+        population = getattr(self.model, "household_population", None)
+        if population is None:
+            population_rows[:] = -1
+            return population_rows
+        candidate = (population_rows >= 0) & (population_rows < population.size)
+        candidate_rows = population_rows[candidate]
+        matches = population.agent_id[candidate_rows] == book.borrower_id[rows[candidate]]
+        valid = np.zeros(rows.size, dtype=bool)
+        valid[np.flatnonzero(candidate)[matches]] = True
+        population_rows[~valid] = -1
+        return population_rows
 
     @staticmethod
     def _annuity_payment(balance: float, monthly_rate: float, term_months: int) -> float:
-        term_months = max(term_months, 1)
-        if monthly_rate <= 0:
-            return balance / term_months
-
-        factor = (monthly_rate * (1 + monthly_rate) ** term_months) / ((1 + monthly_rate) ** term_months - 1)
-        return balance * factor
+        # v0.8.3: Kerroin jaetusta (korko, laina-aika) -välimuistista
+        return annuity_payment(balance, monthly_rate, term_months)
 
     def _estimate_initial_deposits(self) -> float:
         households = getattr(self.model, "households", [])
@@ -402,23 +641,28 @@ class BankAgent(Agent):
 
     @property
     def active_loans(self) -> list[LoanRecord]:
-        return [loan for loan in self.loans if loan.status == "active"]
+        return [self.loans.view(int(row)) for row in self.loans.active_rows()]
 
     def _update_loan_metrics(self, log_snapshot: bool = False) -> None:
-        active_loans = [loan for loan in self.loans if loan.status == "active" and loan.balance > 0]
-        outstanding_balance = sum(loan.balance for loan in active_loans)
-        defaulted_balance = sum(loan.original_balance for loan in self.loans if loan.status == "defaulted")
+        """Mittarit lainakannan juoksevista summista (O(ikäluokat + tarkoitukset))."""
+        book = self.loans
+        totals = book.totals
+        outstanding_balance = totals.active_balance
+        defaulted_balance = float(totals.status_original_balance[DEFAULTED])
         denominator = outstanding_balance + defaulted_balance
         performing_share = outstanding_balance / denominator if denominator > 0 else 1.0
-        avg_age = sum(loan.age_months for loan in active_loans) / len(active_loans) if active_loans else 0.0
+        avg_age = totals.active_age_sum / totals.active_count if totals.active_count else 0.0
 
-        bucket_totals: dict[str, float] = {f"age_bucket_{label}_share": 0.0 for label, _, _ in self._loan_age_buckets}
-        purpose_totals: dict[str, float] = defaultdict(float)
-        for loan in active_loans:
-            label = self._loan_age_bucket_label(loan.age_months)
-            bucket_key = f"age_bucket_{label}_share"
-            bucket_totals[bucket_key] += loan.balance
-            purpose_totals[f"purpose_{loan.purpose}_share"] += loan.balance
+        # Ikäluokat: [0, 6), [6, 12), [12, 24), [24, inf)
+        bucket_totals: dict[str, float] = {
+            f"age_bucket_{label}_share": float(total)
+            for (label, _, _), total in zip(self._loan_age_buckets, totals.bucket_balance)
+        }
+        codes = totals.active_purposes()
+        purpose_totals: dict[str, float] = {
+            f"purpose_{name}_share": float(totals.purpose_balance[code])
+            for name, code in zip(book.purpose_names(codes), codes)
+        }
 
         if outstanding_balance > 0:
             for key in bucket_totals:
@@ -444,4 +688,77 @@ class BankAgent(Agent):
         for label, start, end in self._loan_age_buckets:
             if start <= age_months < end:
                 return label
-        return self._loan_age_buckets[-1][0]
\ No newline at end of file
+        return self._loan_age_buckets[-1][0]
+
+class _PayerGroups:
+    """v0.8.3: Kuukauden maksuerien maksajat ryhmiteltyinä.
+
+    Kotitaloudet, joiden rivi on populaatiossa, päivitetään suoraan
+    sarakkeisiin; muut lainanottajat (yritykset, irrotetut kuolleet
+    kotitaloudet) olioina `pay_debt`/`decrease_debt`-kutsuilla kerran
+    kuukaudessa.
+    """
+
+    def __init__(self, bank: BankAgent, rows: np.ndarray) -> None:
+        book = bank.loans
+        self.population = getattr(bank.model, "household_population", None)
+        self.n_rows = self.population.size if self.population is not None else 0
+        keys = bank._valid_population_rows(rows)
+        self.objects: list[Any] = []
+        index: dict[int, int] = {}
+        for i in np.flatnonzero(keys < 0):
+            borrower = book.borrowers[rows[i]]
+            key = index.get(id(borrower))
+            if key is None:
+                key = index[id(borrower)] = len(self.objects)
+                self.objects.append(borrower)
+            keys[i] = self.n_rows + key
+        self.keys = keys
+        self.n_keys = self.n_rows + len(self.objects)
+        object_cash = np.array([borrower.cash for borrower in self.objects], dtype=np.float64)
+        if self.population is not None:
+            self.cash = np.concatenate((self.population.cash[: self.n_rows], object_cash))
+        else:
+            self.cash = object_cash
+
+    def allocate(self, due: np.ndarray) -> np.ndarray:
+        """Maksetut summat lainoittain: kuten peräkkäiset `pay_debt`-kutsut lainajärjestyksessä."""
+        keys = self.keys
+        due_by_payer = np.bincount(keys, weights=due, minlength=self.n_keys)
+        paid = due.copy()
+        short = np.flatnonzero((self.cash < due_by_payer)[keys])
+        if short.size == 0:
+            return paid
+        # Käteinen ei riitä kaikkiin eriin: aiemmat lainat maksetaan ensin
+        order = short[np.argsort(keys[short], kind="stable")]
+        payer = keys[order]
+        amount = due[order]
+        starts = np.ones(order.size, dtype=bool)
+        starts[1:] = payer[1:] != payer[:-1]
+        group = np.cumsum(starts) - 1
+        before = np.cumsum(amount) - amount
+        before -= before[starts][group]
+        cash = self.cash[payer]
+        allocated = np.minimum(amount, np.maximum(cash - before, 0.0))
+        # Negatiivinen kassa: ensimmäinen erä "maksaa" kassan nollaan (min(kassa, erä))
+        overdrawn = starts & (cash < 0)
+        allocated[overdrawn] = cash[overdrawn]
+        paid[order] = allocated
+        return paid
+
+    def settle(self, paid: np.ndarray, debt_reduction: np.ndarray) -> None:
+        """Veloita maksut ja vähennä velat yhdellä hajautuksella."""
+        keys = self.keys
+        paid_by = np.bincount(keys, weights=paid, minlength=self.n_keys)
+        reduced_by = np.bincount(keys, weights=debt_reduction, minlength=self.n_keys)
+        if self.population is not None and self.n_rows:
+            population = self.population
+            rows = np.flatnonzero(np.bincount(keys[keys < self.n_rows], minlength=self.n_rows))
+            population.cash[rows] -= paid_by[rows]
+            population.debt_service_reserve[rows] = np.maximum(
+                0.0, population.debt_service_reserve[rows] - paid_by[rows]
+            )
+            population.debt[rows] = np.maximum(0.0, population.debt[rows] - reduced_by[rows])
+        for i, borrower in enumerate(self.objects):
+            borrower.pay_debt(float(paid_by[self.n_rows + i]))
+            borrower.decrease_debt(float(reduced_by[self.n_rows + i]))
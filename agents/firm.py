@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from mesa import Agent
 
+from markets.labor import EmployeeRoster
+
 
 @dataclass
 class ConstructionProject:
@@ -72,8 +74,12 @@ class FirmAgent(Agent):
         self.alive: bool = True  # Onko yritys toiminnassa
         self.founded_month: int = model.month  # Milloin perustettu
         self.is_startup: bool = owner is not None  # Onko uusi yrittäjäyritys
+        aggregates = getattr(model, "aggregates", None)
+        if aggregates is not None:
+            aggregates.on_firm_opened()
         # v0.7: Työvoima
-        self.employees: list["HouseholdAgent"] = []
+        # v0.8.3: Työntekijärekisteri, O(1) poisto (markets.labor)
+        self.employees: EmployeeRoster = EmployeeRoster()
         self.target_employees: int = 0
         
         # v0.7: Rakennusliike-spesifit kentät
@@ -253,7 +259,12 @@ class FirmAgent(Agent):
     
     def _go_bankrupt(self) -> None:
         """Suorita konkurssi."""
+        if not self.alive:
+            return
         self.alive = False
+        aggregates = getattr(self.model, "aggregates", None)
+        if aggregates is not None:
+            aggregates.on_firm_closed()
         
         # Ilmoita omistajalle (jos yrittäjäyritys)
         if self.owner is not None:
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Callable
 
 from mesa import Agent
 
+from agents.population import HouseholdPopulation, PopulationColumn
+
 if TYPE_CHECKING:  # pragma: no cover - vain tyyppitarkistukseen
     from core.model import EconomyModel
     from markets.housing import Dwelling
@@ -18,6 +20,23 @@ class HouseholdAgent(Agent):
     - Päätös: kuluta vs. säästä
     """
 
+    # v0.8.2: Numeerinen tila asuu HouseholdPopulation-sarakkeissa, agentti on näkymä riviin
+    age = PopulationColumn(int)
+    employed = PopulationColumn(bool)
+    alive = PopulationColumn(bool)
+    cash = PopulationColumn(float)
+    real_estate_value = PopulationColumn(float)
+    business_equity = PopulationColumn(float)
+    debt = PopulationColumn(float)
+    entrepreneur = PopulationColumn(bool)
+    household_size = PopulationColumn(int)
+    num_children = PopulationColumn(int)
+    wage = PopulationColumn(float)
+    base_propensity_to_consume = PopulationColumn(float)
+    debt_service_reserve = PopulationColumn(float)
+    # v0.8.3: Kuluvan kuukauden työnhakijajonossa (markets.labor)
+    job_seeker = PopulationColumn(bool)
+
     def __init__(
         self,
         model: EconomyModel,
@@ -28,41 +47,86 @@ class HouseholdAgent(Agent):
     ):  # type: ignore[no-untyped-def]
         super().__init__(model)
         self.model: EconomyModel = model
-        self.age: int = age
+        population = getattr(model, "household_population", None)
+        if population is None:
+            population = HouseholdPopulation(model)
+            model.household_population = population
+        self._population: HouseholdPopulation = population
+        self._row: int = population.add_row(self)
+        self._dwelling: Dwelling | None = None
+        self._employer: FirmAgent | None = None
+
+        self.age = age
         # v0.7: Työllisyys ja palkka määräytyvät työmarkkinan kautta, eivät iän mukaan
-        self.employed: bool = False
-        self.alive: bool = True
+        self.employed = False
+        self.alive = True
 
         # Tase (v0.2: yksinkertainen versio)
-        self.cash: float = initial_cash
-        self.real_estate_value: float = 0.0  # Placeholder asunnoille
-        self.business_equity: float = 0.0  # Placeholder yrityksille
-        self.debt: float = 0.0  # Placeholder veloille
+        self.cash = initial_cash
+        self.real_estate_value = 0.0  # Placeholder asunnoille
+        self.business_equity = 0.0  # Placeholder yrityksille
+        self.debt = 0.0  # Placeholder veloille
         
         # v0.6: Yrittäjyys
         self.owned_firm: FirmAgent | None = None  # Viite FirmAgent:iin (jos omistaa yrityksen)
-        self.entrepreneur: bool = False  # Onko yrittäjä
+        self.entrepreneur = False  # Onko yrittäjä
 
         # v0.5: Kotitalouden koko ja asuminen
-        self.household_size: int = household_size  # Montako henkilöä kotitaloudessa
-        self.num_children: int = 0  # Lasten määrä
-        self.dwelling: Dwelling | None = None  # Viite Dwelling-objektiin (markets.housing) tai None
-        self.employer: FirmAgent | None = None  # Viite FirmAgent:iin (työnantaja)
+        self.household_size = household_size  # Montako henkilöä kotitaloudessa
+        self.num_children = 0  # Lasten määrä
+        self.dwelling = None  # Viite Dwelling-objektiin (markets.housing) tai None
+        self.employer = None  # Viite FirmAgent:iin (työnantaja)
         # v0.7: Henkilökohtainen palkkataso työnantajalta
-        self.wage: float = 0.0
-
-        self.base_propensity_to_consume: float = propensity
-        self.debt_service_reserve: float = 0.0
-        self.debt_service_income_share: float = getattr(
-            model,
-            "household_debt_service_income_share",
-            0.0,
-        )
-        self.debt_service_buffer_multiplier: float = getattr(
-            model,
-            "household_debt_service_buffer_multiplier",
-            1.0,
-        )
+        self.wage = 0.0
+
+        self.base_propensity_to_consume = propensity
+        self.debt_service_reserve = 0.0
+        # v0.8.3: Kohdennetut perilliset (households.inheritance: children)
+        self.heirs: list[HouseholdAgent] = []
+
+        # v0.8.3: Harvinaisten tapahtumien kellot (simulation.rare_events: calendar)
+        calendar = getattr(model, "event_calendar", None)
+        if calendar is not None:
+            calendar.add(self)
+
+    @property
+    def dwelling(self) -> Dwelling | None:
+        return self._dwelling
+
+    @dwelling.setter
+    def dwelling(self, value: Dwelling | None) -> None:
+        self._dwelling = value
+        self._population.set_tracked("dwelling_id", self._row, -1 if value is None else value.id)
+
+    # Luetaan mallilta joka kerta, jotta kesken ajon tehdyt muutokset
+    # (core.overrides) koskevat myös jo olemassa olevia kotitalouksia.
+    @property
+    def debt_service_income_share(self) -> float:
+        return getattr(self.model, "household_debt_service_income_share", 0.0)
+
+    @property
+    def debt_service_buffer_multiplier(self) -> float:
+        return getattr(self.model, "household_debt_service_buffer_multiplier", 1.0)
+
+    @property
+    def employer(self) -> FirmAgent | None:
+        return self._employer
+
+    @employer.setter
+    def employer(self, value: FirmAgent | None) -> None:
+        self._employer = value
+        self._population.employer_id[self._row] = -1 if value is None else value.unique_id
+
+    def _draw(self, stream: str, legacy: Callable[[], float] | None = None) -> float:
+        """v0.8.3: Tasajakautunut arvonta [0, 1).
+
+        `simulation.rng: counter` -tilassa arvo on puhdas funktio virrasta,
+        agentin id:stä ja kuukaudesta; muuten `legacy` (oletus `self.random.random`).
+        """
+        counter_rng = self.model.counter_rng
+        if counter_rng is None:
+            return (legacy or self.random.random)()
+        return counter_rng.stream(stream).random(self.unique_id, self.model.month)
 
     def receive_income(self, gross_wage: float) -> None:
         """Kotitalous saa bruttopalkan yritykseltä.
@@ -98,28 +162,17 @@ class HouseholdAgent(Agent):
         if consumption_budget <= 0:
             return 0.0
 
-        # v0.4: Osta satunnaiselta yritykseltä
-        # v0.6: Vain elossa olevat yritykset
-        # Myöhemmin: Osta halvimmalla hinnalla
-        alive_firms = [f for f in self.model.firms if f.alive]
-        if not alive_firms:
-            return 0.0
-
-        target_firm = self.random.choice(alive_firms)
-
-        if target_firm.price <= 0:
+        # v0.4: Osta satunnaiselta yritykseltä (v0.6: vain elossa olevat)
+        # v0.8.3: Reititys ja ALV hyödykemarkkinan kautta (markets.goods)
+        market = self.model.goods_market
+        actual_spent = market.purchase(self, consumption_budget)
+        if actual_spent <= 0:
             return 0.0
-
-        units_to_buy = consumption_budget / target_firm.price
-
-        # Suorita osto
-        actual_spent = target_firm.sell_goods(units_to_buy)
         self.cash -= actual_spent
         self.debt_service_reserve = min(self.debt_service_reserve, self.cash)
 
-        # ALV maksetaan heti tässä (v0.8: käytetään state.collect_vat)
+        # ALV tilitetään valtiolle kotitalousvaiheen lopussa (GoodsMarket.settle)
         vat_amount = actual_spent * self.model.vat_rate
-        self.model.state.collect_vat(vat_amount)
 
         # Palauta kulutettu summa (nettona yritykselle)
         return actual_spent - vat_amount
@@ -193,13 +246,23 @@ class HouseholdAgent(Agent):
             self.age += 1
 
         # Kuolemanriski (yksinkertaistettu)
-        import random
-        if self.age >= self.model.max_age or random.random() < self.model.death_prob_per_year / 12:
+        if self.age >= self.model.max_age or self._death_draw():
             self.die()
 
+    def _death_draw(self) -> bool:
+        calendar = self.model.event_calendar
+        if calendar is not None:
+            return calendar.is_due("death", self)
+        import random
+        return self._draw("household.death", random.random) < self.model.death_prob_per_year / 12
+
     def die(self) -> None:
         """Agentti kuolee ja perintö siirtyy."""
         self.alive = False
+        # Poistetaan elävien joukosta vaiheen lopussa (EconomyModel._compact_households)
+        self.model.households.mark_dead()
+        if self.model.event_calendar is not None:
+            self.model.event_calendar.remove(self)
         
         # v0.5: Asunto siirtyy myyntiin
         if self.dwelling is not None:
@@ -208,12 +271,9 @@ class HouseholdAgent(Agent):
                 housing_market.handle_inheritance(self)
         
         # Perintö: v0.5 parannettu versio (sisältää asunnon arvon)
+        # v0.8.3: Kirjataan kuukauden pesään, jaetaan kerralla kuukauden lopussa
         if self.net_worth > 0:
-            living_households = [h for h in self.model.households if h.alive and h != self]
-            if living_households:
-                inheritance_per_hh = self.net_worth / len(living_households)
-                for hh in living_households:
-                    hh.cash += inheritance_per_hh
+            self.model.estates.add(self.net_worth, heirs=self.heirs)
         
         # Nollataan oma varallisuus
         self.cash = 0.0
@@ -237,23 +297,39 @@ class HouseholdAgent(Agent):
         if self.num_children == 0:
             return
         
+        calendar = self.model.event_calendar
+        if calendar is not None:
+            if calendar.is_due("leave_home", self):
+                self._child_leaves_home()
+            return
+
         # Kuukausittainen todennäköisyys, että joku lapsista muuttaa pois
         leaving_home_rate = getattr(self.model, 'leaving_home_rate_per_month', 0.01)
         
-        if self.random.random() < leaving_home_rate:
-            # Lapsi muuttaa pois
-            self.household_size -= 1
-            self.num_children -= 1
-            
-            # Luodaan uusi "pesästä lentäjä" -agentti
-            young_adult = HouseholdAgent(
-                model=self.model,
-                age=self.random.randint(18, 25),
-                initial_cash=self.model.child_initial_cash,
-                propensity=self.base_propensity_to_consume,
-                household_size=1,
-            )
-            self.model.households.append(young_adult)
+        if self._draw("household.leave_home") < leaving_home_rate:
+            self._child_leaves_home()
+
+    def _child_leaves_home(self) -> None:
+        """Lapsi muuttaa pois ja muodostaa oman kotitalouden."""
+        self.household_size -= 1
+        self.num_children -= 1
+        
+        if self.model.counter_rng is not None:
+            age = 18 + int(self._draw("household.child_age") * 8)
+        else:
+            age = self.random.randint(18, 25)
+
+        # Luodaan uusi "pesästä lentäjä" -agentti
+        young_adult = HouseholdAgent(
+            model=self.model,
+            age=age,
+            initial_cash=self.model.child_initial_cash,
+            propensity=self.base_propensity_to_consume,
+            household_size=1,
+        )
+        self.model.households.append(young_adult)
+        if self.model.inheritance_mode == "children":
+            self.heirs.append(young_adult)
 
     def step(self) -> None:
         if not self.alive:
@@ -341,10 +417,19 @@ class HouseholdAgent(Agent):
         if not (25 <= self.age <= 55):
             return
         
-        entrepreneurship_rate = getattr(self.model, 'entrepreneurship_rate_per_month', 0.001)
-        if self.random.random() > entrepreneurship_rate:
-            return
+        calendar = self.model.event_calendar
+        if calendar is not None:
+            if not calendar.is_due("entrepreneurship", self):
+                return
+        else:
+            entrepreneurship_rate = getattr(self.model, 'entrepreneurship_rate_per_month', 0.001)
+            if self._draw("household.entrepreneurship") > entrepreneurship_rate:
+                return
         
+        self._found_business()
+
+    def _found_business(self) -> None:
+        """Perusta yritys, jos kassa riittää siemenpääomaan ja puskuriin."""
         # Siemenpääoma + puskuri
         seed_capital = getattr(self.model, 'firm_seed_capital', 10000.0)
         cash_buffer = getattr(self.model, 'entrepreneur_cash_buffer', 5000.0)
@@ -0,0 +1,714 @@
+"""Pankin sarakepohjainen lainakanta.
+
+v0.8.3: Lainojen tila säilytetään NumPy-sarakkeina (`LoanBook`), joten
+kuukausittainen lyhennys, korko, maksukyvyttömyydet ja mittarit voidaan
+laskea koko lainakannalle kerralla. `LoanRecord` on ohut näkymä yhteen
+riviin (kuten `HouseholdAgent` populaation riviin), joten `bank.loans[-1]`
+ja lainan kenttien luku ja kirjoitus toimivat kuten ennen.
+
+Irrallinen `LoanRecord(...)` (ei vielä lainakannassa) säilyttää arvonsa
+omassa sanakirjassaan; `LoanBook.append` kopioi ne uudelle riville.
+
+Lainakanta ylläpitää lainanottajaindeksiä (lainanottajan id -> aktiiviset
+lainat) ja lainanottajakohtaista kuukausierää. Indeksi päivittyy lainan
+myöntämisessä, tilan muuttuessa (`set_status`) ja näkymän kautta tehdyissä
+kirjoituksissa; kuukausierät lasketaan koko kannalle uudelleen lyhennysten
+jälkeen (`refresh_scheduled_payments`). Näin `BankAgent.expected_payment_for`
+ja yrityksen lainojen haku konkurssissa ovat O(1) eivätkä käy koko kantaa läpi.
+
+Jokaisella lainalla on oma kuukausieränsä (`installment`), joka lasketaan
+myönnettäessä ja uudelleen vain, kun jokin muuttaa maksusuunnitelmaa:
+osittainen maksu, näkymän kautta muutettu saldo, korko tai laina-aika
+(uudelleenjärjestely, korkotason muutos) tai `LoanBook.reschedule`.
+Täysimääräinen annuiteettierä ei muuta seuraavan kuukauden erää.
+
+Suljetut lainat siirretään kuukausittain pois työjoukosta (`LoanBook.compact`);
+`LoanArchive` säilyttää niistä vain tunnisteet, tilan, tarkoituksen,
+alkuperäisen pääoman ja sulkemiskuukauden.
+
+Salkun mittarien pohjana olevat summat (`PortfolioTotals`: saldot ikäluokittain,
+tarkoituksittain ja tiloittain) päivitetään muutoksina samoissa kohdissa, joten
+mittarien luku on O(ikäluokat + tarkoitukset) eikä vaadi koko kannan läpikäyntiä.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Iterator, Sequence
+
+import numpy as np
+
+STATUSES: tuple[str, ...] = ("active", "repaid", "defaulted")
+ACTIVE, REPAID, DEFAULTED = range(len(STATUSES))
+BORROWER_TYPES: tuple[str, ...] = ("household", "firm")
+
+
+class _Vocabulary:
+    """Merkkijonokoodit: nimi <-> pieni kokonaisluku (lainan tarkoitus, lainanottajan tyyppi)."""
+
+    def __init__(self, names: Sequence[str] = ()) -> None:
+        self.names: list[str] = []
+        self._codes: dict[str, int] = {}
+        for name in names:
+            self.code(name)
+
+    def code(self, name: str) -> int:
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+
+class LoanColumn:
+    """Deskriptori, joka lukee ja kirjoittaa lainan kentän lainakannan sarakkeeseen."""
+
+    def __init__(self, cast: Callable[[Any], Any]) -> None:
+        self.cast = cast
+        self.name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: Any, objtype: type | None = None) -> Any:
+        if obj is None:
+            return self
+        if obj._book is None:
+            return obj._values[self.name]
+        return self.cast(getattr(obj._book, self.name)[obj._row])
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        if obj._book is None:
+            obj._values[self.name] = self.cast(value)
+        else:
+            with obj._book.updating(np.array([obj._row])):
+                getattr(obj._book, self.name)[obj._row] = value
+            obj._book._on_field_write(obj._row, self.name)
+
+
+class LoanCodeColumn(LoanColumn):
+    """Koodattu merkkijonokenttä (tila, tarkoitus, lainanottajan tyyppi)."""
+
+    def __get__(self, obj: Any, objtype: type | None = None) -> Any:
+        if obj is None:
+            return self
+        if obj._book is None:
+            return obj._values[self.name]
+        return obj._book.vocabulary(self.name).names[getattr(obj._book, self.name)[obj._row]]
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        if obj._book is None:
+            obj._values[self.name] = str(value)
+            return
+        code = obj._book.vocabulary(self.name).code(str(value))
+        if self.name == "status":
+            obj._book.set_status(np.array([obj._row]), code)
+        else:
+            with obj._book.updating(np.array([obj._row])):
+                getattr(obj._book, self.name)[obj._row] = code
+
+
+class LoanRecord:
+    """Yksi laina: näkymä `LoanBook`in riviin tai irrallinen arvojoukko."""
+
+    balance = LoanColumn(float)
+    annual_rate = LoanColumn(float)
+    original_balance = LoanColumn(float)
+    installment = LoanColumn(float)
+    term_months = LoanColumn(int)
+    remaining_term = LoanColumn(int)
+    age_months = LoanColumn(int)
+    status = LoanCodeColumn(str)
+    purpose = LoanCodeColumn(str)
+    borrower_type = LoanCodeColumn(str)
+
+    def __init__(
+        self,
+        borrower: Any,
+        borrower_type: str,
+        balance: float,
+        annual_rate: float,
+        term_months: int,
+        remaining_term: int,
+        status: str = "active",
+        age_months: int = 0,
+        purpose: str = "general",
+        original_balance: float = 0.0,
+    ) -> None:
+        self._book: LoanBook | None = None
+        self._row: int = -1
+        self._borrower = borrower
+        self._values: dict[str, Any] = {
+            "borrower_type": str(borrower_type),
+            "balance": float(balance),
+            "annual_rate": float(annual_rate),
+            "term_months": int(term_months),
+            "remaining_term": int(remaining_term),
+            "status": str(status),
+            "age_months": int(age_months),
+            "purpose": str(purpose),
+            "original_balance": float(original_balance),
+        }
+        self._values["installment"] = annuity_payment(float(balance), float(annual_rate) / 12.0, int(remaining_term))
+
+    @classmethod
+    def _view(cls, book: LoanBook, row: int) -> LoanRecord:
+        record = cls.__new__(cls)
+        record._book = book
+        record._row = row
+        record._values = {}
+        return record
+
+    @property
+    def borrower(self) -> Any:
+        if self._book is None:
+            return self._borrower
+        return self._book.borrowers[self._row]
+
+    @property
+    def monthly_rate(self) -> float:
+        return self.annual_rate / 12.0
+
+    def _detach(self) -> None:
+        """Kopioi arvot talteen ennen kuin rivi poistuu lainakannasta."""
+        book, row = self._book, self._row
+        self._borrower = book.borrowers[row]
+        values = {name: getattr(self, name) for name in LoanBook.RECORD_FIELDS + ("installment",)}
+        self._book = None
+        self._row = -1
+        self._values = values
+
+    def __repr__(self) -> str:
+        return (
+            f"LoanRecord(borrower_type={self.borrower_type!r}, balance={self.balance:.2f}, "
+            f"status={self.status!r}, purpose={self.purpose!r})"
+        )
+
+
+class PortfolioTotals:
+    """Lainasalkun juoksevat summat, päivitetään lainatapahtumien muutoksina.
+
+    Aktiiviseksi lasketaan laina, jonka tila on aktiivinen ja saldo positiivinen
+    (kuten mittareissa aiemmin). Ikäluokan vaihdos hoituu samalla: lainojen ikä
+    muuttuu vain kuukausittaisessa perinnässä, joka vähentää rivien vanhan
+    tilan osuuden ja lisää uuden (`LoanBook.updating`). Tilakohtaiset määrät ja
+    alkuperäiset pääomat kattavat myös tiivistyksessä poistetut suljetut lainat.
+    """
+
+    def __init__(self, age_bucket_starts: Sequence[int] = (0, 6, 12, 24)) -> None:
+        self.age_bucket_starts = np.asarray(age_bucket_starts, dtype=np.int64)
+        n_buckets = self.age_bucket_starts.size
+        self.active_count: int = 0
+        self.active_balance: float = 0.0
+        self.active_age_sum: int = 0
+        self.bucket_count = np.zeros(n_buckets, dtype=np.int64)
+        self.bucket_balance = np.zeros(n_buckets, dtype=np.float64)
+        self.purpose_count = np.zeros(8, dtype=np.int64)
+        self.purpose_balance = np.zeros(8, dtype=np.float64)
+        self.status_count = np.zeros(len(STATUSES), dtype=np.int64)
+        self.status_original_balance = np.zeros(len(STATUSES), dtype=np.float64)
+
+    def include(self, book: LoanBook, rows: np.ndarray, sign: int) -> None:
+        """Lisää (`sign=1`) tai vähennä (`sign=-1`) rivien nykyisen tilan osuus."""
+        if rows.size == 0:
+            return
+        status = book.status[rows]
+        np.add.at(self.status_count, status, sign)
+        np.add.at(self.status_original_balance, status, sign * book.original_balance[rows])
+
+        balance = book.balance[rows]
+        active = (status == ACTIVE) & (balance > 0)
+        if not active.any():
+            return
+        balance = balance[active]
+        ages = book.age_months[rows[active]]
+        purposes = book.purpose[rows[active]]
+        self.active_count += sign * int(active.sum())
+        self.active_balance += sign * float(balance.sum())
+        self.active_age_sum += sign * int(ages.sum())
+
+        buckets = np.searchsorted(self.age_bucket_starts, ages, side="right") - 1
+        np.add.at(self.bucket_count, buckets, sign)
+        np.add.at(self.bucket_balance, buckets, sign * balance)
+
+        if int(purposes.max()) >= self.purpose_count.size:
+            size = max(self.purpose_count.size * 2, int(purposes.max()) + 1)
+            self.purpose_count = np.concatenate([self.purpose_count, np.zeros(size - self.purpose_count.size, np.int64)])
+            self.purpose_balance = np.concatenate([self.purpose_balance, np.zeros(size - self.purpose_balance.size)])
+        np.add.at(self.purpose_count, purposes, sign)
+        np.add.at(self.purpose_balance, purposes, sign * balance)
+        self._clear_empty()
+
+    def active_purposes(self) -> np.ndarray:
+        """Aktiivisten lainojen tarkoituskoodit käyttöönottojärjestyksessä."""
+        return np.flatnonzero(self.purpose_count > 0)
+
+    def _clear_empty(self) -> None:
+        """Tyhjien ryhmien summat tasan nollaan, ettei pyöristysjäämä jää osuuksiin."""
+        if self.active_count == 0:
+            self.active_balance = 0.0
+        self.bucket_balance[self.bucket_count == 0] = 0.0
+        self.purpose_balance[self.purpose_count == 0] = 0.0
+
+    def reset(self, book: LoanBook) -> None:
+        """Laske summat koko lainakannasta alusta."""
+        self.__init__(self.age_bucket_starts)
+        self.include(book, np.arange(book.size), 1)
+
+
+class LoanBook:
+    """Pankin lainat sarakkeina; käyttäytyy `LoanRecord`-listana.
+
+    Rivit ovat lisäysjärjestyksessä. `compact` poistaa päättyneet rivit
+    järjestyksen säilyttäen ja päivittää olemassa olevien näkymien rivit.
+    Jokaisella lainalla on pysyvä, kasvava `loan_id`, joten lainanottajaindeksi
+    ei muutu tiivistyksessä: rivi löytyy id:n perusteella binäärihaulla.
+    """
+
+    FLOAT_COLUMNS: tuple[str, ...] = ("balance", "annual_rate", "original_balance", "installment")
+    INT_COLUMNS: tuple[str, ...] = (
+        "term_months",
+        "remaining_term",
+        "age_months",
+        "borrower_id",
+        "borrower_row",
+        "loan_id",
+    )
+    CODE_COLUMNS: tuple[str, ...] = ("status", "purpose", "borrower_type")
+    RECORD_FIELDS: tuple[str, ...] = (
+        "borrower_type",
+        "balance",
+        "annual_rate",
+        "term_months",
+        "remaining_term",
+        "status",
+        "age_months",
+        "purpose",
+        "original_balance",
+    )
+
+    def __init__(self, capacity: int = 1024, age_bucket_starts: Sequence[int] = (0, 6, 12, 24)) -> None:
+        self.size: int = 0
+        self.capacity: int = max(1, int(capacity))
+        for name in self.FLOAT_COLUMNS:
+            setattr(self, name, np.zeros(self.capacity, dtype=np.float64))
+        for name in self.INT_COLUMNS:
+            setattr(self, name, np.zeros(self.capacity, dtype=np.int64))
+        for name in self.CODE_COLUMNS:
+            setattr(self, name, np.zeros(self.capacity, dtype=np.int16))
+        # Lainanottajaoliot (object-taulukko: tiivistys ja indeksointi ilman Python-silmukkaa)
+        self.borrowers: np.ndarray = np.empty(self.capacity, dtype=object)
+        # Luodut näkymät riveittäin (näkymät luodaan vasta käytettäessä)
+        self._views: dict[int, LoanRecord] = {}
+        self._vocabularies: dict[str, _Vocabulary] = {
+            "status": _Vocabulary(STATUSES),
+            "purpose": _Vocabulary(),
+            "borrower_type": _Vocabulary(BORROWER_TYPES),
+        }
+        self._next_loan_id: int = 0
+        # Lainanottajaindeksi: lainanottajan id -> aktiivisten lainojen id:t lisäysjärjestyksessä
+        self._active_by_borrower: dict[int, dict[int, None]] = {}
+        # Aktiivisten lainojen yhteenlaskettu kuukausierä lainanottajan id:n mukaan
+        self._scheduled: np.ndarray = np.zeros(1024, dtype=np.float64)
+        # Salkun juoksevat summat mittareita varten
+        self.totals = PortfolioTotals(age_bucket_starts)
+        self._bulk_update: bool = False
+
+    def vocabulary(self, column: str) -> _Vocabulary:
+        return self._vocabularies[column]
+
+    # --- Lisäys ---
+    def add(
+        self,
+        borrower: Any,
+        borrower_type: str,
+        balance: float,
+        annual_rate: float,
+        term_months: int,
+        remaining_term: int | None = None,
+        status: str = "active",
+        age_months: int = 0,
+        purpose: str = "general",
+        original_balance: float | None = None,
+        installment: float | None = None,
+    ) -> int:
+        """Lisää laina ja palauta sen rivi (erä lasketaan, ellei sitä anneta)."""
+        if self.size >= self.capacity:
+            self._grow(self.capacity * 2)
+        row = self.size
+        self.size += 1
+        self.balance[row] = balance
+        self.annual_rate[row] = annual_rate
+        self.original_balance[row] = balance if original_balance is None else original_balance
+        self.term_months[row] = term_months
+        self.remaining_term[row] = term_months if remaining_term is None else remaining_term
+        self.age_months[row] = age_months
+        self.installment[row] = (
+            annuity_payment(float(balance), float(annual_rate) / 12.0, int(self.remaining_term[row]))
+            if installment is None
+            else installment
+        )
+        self.status[row] = self._vocabularies["status"].code(status)
+        self.purpose[row] = self._vocabularies["purpose"].code(purpose)
+        self.borrower_type[row] = self._vocabularies["borrower_type"].code(borrower_type)
+        self.borrower_id[row] = getattr(borrower, "unique_id", -1)
+        self.borrower_row[row] = self._population_row(borrower)
+        self.loan_id[row] = self._next_loan_id
+        self._next_loan_id += 1
+        self.borrowers[row] = borrower
+        self.totals.include(self, np.array([row]), 1)
+        if self.status[row] == ACTIVE:
+            self._index(row)
+            self._refresh_borrower(int(self.borrower_id[row]))
+        return row
+
+    def add_many(
+        self,
+        borrowers: Sequence[Any],
+        borrower_type: str,
+        balances: np.ndarray,
+        annual_rates: np.ndarray,
+        term_months: np.ndarray,
+        remaining_terms: np.ndarray | None = None,
+        ages: np.ndarray | None = None,
+        purpose: str = "general",
+    ) -> np.ndarray:
+        """Lisää joukko samantyyppisiä lainoja kerralla; palauttaa rivit."""
+        n = len(borrowers)
+        if self.size + n > self.capacity:
+            self._grow(max(self.capacity * 2, self.size + n))
+        rows = np.arange(self.size, self.size + n)
+        self.size += n
+        balances = np.asarray(balances, dtype=np.float64)
+        self.balance[rows] = balances
+        self.original_balance[rows] = balances
+        self.annual_rate[rows] = annual_rates
+        self.term_months[rows] = term_months
+        self.remaining_term[rows] = term_months if remaining_terms is None else remaining_terms
+        self.age_months[rows] = 0 if ages is None else ages
+        self.installment[rows] = annuity_payments(balances, self.annual_rate[rows] / 12.0, self.remaining_term[rows])
+        self.status[rows] = ACTIVE
+        self.purpose[rows] = self._vocabularies["purpose"].code(purpose)
+        self.borrower_type[rows] = self._vocabularies["borrower_type"].code(borrower_type)
+        self.borrower_id[rows] = [getattr(b, "unique_id", -1) for b in borrowers]
+        self.borrower_row[rows] = [self._population_row(b) for b in borrowers]
+        self.loan_id[rows] = np.arange(self._next_loan_id, self._next_loan_id + n)
+        self._next_loan_id += n
+        objects = np.empty(n, dtype=object)
+        objects[:] = list(borrowers)
+        self.borrowers[rows] = objects
+        self.totals.include(self, rows, 1)
+        for row in rows.tolist():
+            self._index(row)
+        # Uudet erät lisätään olemassa oleviin rivijärjestyksessä (np.add.at on järjestyksellinen)
+        ids = self.borrower_id[rows]
+        indexed = ids >= 0
+        if indexed.any():
+            self._ensure_scheduled_capacity(int(ids.max()))
+            np.add.at(self._scheduled, ids[indexed], self.installment[rows][indexed])
+        return rows
+
+    def append(self, record: LoanRecord) -> None:
+        """Liitä irrallinen `LoanRecord` lainakantaan (listayhteensopivuus)."""
+        if record._book is not None:
+            raise ValueError("LoanRecord already belongs to a loan book")
+        values = record._values
+        row = self.add(record._borrower, **values)
+        record._book = self
+        record._row = row
+        record._values = {}
+        self._views[row] = record
+
+    @staticmethod
+    def _population_row(borrower: Any) -> int:
+        row = getattr(borrower, "_row", -1)
+        return row if isinstance(row, (int, np.integer)) and row >= 0 else -1
+
+    def _grow(self, new_capacity: int) -> None:
+        for name in self.FLOAT_COLUMNS + self.INT_COLUMNS + self.CODE_COLUMNS + ("borrowers",):
+            old = getattr(self, name)
+            new = np.zeros(new_capacity, dtype=old.dtype) if old.dtype != object else np.empty(new_capacity, dtype=object)
+            new[: self.size] = old[: self.size]
+            setattr(self, name, new)
+        self.capacity = new_capacity
+
+    # --- Poisto ---
+    def compact(self, keep: np.ndarray, archive: LoanArchive | None = None, month: int = 0) -> None:
+        """Pidä vain rivit, joilla `keep` on tosi (järjestys säilyy).
+
+        Poistettujen rivien olemassa olevat näkymät irrotetaan arvoineen,
+        säilyvien näkymien rivinumerot päivitetään. Jos `archive` on annettu,
+        poistetut rivit kirjataan siihen kuukaudella `month`.
+        """
+        keep = np.asarray(keep, dtype=bool)
+        kept = np.flatnonzero(keep)
+        if kept.size == self.size:
+            return
+        if archive is not None:
+            archive.extend(self, np.flatnonzero(~keep), month)
+        # Suljettujen lainojen tilasummat jäävät voimaan; poistettavat aktiiviset vähennetään
+        dropped_active = np.flatnonzero(~keep & (self.column("status") == ACTIVE))
+        if dropped_active.size:
+            self._unindex(dropped_active)
+            self.totals.include(self, dropped_active, -1)
+        new_rows = np.cumsum(keep) - 1
+        views: dict[int, LoanRecord] = {}
+        for row, view in self._views.items():
+            if keep[row]:
+                view._row = int(new_rows[row])
+                views[view._row] = view
+            else:
+                view._detach()
+        self._views = views
+        for name in self.FLOAT_COLUMNS + self.INT_COLUMNS + self.CODE_COLUMNS + ("borrowers",):
+            column = getattr(self, name)
+            column[: kept.size] = column[kept]
+        # Vapautetut lainanottajaviitteet pois, ettei kuolleita pidetä muistissa
+        self.borrowers[kept.size : self.size] = None
+        self.size = int(kept.size)
+
+    # --- Sarakkeet ja maskit ---
+    def column(self, name: str) -> np.ndarray:
+        """Palauta käytössä oleva osa sarakkeesta (näkymä, ei kopio)."""
+        return getattr(self, name)[: self.size]
+
+    def status_mask(self, status: str) -> np.ndarray:
+        return self.column("status") == STATUSES.index(status)
+
+    def active_rows(self) -> np.ndarray:
+        return np.flatnonzero(self.column("status") == ACTIVE)
+
+    def set_status(self, rows: np.ndarray, code: int, refresh: bool = True) -> None:
+        """Aseta rivien tila ja päivitä lainanottajaindeksi.
+
+        `refresh=False` jättää lainanottajien kuukausierät päivittämättä
+        (kutsuja laskee ne kerralla `refresh_scheduled_payments`-metodilla).
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        if rows.size == 0:
+            return
+        was_active = self.status[rows] == ACTIVE
+        with self.updating(rows):
+            self.status[rows] = code
+        changed = rows[~was_active] if code == ACTIVE else rows[was_active]
+        if changed.size == 0:
+            return
+        if code == ACTIVE:
+            for row in changed.tolist():
+                self._index(row)
+        else:
+            self._unindex(changed)
+        if refresh:
+            for borrower_id in np.unique(self.borrower_id[changed]).tolist():
+                self._refresh_borrower(borrower_id)
+
+    @contextmanager
+    def updating(self, rows: np.ndarray) -> Iterator[None]:
+        """Päivitä rivejä suoraan sarakkeisiin niin, että salkun summat pysyvät ajan tasalla.
+
+        Rivien vanha osuus vähennetään summista ennen lohkoa ja uusi lisätään
+        sen jälkeen. Sisäkkäiset kutsut (esim. `set_status` lohkon sisällä)
+        eivät päivitä summia uudelleen; niiden rivien on kuuluttava ulompaan joukkoon.
+        """
+        if self._bulk_update:
+            yield
+            return
+        rows = np.asarray(rows, dtype=np.int64)
+        self.totals.include(self, rows, -1)
+        self._bulk_update = True
+        try:
+            yield
+        finally:
+            self._bulk_update = False
+            self.totals.include(self, rows, 1)
+
+    def purpose_names(self, codes: np.ndarray) -> list[str]:
+        names = self._vocabularies["purpose"].names
+        return [names[int(code)] for code in codes]
+
+    # --- Lainanottajaindeksi ---
+    def rows_for(self, borrower_id: int) -> np.ndarray:
+        """Lainanottajan aktiivisten lainojen rivit lisäysjärjestyksessä."""
+        loan_ids = self._active_by_borrower.get(int(borrower_id))
+        if not loan_ids:
+            return np.empty(0, dtype=np.int64)
+        wanted = np.fromiter(loan_ids, dtype=np.int64, count=len(loan_ids))
+        return np.searchsorted(self.column("loan_id"), wanted)
+
+    def scheduled_payment(self, borrower_id: int) -> float:
+        """Lainanottajan aktiivisten lainojen yhteenlaskettu kuukausierä."""
+        borrower_id = int(borrower_id)
+        if 0 <= borrower_id < self._scheduled.size:
+            return float(self._scheduled[borrower_id])
+        return 0.0
+
+    def scheduled_payments(self, borrower_ids: np.ndarray) -> np.ndarray:
+        """Vektoroitu `scheduled_payment`; tuntemattomat ja negatiiviset id:t saavat nollan."""
+        borrower_ids = np.asarray(borrower_ids, dtype=np.int64)
+        known = (borrower_ids >= 0) & (borrower_ids < self._scheduled.size)
+        payments = np.zeros(borrower_ids.size, dtype=np.float64)
+        payments[known] = self._scheduled[borrower_ids[known]]
+        return payments
+
+    def refresh_scheduled_payments(self) -> None:
+        """Laske kaikkien lainanottajien kuukausierät uudelleen (lyhennysten jälkeen)."""
+        rows = self.active_rows()
+        ids = self.borrower_id[rows]
+        indexed = ids >= 0
+        rows, ids = rows[indexed], ids[indexed]
+        size = max(self._scheduled.size, int(ids.max()) + 1 if ids.size else 0)
+        self._scheduled = np.bincount(ids, weights=self.installment[rows], minlength=size)
+
+    def _index(self, row: int) -> None:
+        borrower_id = int(self.borrower_id[row])
+        if borrower_id >= 0:
+            self._active_by_borrower.setdefault(borrower_id, {})[int(self.loan_id[row])] = None
+
+    def _unindex(self, rows: np.ndarray) -> None:
+        for borrower_id, loan_id in zip(self.borrower_id[rows].tolist(), self.loan_id[rows].tolist()):
+            loan_ids = self._active_by_borrower.get(borrower_id)
+            if loan_ids is None:
+                continue
+            loan_ids.pop(loan_id, None)
+            if not loan_ids:
+                del self._active_by_borrower[borrower_id]
+
+    def _refresh_borrower(self, borrower_id: int) -> None:
+        """Laske yhden lainanottajan kuukausierä sen aktiivisista lainoista."""
+        if borrower_id < 0:
+            return
+        self._ensure_scheduled_capacity(borrower_id)
+        rows = self.rows_for(borrower_id)
+        self._scheduled[borrower_id] = float(sum(self.installment[rows].tolist()))
+
+    def _ensure_scheduled_capacity(self, borrower_id: int) -> None:
+        if borrower_id >= self._scheduled.size:
+            grown = np.zeros(max(self._scheduled.size * 2, borrower_id + 1), dtype=np.float64)
+            grown[: self._scheduled.size] = self._scheduled
+            self._scheduled = grown
+
+    def reschedule(self, rows: np.ndarray) -> None:
+        """Laske rivien kuukausierät uudelleen nykyisestä saldosta, korosta ja laina-ajasta.
+
+        Kutsutaan, kun maksusuunnitelma muuttuu (osittainen maksu,
+        uudelleenjärjestely, vaihtuvan koron tarkistus). Lainanottajien
+        yhteenlasketut erät on päivitettävä erikseen.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        self.installment[rows] = annuity_payments(
+            self.balance[rows], self.annual_rate[rows] / 12.0, self.remaining_term[rows]
+        )
+
+    def _on_field_write(self, row: int, name: str) -> None:
+        """Näkymän kautta kirjoitettu erään vaikuttava kenttä päivittää erän ja lainanottajan erän."""
+        if name in ("balance", "annual_rate", "remaining_term"):
+            self.reschedule(np.array([row]))
+        if name in ("balance", "annual_rate", "remaining_term", "installment") and self.status[row] == ACTIVE:
+            self._refresh_borrower(int(self.borrower_id[row]))
+
+    # --- Listarajapinta ---
+    def view(self, row: int) -> LoanRecord:
+        view = self._views.get(row)
+        if view is None:
+            view = self._views[row] = LoanRecord._view(self, row)
+        return view
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self.view(row) for row in range(*index.indices(self.size))]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("loan index out of range")
+        return self.view(index)
+
+    def __iter__(self) -> Iterator[LoanRecord]:
+        for row in range(self.size):
+            yield self.view(row)
+
+
+class LoanArchive:
+    """Suljetut lainat tiiviinä sarakkeina.
+
+    Vain epäsuoriutuneiden lainojen ja luottotappioiden seurantaan tarvittavat
+    kentät: lainan ja lainanottajan id, tila, tarkoitus, lainanottajan tyyppi,
+    alkuperäinen pääoma ja kuukausi, jona laina siirtyi arkistoon. Koodit
+    tulkitaan lainakannan sanastoilla.
+    """
+
+    COLUMNS: dict[str, type] = {
+        "loan_id": np.int64,
+        "borrower_id": np.int64,
+        "status": np.int16,
+        "purpose": np.int16,
+        "borrower_type": np.int16,
+        "original_balance": np.float64,
+        "closed_month": np.int64,
+    }
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.size: int = 0
+        self.capacity: int = max(1, int(capacity))
+        for name, dtype in self.COLUMNS.items():
+            setattr(self, name, np.zeros(self.capacity, dtype=dtype))
+
+    def extend(self, book: LoanBook, rows: np.ndarray, month: int) -> None:
+        """Kirjaa lainakannan rivit arkistoon."""
+        n = rows.size
+        if n == 0:
+            return
+        if self.size + n > self.capacity:
+            self._grow(max(self.capacity * 2, self.size + n))
+        target = slice(self.size, self.size + n)
+        for name in self.COLUMNS:
+            if name != "closed_month":
+                getattr(self, name)[target] = getattr(book, name)[rows]
+        self.closed_month[target] = month
+        self.size += n
+
+    def _grow(self, new_capacity: int) -> None:
+        for name in self.COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros(new_capacity, dtype=old.dtype)
+            new[: self.size] = old[: self.size]
+            setattr(self, name, new)
+        self.capacity = new_capacity
+
+    def column(self, name: str) -> np.ndarray:
+        """Palauta käytössä oleva osa sarakkeesta (näkymä, ei kopio)."""
+        return getattr(self, name)[: self.size]
+
+    def status_mask(self, status: str) -> np.ndarray:
+        return self.column("status") == STATUSES.index(status)
+
+    def __len__(self) -> int:
+        return self.size
+
+
+@lru_cache(maxsize=4096)
+def annuity_factor(monthly_rate: float, term_months: int) -> float:
+    """Annuiteettikerroin (erä per pääomayksikkö), välimuistissa (korko, laina-aika) -parin mukaan."""
+    term_months = max(term_months, 1)
+    if monthly_rate <= 0:
+        return 1.0 / term_months
+    return (monthly_rate * (1 + monthly_rate) ** term_months) / ((1 + monthly_rate) ** term_months - 1)
+
+
+def annuity_payment(balance: float, monthly_rate: float, term_months: int) -> float:
+    """Tasaerälainan kuukausierä; kerroin haetaan välimuistista."""
+    if monthly_rate <= 0:
+        return balance / max(term_months, 1)
+    return balance * annuity_factor(monthly_rate, term_months)
+
+
+def annuity_payments(balance: np.ndarray, monthly_rate: np.ndarray, term_months: np.ndarray) -> np.ndarray:
+    """Vektoroitu `BankAgent._annuity_payment`."""
+    term = np.maximum(term_months, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = (1.0 + monthly_rate) ** term
+        annuity = balance * (monthly_rate * growth) / (growth - 1.0)
+    return np.where(monthly_rate > 0, annuity, balance / term)
@@ -0,0 +1,485 @@
+"""Kotitalouksien sarakepohjainen populaatio.
+
+Kotitalouksien tila säilytetään NumPy-sarakkeina (struct-of-arrays).
+`HouseholdAgent` on ohut näkymä yhteen riviin, joten olemassa oleva
+oliopohjainen logiikka toimii ennallaan, mutta kuukausittainen
+kotitalousvaihe voidaan ajaa koko populaatiolle kerralla.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+import numpy as np
+
+from core.aggregates import AggregateLedger
+
+if TYPE_CHECKING:  # pragma: no cover
+    from core.model import EconomyModel
+    from agents.household import HouseholdAgent
+
+
+class PopulationColumn:
+    """Deskriptori, joka lukee ja kirjoittaa attribuutin populaation sarakkeeseen.
+
+    Palauttaa Python-skalaarin (float/int/bool), jotta näkymää käyttävä koodi
+    käyttäytyy kuten ennen (esim. nollalla jako nostaa edelleen poikkeuksen).
+    """
+
+    def __init__(self, cast: Callable[[Any], Any]) -> None:
+        self.cast = cast
+        self.name = ""
+        self.tracked = False
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.tracked = name in AggregateLedger.TRACKED_COLUMNS
+
+    def __get__(self, obj: Any, objtype: type | None = None) -> Any:
+        if obj is None:
+            return self
+        return self.cast(getattr(obj._population, self.name)[obj._row])
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        if self.tracked:
+            obj._population.set_tracked(self.name, obj._row, value)
+        else:
+            getattr(obj._population, self.name)[obj._row] = value
+
+
+class HouseholdPopulation:
+    """Kotitalouksien sarakkeet ja vektoroitu kuukausivaihe.
+
+    Rivit ovat pysyviä: kotitalouden rivi ei muutu sen elinaikana, joten
+    rivinumeroa voidaan käyttää viitteenä muista alijärjestelmistä.
+    Elävien rivien indeksi (`live_rows`) tiivistetään kuolemien jälkeen, joten
+    vektoroidut vaiheet käsittelevät vain elävää väestöä.
+
+    v0.8.3: Rajatun muistin tilassa kuolleiden rivit vapautetaan
+    (`release_rows`) ja uudet kotitaloudet käyttävät ne uudelleen, joten
+    sarakkeiden koko seuraa elävää väestöä eikä ajon pituutta.
+    """
+
+    FLOAT_COLUMNS: tuple[str, ...] = (
+        "cash",
+        "debt",
+        "wage",
+        "debt_service_reserve",
+        "real_estate_value",
+        "business_equity",
+        "base_propensity_to_consume",
+    )
+    INT_COLUMNS: tuple[str, ...] = (
+        "agent_id",
+        "age",
+        "household_size",
+        "num_children",
+        "dwelling_id",
+        "employer_id",
+    )
+    BOOL_COLUMNS: tuple[str, ...] = ("employed", "alive", "entrepreneur", "job_seeker")
+
+    def __init__(self, model: EconomyModel, capacity: int = 1024) -> None:
+        self.model = model
+        self.size: int = 0
+        self.capacity: int = max(1, int(capacity))
+        self.agents: list[HouseholdAgent] = []
+        # Mallin aggregaattilaskurit (None, jos malli ei ylläpidä niitä)
+        self.ledger: AggregateLedger | None = getattr(model, "aggregates", None)
+
+        for name in self.FLOAT_COLUMNS:
+            setattr(self, name, np.zeros(self.capacity, dtype=np.float64))
+        for name in self.INT_COLUMNS:
+            setattr(self, name, np.zeros(self.capacity, dtype=np.int64))
+        for name in self.BOOL_COLUMNS:
+            setattr(self, name, np.zeros(self.capacity, dtype=bool))
+        self.dwelling_id[:] = -1
+        self.employer_id[:] = -1
+        self._live_rows: np.ndarray = np.zeros(self.capacity, dtype=np.int64)
+        self._n_live: int = 0
+        # Vapautetut rivit uudelleenkäyttöä varten (vain rajatun muistin tilassa)
+        self._free_rows: list[int] = []
+
+    # --- Rivien hallinta ---
+    def add_row(self, agent: HouseholdAgent) -> int:
+        """Varaa uusi rivi näkymälle ja palauta rivinumero."""
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._clear_row(row)
+            self.agents[row] = agent
+        else:
+            if self.size >= self.capacity:
+                self._grow(self.capacity * 2)
+            row = self.size
+            self.size += 1
+            self.agents.append(agent)
+        # Laskuripohjaisten arvontojen avain (simulation.rng: counter)
+        self.agent_id[row] = agent.unique_id
+        if self._n_live >= self._live_rows.size:
+            self._live_rows = np.resize(self._live_rows, self._live_rows.size * 2)
+        self._live_rows[self._n_live] = row
+        self._n_live += 1
+        return row
+
+    def compact_live_rows(self) -> None:
+        """Poista kuolleet rivit elävien indeksistä (järjestys säilyy)."""
+        rows = self._live_rows[: self._n_live]
+        live = rows[self.alive[rows]]
+        self._live_rows[: live.size] = live
+        self._n_live = int(live.size)
+
+    def release_rows(self, agents: list[HouseholdAgent]) -> None:
+        """v0.8.3: Irrota kuolleet näkymät omiksi kopioikseen ja vapauta niiden rivit.
+
+        Kuolleeseen kotitalouteen voi yhä viitata (esim. lainan lainanottajana),
+        joten sen arvot kopioidaan `DetachedRow`iin ennen rivin uudelleenkäyttöä.
+        Kutsutaan `compact_live_rows`in jälkeen.
+        """
+        for agent in agents:
+            row = agent._row
+            agent._population = DetachedRow(self, row)
+            agent._row = DetachedRow.ROW
+            self.agents[row] = None
+            # Vapautettu rivi ei enää vastaa kenenkään id:tä (lainakannan rivivälimuisti)
+            self.agent_id[row] = -1
+            self._free_rows.append(row)
+
+    def _clear_row(self, row: int) -> None:
+        for name in self.FLOAT_COLUMNS + self.INT_COLUMNS + self.BOOL_COLUMNS:
+            getattr(self, name)[row] = 0
+        self.dwelling_id[row] = -1
+        self.employer_id[row] = -1
+
+    def set_tracked(self, name: str, row: int, value: Any) -> None:
+        """Aseta seurattu sarake ja välitä muutos aggregaattilaskureille."""
+        column = getattr(self, name)
+        old = column[row]
+        column[row] = value
+        if self.ledger is not None:
+            self.ledger.on_household_change(self, row, name, old, column[row])
+
+    def _grow(self, new_capacity: int) -> None:
+        for name in self.FLOAT_COLUMNS + self.INT_COLUMNS + self.BOOL_COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros(new_capacity, dtype=old.dtype)
+            new[: self.capacity] = old
+            setattr(self, name, new)
+        self.dwelling_id[self.capacity:] = -1
+        self.employer_id[self.capacity:] = -1
+        self.capacity = new_capacity
+
+    def column(self, name: str) -> np.ndarray:
+        """Palauta käytössä oleva osa sarakkeesta (näkymä, ei kopio)."""
+        return getattr(self, name)[: self.size]
+
+    def alive_rows(self) -> np.ndarray:
+        """Elävät rivit lisäysjärjestyksessä (kustannus ~ elävä väestö)."""
+        rows = self._live_rows[: self._n_live]
+        return rows[self.alive[rows]]
+
+    def _draws(self, stream: str, rows: np.ndarray) -> np.ndarray:
+        """Tasajakautuneet arvonnat riveille: agentin id:llä avainnetut tai mallin generaattorista."""
+        counter_rng = self.model.counter_rng
+        if counter_rng is None:
+            return self.model.rng.random(rows.size)
+        return counter_rng.stream(stream).randoms(self.agent_id[rows], self.model.month)
+
+    def _due(self, kind: str, rows: np.ndarray) -> np.ndarray:
+        """v0.8.3: Rivit, joiden tapahtumakello lyö tässä kuussa (simulation.rare_events: calendar)."""
+        mask = np.zeros(self.size, dtype=bool)
+        due_rows = [agent._row for agent in self.model.event_calendar.due(kind) if agent._row >= 0]
+        mask[due_rows] = True
+        return mask[rows]
+
+    # --- Vektoroitu kuukausivaihe ---
+    def step_month(self) -> None:
+        """Aja kotitalousvaihe koko populaatiolle taulukko-operaatioina.
+
+        Järjestys vastaa `HouseholdAgent.step()`:iä, mutta jokainen vaihe
+        tehdään kaikille kotitalouksille ennen seuraavaa:
+
+        1. Ikääntyminen ja kuolemat
+        2. Eläkkeelle jääminen
+        3. Pesästä lentäminen ja yrittäjyys (harvinaiset tapahtumat rivikohtaisesti)
+        4. Velanhoitovarauksen tasapainotus
+        5. Kulutusluotot
+        6. Kulutus
+        """
+        model = self.model
+        if self.size == 0:
+            return
+
+        self._age_and_die()
+        self._retire()
+        self._run_rare_events()
+        self.rebalance_debt_service_reserves()
+        self._request_buffer_loans()
+        model.total_consumption += self.consume()
+
+    def _age_and_die(self) -> None:
+        model = self.model
+        rows = self.alive_rows()
+        if rows.size == 0:
+            return
+        if model.month % 12 == 0:
+            self.age[rows] += 1
+            if self.ledger is not None:
+                self.ledger.age_sum += int(rows.size)
+
+        if model.event_calendar is not None:
+            dying = (self.age[rows] >= model.max_age) | self._due("death", rows)
+        else:
+            death_prob = model.death_prob_per_year / 12
+            draws = self._draws("household.death", rows)
+            dying = (self.age[rows] >= model.max_age) | (draws < death_prob)
+        for row in rows[dying]:
+            self.agents[row].die()
+
+    def _retire(self) -> None:
+        rows = self.alive_rows()
+        retired = rows[self.age[rows] >= self.model.retirement_age]
+        if self.ledger is not None:
+            self.ledger.employed -= int(np.count_nonzero(self.employed[retired]))
+        self.employed[retired] = False
+
+    def _run_rare_events(self) -> None:
+        model = self.model
+        rows = self.alive_rows()
+        if rows.size == 0:
+            return
+
+        # Pesästä lentäminen: arvonta vain niille, joilla on lapsia
+        leaving_rate = getattr(model, "leaving_home_rate_per_month", 0.01)
+        with_children = rows[self.num_children[rows] > 0]
+        if model.event_calendar is not None:
+            leaving = with_children[self._due("leave_home", with_children)]
+        else:
+            leaving = with_children[self._draws("household.leave_home", with_children) < leaving_rate]
+        for row in leaving:
+            self.agents[row]._child_leaves_home()
+
+        # Yrittäjyys: ikä 25-55, ei vielä yrittäjä
+        entrepreneurship_rate = getattr(model, "entrepreneurship_rate_per_month", 0.001)
+        ages = self.age[rows]
+        candidates = rows[~self.entrepreneur[rows] & (ages >= 25) & (ages <= 55)]
+        if model.event_calendar is not None:
+            founders = candidates[self._due("entrepreneurship", candidates)]
+        else:
+            founders = candidates[self._draws("household.entrepreneurship", candidates) <= entrepreneurship_rate]
+        for row in founders:
+            agent = self.agents[row]
+            if agent.alive and agent.owned_firm is None:
+                agent._found_business()
+
+    def rebalance_debt_service_reserves(self) -> None:
+        """Aseta velanhoitovaraus kaikille eläville kerralla."""
+        rows = self.alive_rows()
+        bank = getattr(self.model, "bank", None)
+        if bank is None:
+            self.debt_service_reserve[rows] = 0.0
+            return
+
+        expected = bank.expected_payments_by_row(self.size)[rows]
+        multiplier = getattr(self.model, "household_debt_service_buffer_multiplier", 1.0)
+        target = np.minimum(self.cash[rows], expected * multiplier)
+        self.debt_service_reserve[rows] = np.where(expected > 0, target, 0.0)
+
+    def available_cash_after_reserve(self, rows: np.ndarray) -> np.ndarray:
+        return np.maximum(0.0, self.cash[rows] - self.debt_service_reserve[rows])
+
+    def _request_buffer_loans(self) -> None:
+        model = self.model
+        bank = getattr(model, "bank", None)
+        if bank is None:
+            return
+        rows = self.alive_rows()
+        available = self.available_cash_after_reserve(rows)
+        needed = model.household_cash_target - available
+        applying = (available < model.household_cash_floor) & (needed > 0)
+        # v0.8.3: Hakemukset pankille yhtenä eränä rivijärjestyksessä
+        bank.request_loans_batch(
+            [self.agents[row] for row in rows[applying]],
+            needed[applying],
+            borrower_types="household",
+            term_months=24,
+            purposes="buffer_top_up",
+        )
+
+    def consume(self) -> float:
+        """Kuluta kaikkien kotitalouksien budjetit yhdellä kierroksella.
+
+        v0.8.3: Budjetit kohdistetaan yrityksille `GoodsMarket.clear`issa
+        (reititys, varastorajoite, yrityksen myynti kerran).
+
+        Returns:
+            Kulutus nettona yrityksille (ALV:n jälkeen)
+        """
+        model = self.model
+        if self.size == 0:
+            return 0.0
+
+        rows = self.alive_rows()
+        budgets = self.base_propensity_to_consume[rows] * self.available_cash_after_reserve(rows)
+        buying = (self.cash[rows] > 0) & (budgets > 0)
+        buyers = rows[buying]
+        if buyers.size == 0:
+            return 0.0
+
+        spent = model.goods_market.clear(self, buyers, budgets[buying])
+        self.cash[buyers] -= spent
+        self.debt_service_reserve[buyers] = np.minimum(
+            self.debt_service_reserve[buyers], self.cash[buyers]
+        )
+
+        total_spent = float(spent.sum())
+        return total_spent - total_spent * model.vat_rate
+
+    # --- Valtion ja pankin kassavirrat (vektoroitu moottori) ---
+    def credit_income(self, rows: np.ndarray, amounts: np.ndarray) -> None:
+        """Vastaa `HouseholdAgent.receive_income/receive_transfer` -kutsuja riveille."""
+        self.cash[rows] += amounts
+        share = getattr(self.model, "household_debt_service_income_share", 0.0)
+        if share <= 0:
+            return
+        allocation = np.where(amounts > 0, amounts * share, 0.0)
+        self.debt_service_reserve[rows] = np.minimum(
+            self.cash[rows], self.debt_service_reserve[rows] + allocation
+        )
+
+    def pay_transfers(self, pension: float, unemployment_benefit: float) -> float:
+        """Eläkkeet eläkeläisille ja työttömyystuki työttömille työikäisille."""
+        rows = self.alive_rows()
+        retired = self.age[rows] >= self.model.retirement_age
+        amounts = np.where(retired, pension, 0.0)
+        amounts = np.where(~retired & ~self.employed[rows], unemployment_benefit, amounts)
+        receiving = amounts != 0.0
+        rows, amounts = rows[receiving], amounts[receiving]
+        self.credit_income(rows, amounts)
+        return float(amounts.sum())
+
+    def collect_income_tax(self, annual_tax: Callable[[np.ndarray], np.ndarray]) -> float:
+        """Kerää tulovero työllisten palkoista. `annual_tax` laskee vuosiveron taulukolle."""
+        rows = self.alive_rows()
+        rows = rows[self.employed[rows] & (self.wage[rows] > 0)]
+        monthly_income = self.wage[rows]
+        tax = np.minimum(annual_tax(monthly_income * 12) / 12.0, monthly_income)
+        paying = tax > 0
+        rows, tax = rows[paying], tax[paying]
+        self.cash[rows] -= tax
+        self.debt_service_reserve[rows] = np.minimum(self.debt_service_reserve[rows], self.cash[rows])
+        return float(tax.sum())
+
+    def pay_deposit_interest(self, monthly_rate: float) -> float:
+        rows = self.alive_rows()
+        rows = rows[self.cash[rows] > 0]
+        interest = self.cash[rows] * monthly_rate
+        self.credit_income(rows, interest)
+        return float(interest.sum())
+
+    # --- Asuntokysyntä ja syntyvyys (vektoroitu moottori) ---
+    def housing_demand(self) -> tuple[np.ndarray, np.ndarray]:
+        """Asuntoa tarvitsevat rivit ja niiden tarvitsema asuntokoko.
+
+        Vastaa `HouseholdAgent.needs_housing()` ja `required_dwelling_size()`.
+        """
+        rows = self.alive_rows()
+        dwelling_ids = self.dwelling_id[rows]
+        sizes = self.household_size[rows]
+        owns = dwelling_ids >= 0
+        dwellings = self.model.housing_market.dwellings
+        dwelling_sizes = np.zeros(rows.size, dtype=np.int64)
+        if owns.any():
+            dwelling_sizes[owns] = [dwellings[i].size for i in dwelling_ids[owns]]
+
+        needs = (~owns & self.employed[rows] & (self.age[rows] >= 20)) | (
+            owns & (sizes > dwelling_sizes * 1.5)
+        )
+        rows, sizes = rows[needs], sizes[needs]
+        required = np.select([sizes <= 1, sizes == 2, sizes <= 4], [1, 2, 3], default=4)
+        return rows, required
+
+    def process_births(self, monthly_birth_prob: float) -> None:
+        """Syntymät kasvattavat hedelmällisessä iässä olevien perheiden kokoa."""
+        model = self.model
+        rows = self.alive_rows()
+        ages = self.age[rows]
+        fertile = rows[(ages >= model.fertile_age_min) & (ages <= model.fertile_age_max)]
+        if fertile.size == 0:
+            return
+        if model.event_calendar is not None:
+            parents = fertile[self._due("birth", fertile)]
+        else:
+            parents = fertile[self._draws("household.birth", fertile) < monthly_birth_prob]
+        self.household_size[parents] += 1
+        self.num_children[parents] += 1
+        if self.ledger is not None:
+            self.ledger.household_size_sum += int(parents.size)
+
+
+class DetachedRow:
+    """v0.8.3: Populaatiosta irrotetun (kuolleen) kotitalouden sarakkeet yhtenä rivinä.
+
+    Tarjoaa saman rajapinnan kuin `HouseholdPopulation` näkymän
+    kuvauksille. Kuolleet eivät vaikuta aggregaattilaskureihin, joten
+    seurattu asetus on tavallinen kirjoitus.
+    """
+
+    # Negatiivinen rivi: osoittaa ainoaan alkioon ja erottuu populaation riveistä
+    ROW = -1
+
+    def __init__(self, population: HouseholdPopulation, row: int) -> None:
+        for name in population.FLOAT_COLUMNS + population.INT_COLUMNS + population.BOOL_COLUMNS:
+            column = getattr(population, name)
+            setattr(self, name, column[row : row + 1].copy())
+
+    def set_tracked(self, name: str, row: int, value: Any) -> None:
+        getattr(self, name)[row] = value
+
+
+class LiveHouseholds:
+    """Elävien kotitalouksien iterointijoukko (`model.households`).
+
+    Kuollut kotitalous pysyy listassa vain kuluvan vaiheen loppuun: `die()`
+    merkitsee sen, ja `compact()` poistaa kuolleet järjestyksen säilyttäen.
+    Iterointi on indeksipohjainen, joten kesken läpikäynnin lisätyt
+    kotitaloudet (pesästä lentäjät) käsitellään samalla kierroksella kuten
+    tavallisella listalla.
+    """
+
+    def __init__(self) -> None:
+        self._items: list[HouseholdAgent] = []
+        self._pending_dead: int = 0
+
+    def append(self, agent: HouseholdAgent) -> None:
+        self._items.append(agent)
+
+    def mark_dead(self) -> None:
+        self._pending_dead += 1
+
+    def compact(self) -> list[HouseholdAgent]:
+        """Poista kuolleet ja palauta ne (arkistointia varten)."""
+        if not self._pending_dead:
+            return []
+        live: list[HouseholdAgent] = []
+        dead: list[HouseholdAgent] = []
+        for agent in self._items:
+            (live if agent.alive else dead).append(agent)
+        self._items = live
+        self._pending_dead = 0
+        return dead
+
+    def __iter__(self) -> Iterator[HouseholdAgent]:
+        items = self._items
+        i = 0
+        while i < len(items):
+            yield items[i]
+            i += 1
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: int) -> HouseholdAgent:
+        return self._items[index]
+
+    def __contains__(self, agent: object) -> bool:
+        return agent in self._items
@@ -14,6 +14,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import numpy as np
 from mesa import Agent
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -110,6 +111,15 @@ class StateAgent(Agent):
         """Kerää progressiivinen tulovero kotitalouksien palkkatuloista."""
         total_tax = 0.0
         
+        if self.model.household_engine == "vectorized":
+            total_tax = self.model.household_population.collect_income_tax(
+                self._calculate_progressive_tax_array
+            )
+            self.income_tax_revenue = total_tax
+            self.monthly_revenue += total_tax
+            self.cash_balance += total_tax
+            return
+        
         for hh in self.model.households:
             if not hh.alive or not hh.employed:
                 continue
@@ -149,6 +159,14 @@ class StateAgent(Agent):
         
         return total_tax
     
+    def _calculate_progressive_tax_array(self, annual_income: np.ndarray) -> np.ndarray:
+        """Kuten `_calculate_progressive_tax`, mutta taulukolle tuloja."""
+        total_tax = np.zeros_like(annual_income)
+        for lower, upper, rate in self.income_tax_brackets:
+            in_bracket = annual_income > lower
+            total_tax += np.where(in_bracket, (np.minimum(annual_income, upper) - lower) * rate, 0.0)
+        return total_tax
+    
     def collect_corporate_tax(self) -> None:
         """Kerää yritysveron yritysten voitoista."""
         total_tax = 0.0
@@ -207,6 +225,15 @@ class StateAgent(Agent):
         total_paid = 0.0
         retirement_age = self.model.retirement_age
         
+        if self.model.household_engine == "vectorized":
+            total_paid = self.model.household_population.pay_transfers(
+                self.pension, self.unemployment_benefit
+            )
+            self.transfer_expenses = total_paid
+            self.monthly_expenses += total_paid
+            self.cash_balance -= total_paid
+            return
+        
         for hh in self.model.households:
             if not hh.alive:
                 continue
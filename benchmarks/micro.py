@@ -0,0 +1,284 @@
+"""v0.8.3: Osajärjestelmien mikrobenchmarkit synteettisillä aineistoilla.
+
+Jokainen benchmark rakentaa siemennetyn, kooltaan säädettävän aineiston
+(lainakanta, asuntokanta, työnhakijat, ...) pienen mallin päälle ja mittaa
+yhden kuuman polun erikseen ilman koko mallin kohinaa:
+
+- aika: paras ja mediaani `repeat` toistosta (aineisto rakennetaan joka
+  toistolle uudelleen, rakentaminen ei kuulu mittaukseen),
+- allokaatiot: `tracemalloc`in huippu ja nettokasvu erillisessä toistossa.
+
+Käyttö::
+
+    python -m benchmarks.micro                      # kaikki, oletuskoot
+    python -m benchmarks.micro bank.collect_payments --size 200000
+    python -m benchmarks.micro --scale 0.1 --json results/micro.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from benchmarks.scaling import scaled_config
+from core.config import load_config
+
+Setup = Callable[[int, int], Callable[[], Any]]
+
+
+@dataclass
+class MicroResult:
+    name: str
+    size: int
+    repeat: int
+    best_s: float
+    median_s: float
+    peak_alloc_bytes: int
+    net_alloc_bytes: int
+
+
+# --- Aineistot ---
+def build_model(n_households: int, seed: int, engine: str = "agents") -> Any:
+    """Pieni tai suuri malli skaalatulla konfiguraatiolla (ilman ajanottoa ja agenttidataa)."""
+    from core.model import EconomyModel
+
+    cfg = scaled_config(load_config("config/base.yaml"), n_households, engine)
+    cfg["simulation"]["profile_phases"] = False
+    random.seed(seed)
+    return EconomyModel(config=cfg, seed=seed)
+
+
+def synthetic_loan_book(model: Any, n_loans: int, seed: int) -> None:
+    """Lisää pankille `n_loans` aktiivista kotitalouslainaa satunnaisille kotitalouksille."""
+    rng = np.random.default_rng(seed)
+    bank = model.bank
+    households = list(model.households)
+    borrowers = rng.integers(0, len(households), size=n_loans)
+    balances = rng.uniform(10_000.0, 200_000.0, size=n_loans)
+    rates = rng.uniform(0.02, 0.06, size=n_loans)
+    terms = rng.integers(60, 361, size=n_loans)
+    ages = rng.integers(1, 60, size=n_loans)
+    bank.loans.add_many(
+        [households[i] for i in borrowers],
+        "household",
+        balances,
+        rates,
+        terms,
+        remaining_terms=terms - ages,
+        ages=ages,
+        purpose="mortgage",
+    )
+    population = model.household_population
+    np.add.at(population.debt, [households[i]._row for i in borrowers], balances)
+    bank.total_loans += float(balances.sum())
+    # Riittävästi kassaa, ettei mittaus muutu defaulttien käsittelyksi
+    for hh in households:
+        hh.cash = 1e9
+    bank.total_deposits = sum(hh.cash for hh in households)
+
+
+def _bank_fixture(size: int, seed: int) -> Any:
+    model = build_model(1_000, seed)
+    synthetic_loan_book(model, size, seed)
+    return model
+
+
+def _housing_fixture(size: int, seed: int) -> Any:
+    """Malli, jossa on `size` asuntoa (alkukanta + täydennys) ja osa myynnissä."""
+    model = build_model(max(100, int(size / 0.8)), seed)
+    market = model.housing_market
+    missing = size - len(market.dwellings)
+    if missing > 0:
+        market.initialize_housing_stock(missing)
+    # Kassaa ostajille, jotta kaupankäyntipolku todella käydään läpi
+    for hh in model.households:
+        hh.cash = max(hh.cash, 50_000.0)
+    return model
+
+
+# --- Benchmarkit ---
+def setup_collect_payments(size: int, seed: int) -> Callable[[], Any]:
+    return _bank_fixture(size, seed).bank._collect_payments
+
+
+def setup_update_loan_metrics(size: int, seed: int) -> Callable[[], Any]:
+    return _bank_fixture(size, seed).bank._update_loan_metrics
+
+
+def setup_credit_risk(size: int, seed: int) -> Callable[[], Any]:
+    """Tilannekuva ja 20 000 skenaariota `size` lainan kannalle (PD-luokittain)."""
+    from experiments.credit_risk import CreditRiskParams, run_credit_risk
+
+    model = _bank_fixture(size, seed)
+    params = CreditRiskParams(scenarios=20_000, method="buckets", seed=seed)
+    return lambda: run_credit_risk(model, params)
+
+
+def setup_update_prices(size: int, seed: int) -> Callable[[], Any]:
+    return _housing_fixture(size, seed).housing_market.update_prices
+
+
+def setup_execute_transactions(size: int, seed: int) -> Callable[[], Any]:
+    return _housing_fixture(size, seed).housing_market.execute_transactions
+
+
+def setup_labor_market(size: int, seed: int) -> Callable[[], Any]:
+    """`size` työnhakijaa: kaikki työikäiset irtisanotaan ennen mittausta."""
+    model = build_model(size, seed)
+    for firm in model.firms:
+        firm.employees.clear()
+    for hh in model.households:
+        if hh.employed:
+            hh.lose_job()
+    return model._run_labor_market
+
+
+def setup_income_tax(size: int, seed: int) -> Callable[[], Any]:
+    model = build_model(size, seed)
+    state = model.state
+
+    def run() -> None:
+        # Tuloveroa kerätään kuukauden tuloista; nollaus pitää toistot vertailukelpoisina
+        state.reset_monthly_counters()
+        state.collect_income_tax()
+
+    return run
+
+
+def setup_goods_clear(size: int, seed: int) -> Callable[[], Any]:
+    """`size` ostajaa ja `size / 100` yritystä (1M kotitaloutta -> 10k yritystä)."""
+    from agents.firm import FirmAgent
+
+    model = build_model(100, seed, engine="vectorized")
+    rng = np.random.default_rng(seed)
+    while len(model.firms) < max(3, size // 100):
+        model.firms.append(
+            FirmAgent(
+                model=model,
+                wage_level=2500.0,
+                investment_interval_months=0,
+                investment_loan_amount=0.0,
+                investment_loan_term=1,
+                investment_cash_buffer=0.0,
+            )
+        )
+    for firm in model.firms:
+        firm.price = float(rng.uniform(5.0, 15.0))
+        firm.inventory = float(rng.uniform(0.0, 200.0))
+    # Ostajien rivit: vain määrä ratkaisee (peräkkäisarvonnoissa rivejä ei lueta)
+    buyers = np.arange(size, dtype=np.int64)
+    budgets = rng.lognormal(mean=6.0, sigma=0.5, size=size)
+    market = model.goods_market
+    return lambda: market.clear(model.household_population, buyers, budgets)
+
+
+def setup_gini(size: int, seed: int) -> Callable[[], Any]:
+    from output.metrics import gini_coefficient
+
+    values = np.random.default_rng(seed).lognormal(mean=10.0, sigma=1.0, size=size).tolist()
+    return lambda: gini_coefficient(values)
+
+
+BENCHMARKS: dict[str, tuple[int, Setup]] = {
+    "bank.collect_payments": (1_000_000, setup_collect_payments),
+    "bank.update_loan_metrics": (1_000_000, setup_update_loan_metrics),
+    "bank.credit_risk": (1_000_000, setup_credit_risk),
+    "housing.update_prices": (100_000, setup_update_prices),
+    "housing.execute_transactions": (100_000, setup_execute_transactions),
+    "labor.run_labor_market": (100_000, setup_labor_market),
+    "state.collect_income_tax": (100_000, setup_income_tax),
+    "goods.clear": (1_000_000, setup_goods_clear),
+    "metrics.gini_coefficient": (1_000_000, setup_gini),
+}
+
+
+# --- Mittaus ---
+def measure(name: str, size: int, repeat: int = 3, seed: int = 0) -> MicroResult:
+    """Mittaa yksi benchmark: `repeat` ajastettua toistoa + yksi allokaatiotoisto."""
+    _, setup = BENCHMARKS[name]
+    times = []
+    for _ in range(repeat):
+        fn = setup(size, seed)
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+        del fn
+
+    fn = setup(size, seed)
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    fn()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return MicroResult(
+        name=name,
+        size=size,
+        repeat=repeat,
+        best_s=min(times),
+        median_s=statistics.median(times),
+        peak_alloc_bytes=max(0, peak - before),
+        net_alloc_bytes=after - before,
+    )
+
+
+def format_results(results: list[MicroResult]) -> str:
+    lines = [f"{'benchmark':<32}{'koko':>11}{'paras s':>11}{'mediaani s':>12}{'huippu MiB':>12}{'netto MiB':>11}"]
+    for r in results:
+        lines.append(
+            f"{r.name:<32}{r.size:>11,}{r.best_s:>11.4f}{r.median_s:>12.4f}"
+            f"{r.peak_alloc_bytes / 2**20:>12.2f}{r.net_alloc_bytes / 2**20:>11.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Osajärjestelmien mikrobenchmarkit.")
+    parser.add_argument("names", nargs="*", help=f"Ajettavat benchmarkit (oletus: kaikki): {', '.join(BENCHMARKS)}")
+    parser.add_argument("--size", type=int, default=None, help="Aineiston koko (ohittaa oletuskoot)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Kerroin oletuskokoihin, esim. 0.01")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=str, default=None, help="Tallenna tulokset JSON-tiedostoon")
+    args = parser.parse_args(argv)
+
+    names = args.names or list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {unknown}")
+
+    results = []
+    for name in names:
+        default_size, _ = BENCHMARKS[name]
+        size = args.size if args.size is not None else max(1, int(default_size * args.scale))
+        result = measure(name, size, repeat=args.repeat, seed=args.seed)
+        results.append(result)
+        print(f"  {name} ({size:,}): {result.best_s:.4f} s", flush=True)
+
+    print()
+    print(format_results(results))
+
+    if args.json:
+        path = Path(args.json)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps([asdict(r) for r in results], indent=2), encoding="utf-8")
+        print(f"\nTulokset tallennettu: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
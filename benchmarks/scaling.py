@@ -0,0 +1,268 @@
+"""v0.8.3: Skaalautuvuusbenchmark 1e2 ... 1e6 kotitaloutta.
+
+Jokainen koko ajetaan omassa prosessissaan (puhdas huippumuisti), ja siitä
+mitataan
+
+- mallin rakentamisen aika,
+- kuukausia sekunnissa (lämmittelykuukausien jälkeen),
+- vaihekohtainen aika per kuukausi (`PhaseTimer`),
+- huippumuisti (RSS) ja tavuja per agentti.
+
+Kokojen yli lasketaan kunkin vaiheen empiirinen kompleksisuuseksponentti
+(log-log-regression kulmakerroin: 1.0 = lineaarinen, 2.0 = neliöllinen).
+Tulokset tallennetaan JSON-perustasoksi, johon seuraavia ajoja verrataan.
+
+Käyttö::
+
+    python -m benchmarks.scaling --sizes 100 1000 10000 --save-baseline benchmarks/baselines/scaling.json
+    python -m benchmarks.scaling --sizes 100 1000 10000 --compare benchmarks/baselines/scaling.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import platform
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from core.config import load_config
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000)
+# Perustason suhde: 100 kotitaloutta / 3 yritystä
+HOUSEHOLDS_PER_FIRM = 100 / 3
+# Aikataulukon sarakkeet, jotka eivät ole vaiheita
+PHASE_EXCLUDE = {"month", "total"}
+
+
+def scaled_config(
+    base: dict[str, Any],
+    n_households: int,
+    engine: str = "agents",
+) -> dict[str, Any]:
+    """Skaalattu konfiguraatio: yritykset samassa suhteessa, asunnot `initialize_housing_stock`ista."""
+    cfg = deepcopy(base)
+    cfg.setdefault("agents", {})
+    cfg["agents"]["households"] = int(n_households)
+    cfg["agents"]["firms"] = max(3, round(n_households / HOUSEHOLDS_PER_FIRM))
+    simulation = cfg.setdefault("simulation", {})
+    simulation["household_engine"] = engine
+    simulation["profile_phases"] = True
+    simulation["checkpoint_every_months"] = 0
+    # Mallitason raportoijat kuuluvat mitattavaan työhön, agenttidata ei
+    output = dict(cfg.get("output") or {})
+    output["agent_reporters"] = {"enabled": False}
+    output.pop("sink", None)
+    cfg["output"] = output
+    return cfg
+
+
+def _peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux ilmoittaa kilotavuina, macOS tavuina
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+def run_size(
+    config: dict[str, Any],
+    n_households: int,
+    months: int,
+    warmup_months: int,
+    engine: str,
+    seed: int,
+) -> dict[str, Any]:
+    """Mittaa yksi koko (ajetaan omassa prosessissaan)."""
+    from core.model import EconomyModel
+
+    cfg = scaled_config(config, n_households, engine)
+    rss_before = _peak_rss_bytes()
+
+    random.seed(seed)
+    started = time.perf_counter()
+    model = EconomyModel(config=cfg, seed=seed)
+    build_s = time.perf_counter() - started
+
+    model.run_for_months(warmup_months)
+    started = time.perf_counter()
+    model.run_for_months(months)
+    run_s = time.perf_counter() - started
+
+    timings = model.phase_timer.dataframe()
+    measured = timings[timings["month"] > warmup_months]
+    phases = {
+        name: float(measured[name].mean())
+        for name in measured.columns
+        if name not in PHASE_EXCLUDE
+    }
+
+    peak = _peak_rss_bytes()
+    n_agents = len(model.agents)
+    return {
+        "households": n_households,
+        "firms": cfg["agents"]["firms"],
+        "dwellings": len(model.housing_market.dwellings),
+        "agents": n_agents,
+        "build_s": build_s,
+        "months": months,
+        "months_per_s": months / run_s if run_s > 0 else float("inf"),
+        "step_s": run_s / months,
+        "phase_s": phases,
+        "peak_rss_bytes": peak,
+        "bytes_per_agent": max(0, peak - rss_before) / max(1, n_agents),
+    }
+
+
+def complexity_exponents(results: list[dict[str, Any]]) -> dict[str, float]:
+    """Vaiheiden kulmakerroin log(aika) ~ log(kotitaloudet)."""
+    if len(results) < 2:
+        return {}
+    sizes = np.log([r["households"] for r in results])
+    series = {"step": [r["step_s"] for r in results]}
+    for name in results[0]["phase_s"]:
+        series[name] = [r["phase_s"].get(name, 0.0) for r in results]
+    exponents = {}
+    for name, values in series.items():
+        values = np.asarray(values, dtype=float)
+        if np.any(values <= 0):
+            continue
+        slope, _ = np.polyfit(sizes, np.log(values), 1)
+        exponents[name] = float(slope)
+    return exponents
+
+
+def run_suite(
+    config: dict[str, Any],
+    sizes: list[int],
+    months: int = 3,
+    warmup_months: int = 1,
+    engine: str = "agents",
+    seed: int = 42,
+    isolate: bool = True,
+) -> dict[str, Any]:
+    """Aja kaikki koot ja palauta perustasoksi kelpaava tulos-dict."""
+    results = []
+    for n in sorted(sizes):
+        if isolate:
+            # Uusi prosessi per koko, jotta huippumuisti ei periydy edelliseltä
+            ctx = mp.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                result = pool.submit(run_size, config, n, months, warmup_months, engine, seed).result()
+        else:
+            result = run_size(config, n, months, warmup_months, engine, seed)
+        results.append(result)
+        print(
+            f"  {n:>9,} kotitaloutta: {result['months_per_s']:8.2f} kk/s, "
+            f"rakennus {result['build_s']:.2f} s, "
+            f"RSS {result['peak_rss_bytes'] / 2**20:,.0f} MiB, "
+            f"{result['bytes_per_agent']:,.0f} B/agentti",
+            flush=True,
+        )
+    return {
+        "meta": {
+            "engine": engine,
+            "months": months,
+            "warmup_months": warmup_months,
+            "seed": seed,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+        "exponents": complexity_exponents(results),
+    }
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    slowdown_tolerance: float = 0.25,
+    exponent_tolerance: float = 0.2,
+) -> list[str]:
+    """Vertaa perustasoon; palauttaa havaitut regressiot tekstinä."""
+    regressions = []
+    by_size = {r["households"]: r for r in baseline.get("results", [])}
+    for result in current["results"]:
+        base = by_size.get(result["households"])
+        if base is None:
+            continue
+        ratio = base["months_per_s"] / result["months_per_s"]
+        if ratio > 1.0 + slowdown_tolerance:
+            regressions.append(
+                f"{result['households']:,} households: {ratio:.2f}x slower "
+                f"({base['months_per_s']:.2f} -> {result['months_per_s']:.2f} months/s)"
+            )
+    # Eksponentit ovat vertailukelpoisia vain samoilla ko'oilla
+    same_sizes = sorted(by_size) == sorted(r["households"] for r in current["results"])
+    for name, exponent in (current["exponents"] if same_sizes else {}).items():
+        base_exponent = baseline.get("exponents", {}).get(name)
+        if base_exponent is not None and exponent > base_exponent + exponent_tolerance:
+            regressions.append(
+                f"phase {name}: complexity exponent {base_exponent:.2f} -> {exponent:.2f}"
+            )
+    return regressions
+
+
+def format_exponents(exponents: dict[str, float]) -> str:
+    lines = [f"{'vaihe':<28}{'eksponentti':>12}"]
+    for name, value in sorted(exponents.items(), key=lambda item: -item[1]):
+        flag = "  <-- superlineaarinen" if value > 1.3 else ""
+        lines.append(f"{name:<28}{value:>12.2f}{flag}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Skaalautuvuusbenchmark kotitalouksien määrän yli.")
+    parser.add_argument("--config", default="config/base.yaml", help="Pohjakonfiguraatio")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--months", type=int, default=3, help="Mitattavat kuukaudet per koko")
+    parser.add_argument("--warmup-months", type=int, default=1)
+    parser.add_argument("--engine", choices=["agents", "vectorized"], default="agents")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save-baseline", type=str, default=None, help="Tallenna tulos JSON-perustasoksi")
+    parser.add_argument("--compare", type=str, default=None, help="Vertaa JSON-perustasoon")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Sallittu hidastuminen (osuus)")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    print(f"Skaalausbenchmark ({args.engine}): koot {args.sizes}, {args.months} kk")
+    suite = run_suite(
+        config,
+        args.sizes,
+        months=args.months,
+        warmup_months=args.warmup_months,
+        engine=args.engine,
+        seed=args.seed,
+    )
+
+    print("\n=== Kompleksisuuseksponentit ===")
+    print(format_exponents(suite["exponents"]))
+
+    if args.save_baseline:
+        path = Path(args.save_baseline)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(suite, indent=2), encoding="utf-8")
+        print(f"\nPerustaso tallennettu: {path}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(suite, baseline, slowdown_tolerance=args.tolerance)
+        if regressions:
+            print("\n=== Regressiot ===")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nEi regressioita perustasoon verrattuna.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
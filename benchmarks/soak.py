@@ -0,0 +1,195 @@
+"""v0.8.3: Pitkän ajon muistibenchmark (soak).
+
+Ajaa mallia pitkään (oletuksena `config/long_run.yaml`, 600 kk) ja kirjaa
+joka `every` kuukausi prosessin RSS-muistin sekä alijärjestelmien
+tietorakenteiden koot:
+
+- kotitaloudet (elävät, arkisto, populaation rivit, Mesan agenttirekisteri),
+- pankki (lainakanta, lainamittareiden historia),
+- rakennusliikkeiden projektit ja asuntokanta,
+- datankeräimen muistissa olevat rivit.
+
+Ajon jälkipuoliskolta tarkistetaan, kasvaako jokin rakenne elävää väestöä
+nopeammin (`bounded_violations`). Rajatun muistin tilassa
+(`simulation.bounded_memory`) rakenteiden koon pitää seurata elävää tilaa,
+ei kulunutta aikaa.
+
+Käyttö::
+
+    python -m benchmarks.soak --months 600
+    python -m benchmarks.soak --months 600 --bounded --csv results/soak_bounded.csv --check
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from benchmarks.scaling import _peak_rss_bytes
+from core.config import load_config
+
+# Sarakkeet, jotka eivät ole tietorakenteiden kokoja
+NON_STRUCTURE_COLUMNS = {"month", "elapsed_s", "rss_bytes", "gc_objects"}
+# Mallin semantiikkaan kuuluva kasvu, jota rajatun muistin tila ei poista
+KNOWN_GROWTH = {
+    "firms": "konkurssiyritykset jäävät listaan, koska CPI on kaikkien yritysten hintojen keskiarvo",
+}
+
+
+def _current_rss_bytes() -> int:
+    """Nykyinen RSS (Linux: /proc), muualla huippu-RSS."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            resident_pages = int(handle.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return _peak_rss_bytes()
+
+
+def structure_sizes(model: Any) -> dict[str, int]:
+    """Alijärjestelmien tietorakenteiden koot (alkioita)."""
+    collector = model.datacollector
+    construction = [f for f in model.firms if f.firm_type == "construction"]
+    return {
+        "households_live": len(model.households),
+        "households_archived": len(model.household_archive),
+        "population_rows": model.household_population.size,
+        "mesa_agents": len(model.agents),
+        "firms": len(model.firms),
+        "bank_loans": len(model.bank.loans),
+        "bank_loan_archive": len(model.bank.loan_archive) if model.bank.loan_archive is not None else 0,
+        "bank_loan_history": len(model.bank.loan_metrics_history),
+        "event_calendar": model.event_calendar.pending() if model.event_calendar is not None else 0,
+        "construction_projects": sum(len(f.construction_projects) for f in construction),
+        "dwellings": len(model.housing_market.dwellings),
+        "collector_model_rows": len(collector._model_rows),
+        "collector_agent_records": len(collector._agent_records),
+    }
+
+
+def run_soak(
+    config: dict[str, Any],
+    months: int,
+    every: int = 12,
+    bounded: bool = False,
+    seed: int = 42,
+    count_objects: bool = True,
+) -> pd.DataFrame:
+    """Aja malli `months` kuukautta ja palauta mittaukset kuukausittain (joka `every`)."""
+    from core.model import EconomyModel
+
+    simulation = config.setdefault("simulation", {})
+    simulation["bounded_memory"] = bounded
+    simulation["checkpoint_every_months"] = 0
+
+    random.seed(seed)
+    model = EconomyModel(config=config, seed=seed)
+    started = time.perf_counter()
+    samples = []
+    for month in range(1, months + 1):
+        model.step()
+        if month % every != 0 and month != months:
+            continue
+        sample: dict[str, Any] = {
+            "month": model.month,
+            "elapsed_s": time.perf_counter() - started,
+            "rss_bytes": _current_rss_bytes(),
+        }
+        if count_objects:
+            sample["gc_objects"] = len(gc.get_objects())
+        sample.update(structure_sizes(model))
+        samples.append(sample)
+    model.datacollector.close()
+    return pd.DataFrame.from_records(samples)
+
+
+def bounded_violations(samples: pd.DataFrame, tolerance: float = 0.1) -> list[str]:
+    """Rakenteet, jotka kasvavat ajon jälkipuoliskolla elävää väestöä nopeammin.
+
+    Väestön pieneneminen ei velvoita rakenteita pienenemään: raja on
+    lähtöarvo kertaa max(1, väestön kasvu) plus toleranssi.
+    """
+    if len(samples) < 2:
+        return []
+    mid = samples.iloc[len(samples) // 2]
+    end = samples.iloc[-1]
+    population_growth = max(1.0, end["households_live"] / max(1, mid["households_live"]))
+    violations = []
+    for name in samples.columns:
+        if name in NON_STRUCTURE_COLUMNS or name in KNOWN_GROWTH or name == "households_live":
+            continue
+        start_value, end_value = float(mid[name]), float(end[name])
+        if end_value <= max(start_value, 1.0) * population_growth * (1.0 + tolerance):
+            continue
+        violations.append(
+            f"{name}: {start_value:,.0f} -> {end_value:,.0f} "
+            f"(months {int(mid['month'])}-{int(end['month'])}, population x{population_growth:.2f})"
+        )
+    return violations
+
+
+def format_samples(samples: pd.DataFrame, max_rows: int = 12) -> str:
+    step = max(1, len(samples) // max_rows)
+    shown = samples.iloc[::step].copy()
+    if shown.index[-1] != samples.index[-1]:
+        shown = pd.concat([shown, samples.iloc[[-1]]])
+    shown["rss_mib"] = (shown["rss_bytes"] / 2**20).round(1)
+    columns = ["month", "rss_mib", *[c for c in samples.columns if c not in NON_STRUCTURE_COLUMNS]]
+    return shown[columns].to_string(index=False)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Pitkän ajon muistibenchmark.")
+    parser.add_argument("--config", default="config/long_run.yaml")
+    parser.add_argument("--months", type=int, default=None, help="Oletus: simulation.months")
+    parser.add_argument("--every", type=int, default=12, help="Mittausväli kuukausina")
+    parser.add_argument("--bounded", action="store_true", help="Rajatun muistin tila (simulation.bounded_memory)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-gc-count", action="store_true", help="Älä laske Python-olioita (nopeampi)")
+    parser.add_argument("--csv", type=str, default=None, help="Tallenna mittaukset CSV:ksi")
+    parser.add_argument("--check", action="store_true", help="Paluuarvo 1, jos jokin rakenne kasvaa rajatta")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    months = args.months or int(config.get("simulation", {}).get("months", 600))
+    mode = "rajattu muisti" if args.bounded else "oletus"
+    print(f"Soak-ajo ({mode}): {months} kk, mittaus {args.every} kk välein")
+    samples = run_soak(
+        config,
+        months,
+        every=args.every,
+        bounded=args.bounded,
+        seed=args.seed,
+        count_objects=not args.no_gc_count,
+    )
+    print(format_samples(samples))
+
+    if args.csv:
+        path = Path(args.csv)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        samples.to_csv(path, index=False)
+        print(f"\nMittaukset tallennettu: {path}")
+
+    violations = bounded_violations(samples, tolerance=args.tolerance)
+    if violations:
+        print("\n=== Rajatta kasvavat rakenteet ===")
+        for line in violations:
+            print(f"  {line}")
+    else:
+        print("\nKaikki rakenteet seuraavat elävää väestöä.")
+    for name, reason in KNOWN_GROWTH.items():
+        print(f"  (huom. {name}: {reason})")
+    return 1 if args.check and violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""Tapahtumapohjaisesti ylläpidetyt aggregaattilaskurit.
+
+Mallitason mittarit (työttömyysaste, omistusaste, yrittäjyysaste, väkiluku,
+keski-ikä, ...) luetaan laskureista O(1)-ajassa sen sijaan, että jokainen
+raportoija kävisi kaikki kotitaloudet läpi joka kuukausi.
+
+Kotitalouksien laskurit päivittyvät `HouseholdAgent`-näkymän seurattujen
+sarakkeiden asetuksessa (työllistäminen/irtisanominen, kuolema, yrityksen
+perustaminen, asuntokauppa, ...), joten kaikki tilamuutokset kulkevat saman
+kohdan kautta. Vektoroidut joukko-operaatiot päivittävät laskurit itse.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from core.model import EconomyModel
+    from agents.population import HouseholdPopulation
+
+
+class AggregateLedger:
+    """Elävien kotitalouksien ja toimivien yritysten juoksevat summat."""
+
+    # Sarakkeet, joiden muutokset välitetään laskureille
+    TRACKED_COLUMNS: frozenset[str] = frozenset(
+        {"alive", "age", "employed", "entrepreneur", "household_size", "dwelling_id"}
+    )
+
+    def __init__(self) -> None:
+        self.population: int = 0
+        self.age_sum: int = 0
+        self.employed: int = 0
+        self.entrepreneurs: int = 0
+        self.owners: int = 0
+        self.household_size_sum: int = 0
+        self.active_firms: int = 0
+
+    # --- Tapahtumat ---
+    def on_household_change(
+        self,
+        population: HouseholdPopulation,
+        row: int,
+        name: str,
+        old: object,
+        new: object,
+    ) -> None:
+        """Päivitä laskurit yhden kotitalouden sarakemuutoksen perusteella."""
+        if name == "alive":
+            old_alive, new_alive = bool(old), bool(new)
+            if old_alive == new_alive:
+                return
+            sign = 1 if new_alive else -1
+            self.population += sign
+            self.age_sum += sign * int(population.age[row])
+            self.employed += sign * int(population.employed[row])
+            self.entrepreneurs += sign * int(population.entrepreneur[row])
+            self.owners += sign * int(population.dwelling_id[row] >= 0)
+            self.household_size_sum += sign * int(population.household_size[row])
+            return
+
+        if not population.alive[row]:
+            return
+
+        if name == "age":
+            self.age_sum += int(new) - int(old)
+        elif name == "household_size":
+            self.household_size_sum += int(new) - int(old)
+        elif name == "employed":
+            self.employed += int(bool(new)) - int(bool(old))
+        elif name == "entrepreneur":
+            self.entrepreneurs += int(bool(new)) - int(bool(old))
+        elif name == "dwelling_id":
+            self.owners += int(int(new) >= 0) - int(int(old) >= 0)
+
+    def on_firm_opened(self) -> None:
+        self.active_firms += 1
+
+    def on_firm_closed(self) -> None:
+        self.active_firms -= 1
+
+    # --- Johdetut suureet ---
+    def rate(self, count: int) -> float:
+        if self.population <= 0:
+            return 0.0
+        return count / self.population
+
+    @property
+    def avg_age(self) -> float:
+        return self.age_sum / max(1, self.population)
+
+    # --- Tarkistus ---
+    @staticmethod
+    def rescan(model: EconomyModel) -> dict[str, int]:
+        """Laske laskurien arvot täydellä läpikäynnillä (debug-tarkistusta varten)."""
+        population = model.household_population
+        alive = population.column("alive")
+        return {
+            "population": int(alive.sum()),
+            "age_sum": int(population.column("age")[alive].sum()),
+            "employed": int((population.column("employed") & alive).sum()),
+            "entrepreneurs": int((population.column("entrepreneur") & alive).sum()),
+            "owners": int(((population.column("dwelling_id") >= 0) & alive).sum()),
+            "household_size_sum": int(population.column("household_size")[alive].sum()),
+            "active_firms": sum(1 for f in model.firms if f.alive),
+        }
+
+    def verify(self, model: EconomyModel) -> None:
+        """Vertaa laskureita täyteen läpikäyntiin ja nosta virhe, jos ne ovat ajautuneet."""
+        expected = self.rescan(model)
+        drift = {
+            key: (getattr(self, key), value)
+            for key, value in expected.items()
+            if getattr(self, key) != value
+        }
+        if drift:
+            details = ", ".join(f"{k}: ledger={v[0]} rescan={v[1]}" for k, v in drift.items())
+            raise RuntimeError(f"Aggregate ledger drift at month {model.month}: {details}")
@@ -0,0 +1,81 @@
+"""v0.8.3: Mallin tallennuspisteet (checkpoint / restore).
+
+Koko `EconomyModel`-olioverkko (kotitaloudet ja niiden sarakkeet, yritykset
+rakennusprojekteineen, pankin lainakanta viitteineen, valtio, asuntomarkkina,
+kerätty data) sarjallistetaan picklellä. Mukaan tallennetaan myös globaalin
+`random`-moduulin tila, koska osa agenttien päätöksistä käyttää sitä; mallin
+omat generaattorit (`model.random`, `model.rng`) kulkevat mallin mukana.
+Palautettu ajo jatkuu siten bitilleen samana kuin keskeytymätön ajo.
+
+Tiedosto kirjoitetaan ensin väliaikaisena ja siirretään paikalleen
+atomisesti, joten kaatuminen kesken tallennuksen ei riko edellistä
+tallennuspistettä. `.gz`-päätteellä tiedosto pakataan. Ladattaessa
+mahdollinen tulosten suoratoisto jatkuu tallennuspisteen kohdasta.
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+import pickle
+import random
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from core.model import EconomyModel
+
+CHECKPOINT_FORMAT = "taloussimu-checkpoint"
+CHECKPOINT_VERSION = 1
+
+
+def _open(path: Path, mode: str, compress: bool) -> Any:
+    if compress:
+        return gzip.open(path, mode, compresslevel=1)
+    return path.open(mode)
+
+
+def save_checkpoint(model: EconomyModel, path: str | Path) -> Path:
+    """Tallenna malli ja globaali satunnaistila tiedostoon `path`."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "format": CHECKPOINT_FORMAT,
+        "version": CHECKPOINT_VERSION,
+        "month": model.month,
+        "random_state": random.getstate(),
+        "model": model,
+    }
+    tmp_path = path.with_name(path.name + ".tmp")
+    with _open(tmp_path, "wb", compress=path.suffix == ".gz") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_checkpoint(path: str | Path, restore_random: bool = True) -> EconomyModel:
+    """Lataa tallennuspiste; oletuksena myös globaali `random`-tila palautetaan."""
+    path = Path(path)
+    if not path.is_file():
+        raise FileNotFoundError(f"Checkpoint not found: {path}")
+    with _open(path, "rb", compress=path.suffix == ".gz") as f:
+        payload = pickle.load(f)
+
+    if not isinstance(payload, dict) or payload.get("format") != CHECKPOINT_FORMAT:
+        raise ValueError(f"Not a model checkpoint: {path}")
+    if payload.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(
+            f"Unsupported checkpoint version {payload.get('version')} (expected {CHECKPOINT_VERSION})"
+        )
+
+    if restore_random:
+        random.setstate(payload["random_state"])
+    model = payload["model"]
+    # Suoratoisto avataan uudelleen vain tässä, ei jokaisessa picklen purussa
+    model.datacollector.resume()
+    return model
+
+
+def checkpoint_path_for(template: str | Path, month: int) -> Path:
+    """Muodosta polku mallista, esim. "checkpoints/run_{month:04d}.pkl"."""
+    return Path(str(template).format(month=month))
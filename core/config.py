@@ -23,3 +23,27 @@ def load_config(path: str | Path) -> dict[str, Any]:
         raise ValueError("Config root must be a mapping (dict)")
 
     return data
+
+
+def get_config_value(config: dict[str, Any], path: str, default: Any = None) -> Any:
+    """Lue pisteerotettu polku (esim. "banking.max_debt_service_ratio")."""
+    node: Any = config
+    for key in path.split("."):
+        if not isinstance(node, dict) or key not in node:
+            return default
+        node = node[key]
+    return node
+
+
+def set_config_value(config: dict[str, Any], path: str, value: Any) -> None:
+    """Aseta pisteerotettu polku paikallaan; puuttuvat välitasot luodaan."""
+    keys = path.split(".")
+    node = config
+    for key in keys[:-1]:
+        child = node.get(key)
+        if child is None:
+            child = node[key] = {}
+        elif not isinstance(child, dict):
+            raise ValueError(f"Config path {path!r} crosses non-mapping key {key!r}")
+        node = child
+    node[keys[-1]] = value
@@ -0,0 +1,88 @@
+"""v0.8.3: Kuukauden kuolinpesät jaetaan kerralla kuukauden lopussa.
+
+Aiemmin jokainen kuolema jakoi nettovarallisuuden heti kaikille muille
+eläville kotitalouksille (O(N) kuolemaa kohden, O(D·N) kuukaudessa).
+Nyt kuolema vain kirjaa perinnön pesään, ja `settle` jakaa koko kuukauden
+pesän yhdellä taulukko-operaatiolla kuukauden kotitalousvaiheen lopussa.
+
+Jaettava kokonaissumma on sama kuin ennen: kunkin kuolleen positiivinen
+nettovarallisuus kuolinhetkellä. Saajia ovat jakohetkellä elävät
+kotitaloudet (samassa kuussa myöhemmin kuolleet eivät enää saa osuutta
+edelleen jaettavaksi).
+
+Kohdennetut perilliset (`households.inheritance: children`): perintö jaetaan
+kotoa muuttaneille lapsille; jos yksikään ei ole elossa, perintö menee
+yhteiseen jakoon kuten ennen.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover
+    from agents.household import HouseholdAgent
+    from core.model import EconomyModel
+
+INHERITANCE_MODES = ("uniform", "children")
+
+
+class EstatePool:
+    """Kuukauden aikana kertyneet perinnöt: yhteinen pesä + kohdennetut osuudet."""
+
+    def __init__(self, model: EconomyModel) -> None:
+        self.model = model
+        self.pooled = 0.0
+        self._targeted: list[tuple[list[HouseholdAgent], float]] = []
+        # Tilastot: viimeisin jako ja kumulatiivinen summa
+        self.last_settled = 0.0
+        self.total_settled = 0.0
+
+    def add(self, amount: float, heirs: Iterable[HouseholdAgent] | None = None) -> None:
+        """Kirjaa perintö jaettavaksi kuukauden lopussa."""
+        if amount <= 0.0:
+            return
+        heirs = list(heirs) if heirs is not None else []
+        if heirs:
+            self._targeted.append((heirs, amount))
+        else:
+            self.pooled += amount
+
+    def pending(self) -> float:
+        """Jakamaton perintösumma."""
+        return self.pooled + sum(amount for _, amount in self._targeted)
+
+    def settle(self) -> float:
+        """Jaa kuukauden pesä eläville kotitalouksille. Palauttaa jaetun summan."""
+        population = self.model.household_population
+        cash = population.cash
+        settled = 0.0
+
+        pooled = self.pooled
+        if self._targeted:
+            heir_rows: list[int] = []
+            shares: list[float] = []
+            for heirs, amount in self._targeted:
+                living = [heir._row for heir in heirs if heir.alive]
+                if not living:
+                    pooled += amount
+                    continue
+                heir_rows.extend(living)
+                shares.extend([amount / len(living)] * len(living))
+            if heir_rows:
+                # Sama perillinen voi periä useammalta: np.add.at summaa toistuvat rivit
+                np.add.at(cash, np.asarray(heir_rows, dtype=np.int64), np.asarray(shares))
+                settled += float(np.sum(shares))
+
+        if pooled > 0.0:
+            rows = population.alive_rows()
+            if rows.size:
+                cash[rows] += pooled / rows.size
+                settled += pooled
+
+        self.pooled = 0.0
+        self._targeted = []
+        self.last_settled = settled
+        self.total_settled += settled
+        return settled
@@ -0,0 +1,178 @@
+"""v0.8.3: Harvinaisten kotitaloustapahtumien tapahtumakalenteri.
+
+Kuolema, pesästä lentäminen, yrityksen perustaminen ja syntymä ovat
+Bernoulli-kokeita joka kuukausi todennäköisyydellä p (~0.1-1 %). Sen sijaan,
+että jokainen kotitalous arpoisi joka kuukausi, kalenteri arpoo kunkin
+kotitalouden seuraavaan "kellonlyöntiin" kuluvan ajan geometrisesta
+jakaumasta (odotusaika T >= 1 kk, P(T = t) = (1 - p)^(t-1) p) ja koskee
+kotitalouteen vain, kun kello lyö. Muistittomuuden vuoksi tämä on
+jakaumaltaan sama prosessi kuin kuukausittaiset arvonnat.
+
+Kellonlyönti ei vielä tarkoita tapahtumaa: kelpoisuus (lapsia kotona,
+hedelmällinen ikä, yrittäjyysikä, ...) tarkistetaan lyöntikuukautena, kuten
+kuukausittaisessakin arvonnassa. Lyönnin jälkeen kello arvotaan uudelleen.
+
+Todennäköisyyden muuttuessa (konfiguraatiomuutos, syntyvyyskerroin)
+kaikkien kotitalouksien kyseinen kello arvotaan uudelleen nykyhetkestä;
+vanhat merkinnät vanhenevat aikakausilaskurin (`epoch`) avulla.
+
+Korit viittaavat kotitalouksiin id:llä; itse agentit ovat vain
+`_agents`-hakemistossa, josta `remove` (kutsutaan `die`ssä) poistaa ne heti.
+Kuolleiden ja vanhentuneiden merkintöjen korit siivotaan `compact`issa, kun
+niitä on kertynyt yhtä paljon kuin voimassa olevia.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Callable, Iterable
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover
+    from agents.household import HouseholdAgent
+    from core.model import EconomyModel
+
+EVENT_KINDS: dict[str, Callable[[EconomyModel], float]] = {
+    "death": lambda m: m.death_prob_per_year / 12,
+    "leave_home": lambda m: m.leaving_home_rate_per_month,
+    "entrepreneurship": lambda m: m.entrepreneurship_rate_per_month,
+    "birth": lambda m: m.monthly_birth_probability(),
+}
+
+
+class EventCalendar:
+    """Kuukausikohtaiset tapahtumakorit: kuukausi -> [(laji, kotitalouden id, epoch)]."""
+
+    def __init__(self, model: EconomyModel) -> None:
+        self.model = model
+        self._buckets: dict[int, list[tuple[str, int, int]]] = {}
+        self._size = 0
+        self._agents: dict[int, HouseholdAgent] = {}
+        self._probabilities: dict[str, float] = {}
+        self._epochs: dict[str, int] = {kind: 0 for kind in EVENT_KINDS}
+        self._unscheduled: list[HouseholdAgent] = []
+        self._due: dict[str, set[int]] = {kind: set() for kind in EVENT_KINDS}
+        self._due_agents: dict[str, list[HouseholdAgent]] = {kind: [] for kind in EVENT_KINDS}
+
+    # --- Kotitalouksien lisäys ---
+    def add(self, agent: HouseholdAgent) -> None:
+        """Uusi kotitalous: kellot arvotaan seuraavassa `advance`-kutsussa."""
+        self._agents[agent.unique_id] = agent
+        self._unscheduled.append(agent)
+
+    def remove(self, agent: HouseholdAgent) -> None:
+        """Kuollut kotitalous: sen merkinnät ohitetaan ja siivotaan `compact`issa."""
+        self._agents.pop(agent.unique_id, None)
+
+    def compact(self) -> None:
+        """Poista korista kuolleiden ja vanhentuneiden kellojen merkinnät.
+
+        Siivous tehdään vasta, kun merkintöjä on yli kaksinkertaisesti
+        voimassa oleviin nähden, joten sen kustannus jakautuu merkinnöille.
+        """
+        active_kinds = sum(1 for p in self._probabilities.values() if p > 0.0)
+        if self._size <= 2 * len(self._agents) * max(1, active_kinds):
+            return
+        agents, epochs = self._agents, self._epochs
+        size = 0
+        for month in list(self._buckets):
+            bucket = [
+                entry for entry in self._buckets[month]
+                if entry[1] in agents and entry[2] == epochs[entry[0]]
+            ]
+            if bucket:
+                self._buckets[month] = bucket
+                size += len(bucket)
+            else:
+                del self._buckets[month]
+        self._size = size
+
+    # --- Kuukauden vaihto ---
+    def advance(self, month: int) -> None:
+        """Päivitä muuttuneet todennäköisyydet, ajasta uudet ja kerää kuukauden lyönnit."""
+        live = None
+        fresh = {agent.unique_id for agent in self._unscheduled}
+        for kind, probability_of in EVENT_KINDS.items():
+            probability = float(probability_of(self.model))
+            if self._probabilities.get(kind) == probability:
+                continue
+            first = kind not in self._probabilities
+            self._probabilities[kind] = probability
+            if first:
+                continue
+            # Muistittomuus: nykyhetkestä arvottu uusi kello on yhtä oikea kuin vanha
+            self._epochs[kind] += 1
+            if live is None:
+                live = [hh for hh in self.model.households if hh.alive and hh.unique_id not in fresh]
+            self._schedule(kind, live, month - 1, index=1)
+
+        if self._unscheduled:
+            agents = [hh for hh in self._unscheduled if hh.alive]
+            self._unscheduled = []
+            for kind in EVENT_KINDS:
+                self._schedule(kind, agents, month - 1)
+
+        for kind in EVENT_KINDS:
+            self._due[kind] = set()
+            self._due_agents[kind] = []
+        fired: dict[str, list[HouseholdAgent]] = {kind: [] for kind in EVENT_KINDS}
+        bucket = self._buckets.pop(month, ())
+        self._size -= len(bucket)
+        for kind, agent_id, epoch in bucket:
+            agent = self._agents.get(agent_id)
+            if agent is None or epoch != self._epochs[kind]:
+                continue
+            fired[kind].append(agent)
+        for kind, agents in fired.items():
+            self._due_agents[kind] = agents
+            self._due[kind] = {agent.unique_id for agent in agents}
+            self._schedule(kind, agents, month)
+
+    def is_due(self, kind: str, agent: HouseholdAgent) -> bool:
+        """Lyökö kotitalouden kello tässä kuussa."""
+        return agent.unique_id in self._due[kind]
+
+    def due(self, kind: str) -> list[HouseholdAgent]:
+        """Kuukauden lyönnit ajastusjärjestyksessä."""
+        return self._due_agents[kind]
+
+    # --- Ajastus ---
+    def _schedule(self, kind: str, agents: Iterable[HouseholdAgent], month: int, index: int = 0) -> None:
+        """Arvo odotusaika jokaiselle kotitaloudelle kuukaudesta `month` eteenpäin."""
+        agents = list(agents)
+        probability = self._probabilities.get(kind, 0.0)
+        if not agents or probability <= 0.0:
+            return
+        epoch = self._epochs[kind]
+        waits = self._waiting_times(kind, agents, month, probability, index)
+        buckets = self._buckets
+        for agent, wait in zip(agents, waits.tolist()):
+            buckets.setdefault(month + wait, []).append((kind, agent.unique_id, epoch))
+        self._size += len(agents)
+
+    def _waiting_times(
+        self,
+        kind: str,
+        agents: list[HouseholdAgent],
+        month: int,
+        probability: float,
+        index: int,
+    ) -> np.ndarray:
+        if probability >= 1.0:
+            return np.ones(len(agents), dtype=np.int64)
+        counter_rng = self.model.counter_rng
+        if counter_rng is not None:
+            ids = np.fromiter((a.unique_id for a in agents), dtype=np.int64, count=len(agents))
+            uniforms = counter_rng.stream(f"events.{kind}").randoms(ids, month, index)
+        else:
+            uniforms = self.model.rng.random(len(agents))
+        # Käänteisfunktio: T = 1 + floor(log(1 - U) / log(1 - p)), U ~ [0, 1)
+        waits = 1.0 + np.floor(np.log1p(-uniforms) / math.log1p(-probability))
+        # Hyvin pienellä p:llä odotus voi ylittää int64:n; rajataan käytännön ylärajaan
+        return np.minimum(waits, 1e12).astype(np.int64)
+
+    # --- Tilastot ---
+    def pending(self) -> int:
+        """Ajastettujen merkintöjen määrä (sis. vielä siivoamattomat vanhentuneet)."""
+        return self._size
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Any
 
 from mesa import Model
-from mesa.datacollection import DataCollector
 
 from agents.bank import BankAgent
 from agents.household import HouseholdAgent
+from agents.population import HouseholdPopulation, LiveHouseholds
 from agents.firm import FirmAgent
 from agents.state import StateAgent
+from core.aggregates import AggregateLedger
+from core.checkpoint import checkpoint_path_for, load_checkpoint, save_checkpoint
+from core.estates import INHERITANCE_MODES, EstatePool
+from core.events import EventCalendar
+from core.overrides import apply_config_overrides
+from core.profiling import PhaseTimer
+from core.rng import CounterRNG
+from output.collector import ScheduledDataCollector
 
 
 class EconomyModel(Model):
@@ -32,6 +41,7 @@ class EconomyModel(Model):
         self.month: int = 0
         self.total_consumption: float = 0.0  # Joka step resetoidaan
 
+        simulation_cfg = config.get("simulation", {})
         agents_cfg = config.get("agents", {})
         households_cfg = config.get("households", {})
         wages_cfg = config.get("wages", {})
@@ -70,6 +80,35 @@ class EconomyModel(Model):
         self.fertile_age_min: int = int(households_cfg.get("fertile_age_min", 20))
         self.fertile_age_max: int = int(households_cfg.get("fertile_age_max", 45))
         self.child_initial_cash: float = float(households_cfg.get("child_initial_cash", 0.0))
+        # v0.8.3: Perinnöt kerätään kuukauden pesään ja jaetaan kerralla:
+        # "uniform" (kaikille eläville) tai "children" (kotoa muuttaneille lapsille)
+        self.inheritance_mode: str = str(households_cfg.get("inheritance", "uniform"))
+        if self.inheritance_mode not in INHERITANCE_MODES:
+            raise ValueError(f"Unknown inheritance mode: {self.inheritance_mode}")
+        self.estates = EstatePool(self)
+
+        # v0.8.2: Kotitalousvaiheen moottori: "agents" (agentti kerrallaan) tai
+        # "vectorized" (koko populaatio taulukko-operaatioina)
+        self.household_engine: str = str(simulation_cfg.get("household_engine", "agents"))
+        if self.household_engine not in ("agents", "vectorized"):
+            raise ValueError(f"Unknown household_engine: {self.household_engine}")
+        # v0.8.3: Satunnaislukujen lähde: "sequential" (mallin generaattorit kutsujärjestyksessä)
+        # tai "counter" (Philox-arvonta avaimilla siemen/alijärjestelmä/agentti/kuukausi)
+        rng_mode = str(simulation_cfg.get("rng", "sequential"))
+        if rng_mode not in ("sequential", "counter"):
+            raise ValueError(f"Unknown rng mode: {rng_mode}")
+        self.counter_rng: CounterRNG | None = None
+        if rng_mode == "counter":
+            root_seed = seed if seed is not None else int(self.rng.integers(2**63))
+            self.counter_rng = CounterRNG(root_seed)
+        # v0.8.3: Harvinaiset kotitaloustapahtumat: "monthly" (arvonta joka kuukausi)
+        # tai "calendar" (geometriset odotusajat, kotitalouteen kosketaan vain lyönnillä)
+        rare_events = str(simulation_cfg.get("rare_events", "monthly"))
+        if rare_events not in ("monthly", "calendar"):
+            raise ValueError(f"Unknown rare_events mode: {rare_events}")
+        self.event_calendar: EventCalendar | None = (
+            EventCalendar(self) if rare_events == "calendar" else None
+        )
 
         self.tax_rate: float = float(taxes_cfg.get("income_flat_rate", 0.25))
         self.vat_rate: float = float(taxes_cfg.get("vat_rate", 0.24))
@@ -83,6 +122,25 @@ class EconomyModel(Model):
         firm_investment_term = int(firms_cfg.get("investment_loan_term", 48))
         firm_investment_cash_buffer = float(firms_cfg.get("investment_cash_buffer", 0.0))
 
+        # v0.8.2: Tapahtumapohjaiset aggregaattilaskurit raportoijille.
+        # debug_aggregates vertaa laskureita täyteen läpikäyntiin joka kuukausi.
+        self.aggregates = AggregateLedger()
+        self.debug_aggregates: bool = bool(simulation_cfg.get("debug_aggregates", False))
+        # v0.8.3: Vaiheiden ajanotto (get_results()["timings"], PhaseTimer.summary)
+        self.phase_timer = PhaseTimer(
+            enabled=bool(simulation_cfg.get("profile_phases", False)),
+            per_agent_type=bool(simulation_cfg.get("profile_agent_types", False)),
+        )
+        # v0.8.3: Automaattiset tallennuspisteet run_for_months-ajossa (0 = pois)
+        self.checkpoint_every_months: int = int(simulation_cfg.get("checkpoint_every_months", 0))
+        self.checkpoint_path: str = str(
+            simulation_cfg.get("checkpoint_path", "checkpoints/month_{month:04d}.pkl")
+        )
+        # v0.8.3: Rajatun muistin tila: kuolleet, päättyneet lainat ja vanha historia
+        # poistetaan muistista, jolloin muistinkäyttö ei kasva ajon pituuden mukana
+        self.bounded_memory: bool = bool(simulation_cfg.get("bounded_memory", False))
+        self.history_months: int = int(simulation_cfg.get("history_months", 120))
+
         # Luodaan valtio-agentti (Mesa 3.x rekisteröi agentit automaattisesti)
         self.state = StateAgent(
             model=self,
@@ -118,18 +176,32 @@ class EconomyModel(Model):
             self.firms.append(firm)
 
         # Luodaan kotitaloudet satunnaisilla iäillä
-        self.households: list[HouseholdAgent] = []
+        # v0.8.2: Kotitalouksien numeerinen tila sarakkeina, agentit ovat näkymiä riveihin
+        self.household_population = HouseholdPopulation(model=self, capacity=n_households)
+        self.households: LiveHouseholds = LiveHouseholds()
+        # Kuolleet kotitaloudet siirretään pois iterointijoukosta tänne
+        self.household_archive: list[HouseholdAgent] = []
+        init_stream = self.counter_rng.stream("init.household") if self.counter_rng else None
+
+        def choose(options: list[int], i: int) -> int:
+            if init_stream is not None:
+                return init_stream.choice(options, i, 0, index=1)
+            return self.random.choice(options)
+
         for i in range(n_households):
-            age = self.random.randint(initial_age_min, initial_age_max)
+            if init_stream is not None:
+                age = init_stream.randint(i, 0, initial_age_min, initial_age_max)
+            else:
+                age = self.random.randint(initial_age_min, initial_age_max)
             # v0.5: Alustetaan household_size realistisesti iän mukaan
             if age < 25:
                 household_size = 1  # Nuoret yksin
             elif age < 35:
-                household_size = self.random.choice([1, 2, 2])  # Pääosin pareja
+                household_size = choose([1, 2, 2], i)  # Pääosin pareja
             elif age < 50:
-                household_size = self.random.choice([2, 3, 4, 4])  # Perheitä
+                household_size = choose([2, 3, 4, 4], i)  # Perheitä
             else:
-                household_size = self.random.choice([1, 2, 2])  # Vanhemmat pareja tai yksin
+                household_size = choose([1, 2, 2], i)  # Vanhemmat pareja tai yksin
             
             household = HouseholdAgent(
                 model=self,
@@ -159,14 +231,23 @@ class EconomyModel(Model):
             model=self,
             config=banking_cfg,
         )
+        if self.bounded_memory:
+            self.bank.set_bounded_memory(self.history_months)
         
         # v0.5: Luodaan asuntomarkkina
+        from markets.goods import GoodsMarket
         from markets.housing import HousingMarket
+        from markets.labor import LaborMarket
         housing_cfg = config.get("housing", {})
         self.leaving_home_rate_per_month: float = float(
             housing_cfg.get("leaving_home_rate_per_month", 0.01)
         )
         self.housing_market = HousingMarket(model=self)
+        # v0.8.3: Työmarkkina (palkkajärjestetty keko ja työntekijärekisterit)
+        self.labor_market = LaborMarket(model=self)
+        # v0.8.3: Hyödykemarkkina ("random" = satunnainen yritys, "cheapest" = halvin ensin)
+        goods_cfg = config.get("goods", {})
+        self.goods_market = GoodsMarket(model=self, routing=str(goods_cfg.get("routing", "random")))
         
         # v0.6: Yrittäjyys-konfiguraatio
         entrepreneurship_cfg = config.get("entrepreneurship", {})
@@ -192,75 +273,14 @@ class EconomyModel(Model):
         # Alusta osa kotitalouksista asunnonomistajiksi (60% omistusaste)
         self._initialize_housing_ownership()
 
-        self.datacollector = DataCollector(
-            model_reporters={
-                "month": lambda m: m.month,
-                "cpi": lambda m: m.cpi,  # v0.4: UUSI - Consumer Price Index
-                "unemployment_rate": lambda m: m.unemployment_rate,
-                "state_balance": lambda m: m.state_balance,
-                "total_consumption": lambda m: m.total_consumption,
-                "gini_wealth": lambda m: m.gini_wealth,
-                "avg_age": lambda m: sum(h.age for h in m.households if h.alive) / max(1, sum(1 for h in m.households if h.alive)),
-                "population": lambda m: sum(1 for h in m.households if h.alive),
-                "money_supply_m1": lambda m: m.money_supply_m1,
-                "bank_total_loans": lambda m: m.bank_total_loans,
-                "bank_capital_ratio": lambda m: m.bank_capital_ratio,
-                "bank_default_losses": lambda m: getattr(m.bank, "total_defaulted", 0.0),
-                "bank_performing_share": lambda m: m.bank_performing_share,
-                "bank_age_bucket_0_6": lambda m: m.bank_age_bucket_0_6,
-                "bank_age_bucket_6_12": lambda m: m.bank_age_bucket_6_12,
-                "bank_age_bucket_12_24": lambda m: m.bank_age_bucket_12_24,
-                "bank_age_bucket_24_plus": lambda m: m.bank_age_bucket_24_plus,
-                "bank_investment_loan_share": lambda m: m.bank_investment_loan_share,
-                "bank_nonperforming_balance": lambda m: m.bank_nonperforming_balance,
-                "bank_avg_active_loan_age": lambda m: m.bank_avg_active_loan_age,
-                # v0.5: Asuntomarkkina-mittarit
-                "avg_household_size": lambda m: m.avg_household_size,
-                "residents_per_dwelling": lambda m: m.residents_per_dwelling,
-                "housing_ownership_rate": lambda m: m.housing_ownership_rate,
-                "avg_house_price": lambda m: m.avg_house_price,
-                "avg_house_price_size_1": lambda m: m.avg_house_price_by_size(1),
-                "avg_house_price_size_2": lambda m: m.avg_house_price_by_size(2),
-                "avg_house_price_size_3": lambda m: m.avg_house_price_by_size(3),
-                "avg_house_price_size_4": lambda m: m.avg_house_price_by_size(4),
-                "housing_transactions": lambda m: m.housing_market.monthly_transactions,
-                # v0.6: Yrittäjyys-mittarit
-                "entrepreneurship_rate": lambda m: m.entrepreneurship_rate,
-                "firm_births_per_month": lambda m: m.firm_births_per_month,
-                "firm_deaths_per_month": lambda m: m.firm_deaths_per_month,
-                "avg_firm_age": lambda m: m.avg_firm_age,
-                "entrepreneur_wealth_share": lambda m: m.entrepreneur_wealth_share,
-                "num_active_firms": lambda m: m.num_active_firms,
-                # v0.7: Rakennusliike-mittarit
-                "construction_projects_active": lambda m: m.construction_projects_active,
-                "construction_employment": lambda m: m.construction_employment,
-                "dwellings_completed_per_month": lambda m: m.dwellings_completed_per_month,
-                "construction_sector_cash": lambda m: m.construction_sector_cash,
-                "avg_construction_profit_margin": lambda m: m.avg_construction_profit_margin,
-                # v0.8: Valtio-mittarit
-                "state_monthly_revenue": lambda m: m.state.monthly_revenue,
-                "state_monthly_expenses": lambda m: m.state.monthly_expenses,
-                "state_surplus": lambda m: m.state.monthly_surplus,
-                "state_total_debt": lambda m: m.state.total_debt,
-                "state_debt_to_gdp": lambda m: m.state.debt_to_gdp_ratio,
-                "state_income_tax": lambda m: m.state.income_tax_revenue,
-                "state_corporate_tax": lambda m: m.state.corporate_tax_revenue,
-                "state_vat": lambda m: m.state.vat_revenue,
-                "state_capital_gains_tax": lambda m: m.state.capital_gains_revenue,
-                "state_transfers": lambda m: m.state.transfer_expenses,
-                "state_debt_service": lambda m: m.state.debt_service_expenses,
-                "state_public_procurement": lambda m: m.state.public_procurement_expenses,
-                "effective_tax_rate": lambda m: m.state.effective_tax_rate,
-            },
-            agent_reporters={
-                "cash": "cash",
-                "net_worth": lambda a: getattr(a, "net_worth", 0.0),
-                "age": lambda a: getattr(a, "age", None),
-                "alive": lambda a: getattr(a, "alive", None),
-                "employed": lambda a: getattr(a, "employed", None),
-                "household_size": lambda a: getattr(a, "household_size", None),
-            },
-        )
+        # v0.8.3: Raportoijat ja keruuvälit valitaan config["output"]-osiosta
+        output_cfg = config.get("output", {})
+        self.datacollector = ScheduledDataCollector.from_config(output_cfg)
+        sink = ScheduledDataCollector.sink_from_config(output_cfg)
+        if sink is not None:
+            self.datacollector.attach_sink(sink)
+        elif self.bounded_memory:
+            self.datacollector.set_history_limit(self.history_months)
 
     def _initialize_housing_ownership(self) -> None:
         """v0.5: Alusta osa kotitalouksista asunnonomistajiksi.
@@ -306,11 +326,9 @@ class EconomyModel(Model):
 
     @property
     def unemployment_rate(self) -> float:
-        households = [h for h in self.households]
-        if not households:
-            return 0.0
-        unemployed = sum(1 for h in households if not h.employed)
-        return unemployed / len(households)
+        """Työttömien (ml. eläkeläiset) osuus elävistä kotitalouksista."""
+        ledger = self.aggregates
+        return ledger.rate(ledger.population - ledger.employed)
 
     @property
     def state_balance(self) -> float:
@@ -371,27 +389,19 @@ class EconomyModel(Model):
     @property
     def avg_household_size(self) -> float:
         """Kotitalouden keskikoko."""
-        alive = [h for h in self.households if h.alive]
-        if not alive:
-            return 0.0
-        return sum(h.household_size for h in alive) / len(alive)
+        return self.aggregates.rate(self.aggregates.household_size_sum)
     
     @property
     def residents_per_dwelling(self) -> float:
         """Asukasta per asunto - vastaa käyttäjän kysymykseen!"""
         if not self.housing_market.dwellings:
             return 0.0
-        total_residents = sum(h.household_size for h in self.households if h.alive)
-        return total_residents / len(self.housing_market.dwellings)
+        return self.aggregates.household_size_sum / len(self.housing_market.dwellings)
     
     @property
     def housing_ownership_rate(self) -> float:
         """Omistusasumisen aste."""
-        alive = [h for h in self.households if h.alive]
-        if not alive:
-            return 0.0
-        owners = len([h for h in alive if h.dwelling is not None])
-        return owners / len(alive)
+        return self.aggregates.rate(self.aggregates.owners)
     
     @property
     def avg_house_price(self) -> float:
@@ -411,11 +421,7 @@ class EconomyModel(Model):
     @property
     def entrepreneurship_rate(self) -> float:
         """Yrittäjien osuus työvoimasta."""
-        alive = [h for h in self.households if h.alive]
-        if not alive:
-            return 0.0
-        entrepreneurs = len([h for h in alive if h.entrepreneur])
-        return entrepreneurs / len(alive)
+        return self.aggregates.rate(self.aggregates.entrepreneurs)
     
     @property
     def firm_births_per_month(self) -> float:
@@ -460,7 +466,7 @@ class EconomyModel(Model):
     @property
     def num_active_firms(self) -> int:
         """Toiminnassa olevien yritysten määrä."""
-        return len([f for f in self.firms if f.alive])
+        return self.aggregates.active_firms
     
     # v0.7: Rakennusliike-mittarit
     @property
@@ -524,6 +530,20 @@ class EconomyModel(Model):
         vanhemman household_size ja num_children -lukuja.
         Lapsi "aktivoituu" agentiksi vasta check_leaving_home():ssa.
         """
+        monthly_birth_prob = self.monthly_birth_probability()
+
+        if self.household_engine == "vectorized":
+            self.household_population.process_births(monthly_birth_prob)
+            return
+
+        if self.event_calendar is not None:
+            # v0.8.3: Vain ne, joiden syntymäkello lyö tässä kuussa
+            for parent in self.event_calendar.due("birth"):
+                if parent.alive and self.fertile_age_min <= parent.age <= self.fertile_age_max:
+                    parent.household_size += 1
+                    parent.num_children += 1
+            return
+
         living_households = [h for h in self.households if h.alive]
         fertile_households = [
             h for h in living_households 
@@ -533,19 +553,23 @@ class EconomyModel(Model):
         if not fertile_households:
             return
         
-        # Kuukausittainen syntymätodennäköisyys per hedelmällinen agentti
-        monthly_birth_prob = self.birth_rate_per_year / 12
-        
-        # Dynaaminen syntyvyys (jos halutaan säätää ajan mukaan)
-        monthly_birth_prob *= self.birth_rate_multiplier()
-        
+        birth_stream = self.counter_rng.stream("household.birth") if self.counter_rng else None
         for parent in fertile_households:
-            if self.random.random() < monthly_birth_prob:
+            if birth_stream is not None:
+                draw = birth_stream.random(parent.unique_id, self.month)
+            else:
+                draw = self.random.random()
+            if draw < monthly_birth_prob:
                 # v0.5: Lapsi kasvattaa perheen kokoa, ei luo agenttia
                 parent.household_size += 1
                 parent.num_children += 1
                 # Lapsi "aktivoituu" agentiksi vasta 18-25v iässä
     
+    def monthly_birth_probability(self) -> float:
+        """Kuukausittainen syntymätodennäköisyys per hedelmällinen agentti."""
+        # Dynaaminen syntyvyys (jos halutaan säätää ajan mukaan)
+        return self.birth_rate_per_year / 12 * self.birth_rate_multiplier()
+
     def birth_rate_multiplier(self) -> float:
         """Dynaaminen syntyvyyskerroin (valinnainen).
         
@@ -579,112 +603,107 @@ class EconomyModel(Model):
 
         self.month += 1
         self.total_consumption = 0.0
+        timer = self.phase_timer
 
         # v0.7: Työmarkkinat ennen palkanmaksua
-        self._run_labor_market()
+        with timer.phase("labor_market"):
+            self._run_labor_market()
         
         # v0.8: Valtio nollaa kuukausittaiset laskurit
         self.state.reset_monthly_counters()
         
         # v0.8: Valtio kerää yritysverot ENNEN kuin yritykset nollaavat kirjanpitonsa
         # (Perustuu edellisen kuukauden revenue/expenses)
-        self.state.collect_corporate_tax()
+        with timer.phase("corporate_tax"):
+            self.state.collect_corporate_tax()
         
         # v0.8: Yritykset step (nollaa kirjanpito, tuotanto, hinnoittelu, palkanmaksu)
-        for firm in self.firms:
-            firm.step()
+        with timer.phase("firms"):
+            if timer.per_agent_type:
+                for firm in self.firms:
+                    with timer.phase("firms." + firm.firm_type):
+                        firm.step()
+            else:
+                for firm in self.firms:
+                    firm.step()
         
         # v0.8: Valtio maksaa velanhoitokulut
-        self.state.pay_debt_interest()
+        with timer.phase("state_debt_service"):
+            self.state.pay_debt_interest()
         
         # v0.8: Valtio maksaa tulonsiirrot (työttömyystuki, eläkkeet)
-        self.state.pay_transfers()
+        with timer.phase("transfers"):
+            self.state.pay_transfers()
         
         # v0.8: Valtio kerää tuloverot (palkoista)
-        self.state.collect_income_tax()
+        with timer.phase("income_tax"):
+            self.state.collect_income_tax()
         
         # v0.8: Valtio tekee julkisia hankintoja (ENNEN kotitalouksien kulutusta)
         # Perustuu EDELLISEN kuukauden tuloihin (jotka ovat state.cash_balance:ssa)
-        self.state.make_public_purchases()
+        with timer.phase("procurement"):
+            self.state.make_public_purchases()
         
         # Kotitaloudet kuluttavat (sisältää ALV-maksun)
-        for hh in self.households:
-            hh.step()
+        with timer.phase("households"):
+            if self.event_calendar is not None:
+                self.event_calendar.advance(self.month)
+            if self.household_engine == "vectorized":
+                self.household_population.step_month()
+            else:
+                for hh in self.households:
+                    hh.step()
+            self.goods_market.settle()
+            self.estates.settle()
+            self._compact_households()
         
         # v0.8: Valtio laskee budjetin ja päivittää velan
-        self.state.run_budget()
+        with timer.phase("budget"):
+            self.state.run_budget()
         
         # Pankki hoitaa lainojen kassavirrat kuukauden lopussa
-        self.bank.step()
+        with timer.phase("bank"):
+            self.bank.step()
         
         # v0.5: Asuntomarkkina (hinnoittelu ja kaupankäynti)
-        self.housing_market_step()
+        with timer.phase("housing_market"):
+            self.housing_market_step()
         
         # Syntyvyys
-        self.process_births()
+        with timer.phase("births"):
+            self.process_births()
+
+        if self.debug_aggregates:
+            with timer.phase("debug_aggregates"):
+                self.aggregates.verify(self)
 
         # Kerätään data tämän kuukauden lopussa
-        self.datacollector.collect(self)
+        with timer.phase("data_collection"):
+            self.datacollector.collect(self)
+        timer.end_month(self.month)
+
+    def _compact_households(self) -> None:
+        """Siirrä kuluvan kuukauden kuolleet pois elävien iterointijoukosta."""
+        dead = self.households.compact()
+        if self.event_calendar is not None:
+            self.event_calendar.compact()
+        if dead:
+            self.household_population.compact_live_rows()
+            if self.bounded_memory:
+                # Ei arkistoa: rivit uudelleenkäyttöön ja agentit pois Mesan rekisteristä
+                self.household_population.release_rows(dead)
+                for hh in dead:
+                    hh.remove()
+            else:
+                self.household_archive.extend(dead)
 
     def _run_labor_market(self) -> None:
-        """v0.7: Orkestroi työmarkkinoiden irtisanomiset ja rekrytoinnit."""
-
-        from agents.firm import FirmAgent  # vain tyyppiviitteeksi
-
-        # 1) Päivitä kaikkien firmojen työvoimakysyntä ja palkkataso
-        for firm in self.firms:
-            if firm.alive:
-                firm._update_labor_demand()
-                firm._update_wage_level()
-        
-
-
-        # 2) Irtisanomiset ylityöllisistä firmoista
-        unemployed_pool: list["HouseholdAgent"] = []
-        for firm in self.firms:
-            if not firm.alive:
-                continue
-
-            if len(firm.employees) > firm.target_employees:
-                num_to_fire = len(firm.employees) - firm.target_employees
-                if num_to_fire <= 0:
-                    continue
-                fired = self.random.sample(firm.employees, num_to_fire)
-                for employee in fired:
-                    employee.lose_job()
-                    if employee in firm.employees:
-                        firm.employees.remove(employee)
-                    unemployed_pool.append(employee)
-
-        # 3) Kerää kaikki työttömät työnhakijat
-        for hh in self.households:
-            if hh.alive and not hh.employed and hh not in unemployed_pool:
-                unemployed_pool.append(hh)
-
-        self.random.shuffle(unemployed_pool)
-
-        # 4) Luo avoimet työpaikat firmojen target_employees-tavoitteiden perusteella
-        vacancies: list[tuple[FirmAgent, float]] = []
-        for firm in self.firms:
-            if not firm.alive:
-                continue
-            num_vacancies = firm.target_employees - len(firm.employees)
-            for _ in range(max(0, num_vacancies)):
-                vacancies.append((firm, firm.wage_level))
-
-        # Korkeapalkkaiset paikat täytetään ensin
-        vacancies.sort(key=lambda x: x[1], reverse=True)
-
-        # 5) Matching: työttömät täyttävät avoimia paikkoja
-        for job_seeker in unemployed_pool:
-            if not vacancies:
-                break
-            firm, wage = vacancies.pop(0)
-            job_seeker.employed = True
-            job_seeker.employer = firm
-            job_seeker.wage = wage
-            firm.employees.append(job_seeker)
-    
+        """v0.7: Orkestroi työmarkkinoiden irtisanomiset ja rekrytoinnit.
+
+        v0.8.3: Kierros ajetaan `markets.labor.LaborMarket`issa (palkkakeko).
+        """
+        self.labor_market.run()
+
     def housing_market_step(self) -> None:
         """v0.5: Asuntomarkkinan kuukausittainen päivitys.
         
@@ -703,10 +722,30 @@ class EconomyModel(Model):
     def run_for_months(self, n_months: int) -> None:
         for _ in range(n_months):
             self.step()
+            every = self.checkpoint_every_months
+            if every > 0 and self.month % every == 0:
+                self.save_checkpoint(checkpoint_path_for(self.checkpoint_path, self.month))
+        self.datacollector.collect_final(self)
+
+    def apply_config_overrides(self, overrides: dict[str, Any]) -> None:
+        """v0.8.3: Muuta konfiguraatioparametreja kesken ajon (ks. core.overrides)."""
+        apply_config_overrides(self, overrides)
+
+    # --- v0.8.3: Tallennuspisteet ---
+    def save_checkpoint(self, path: str | Path) -> Path:
+        """Tallenna koko mallin tila; `load_checkpoint` jatkaa ajoa bitilleen samana."""
+        return save_checkpoint(self, path)
+
+    @classmethod
+    def load_checkpoint(cls, path: str | Path) -> "EconomyModel":
+        model = load_checkpoint(path)
+        if not isinstance(model, cls):
+            raise ValueError(f"Checkpoint {path} does not contain a {cls.__name__}")
+        return model
 
     def get_results(self) -> dict[str, Any]:
         """Palauta yksinkertainen tulosdict v0.1-käyttöön."""
 
         model_df = self.datacollector.get_model_vars_dataframe()
         agent_df = self.datacollector.get_agent_vars_dataframe()
-        return {"model": model_df, "agents": agent_df}
+        return {"model": model_df, "agents": agent_df, "timings": self.phase_timer.dataframe()}
@@ -0,0 +1,135 @@
+"""v0.8.3: Konfiguraatiomuutokset käynnissä olevaan malliin.
+
+Malli lukee konfiguraation attribuuteiksi `__init__`issä, joten pelkkä
+`model._config`in muuttaminen kesken ajon ei vaikuta mihinkään. Tämä moduuli
+kertoo, mihin elävään attribuuttiin kukin konfiguraatiopolku vaikuttaa, ja
+päivittää sekä konfiguraation että attribuutin. Polut, jotka vaikuttavat vain
+mallin rakentamiseen (agenttimäärät, alkupalkka, ...), hylätään ValueErrorilla.
+
+Lainojen korot ovat kiinteitä: korkomuutos koskee vain uusia lainoja.
+"""
+
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import TYPE_CHECKING, Any, Callable
+
+from core.config import set_config_value
+
+if TYPE_CHECKING:  # pragma: no cover
+    from core.model import EconomyModel
+
+Setter = Callable[["EconomyModel", Any], None]
+
+
+def _model_attr(attr: str, cast: Callable[[Any], Any] = float) -> Setter:
+    def setter(model: EconomyModel, value: Any) -> None:
+        setattr(model, attr, cast(value))
+
+    return setter
+
+
+def _bank_attr(attr: str) -> Setter:
+    def setter(model: EconomyModel, value: Any) -> None:
+        setattr(model.bank, attr, float(value))
+        model.bank.deposit_rate_monthly = model.bank.deposit_rate_annual / 12.0
+
+    return setter
+
+
+def _firm_attr(attr: str, cast: Callable[[Any], Any]) -> Setter:
+    def setter(model: EconomyModel, value: Any) -> None:
+        # Rakennusliikkeet eivät tee tavallisia investointeja
+        for firm in model.firms:
+            if firm.firm_type == "manufacturer":
+                setattr(firm, attr, cast(value))
+
+    return setter
+
+
+def _reload_state(model: EconomyModel, value: Any) -> None:
+    # Valtio lukee vero- ja budjettiparametrinsa suoraan konfiguraatiosta
+    model.state._load_config()
+
+
+def _model_and_state(attr: str) -> Setter:
+    def setter(model: EconomyModel, value: Any) -> None:
+        setattr(model, attr, float(value))
+        model.state._load_config()
+
+    return setter
+
+
+LIVE_PARAMETERS: dict[str, Setter] = {
+    # Kotitaloudet ja demografia
+    "households.retirement_age": _model_attr("retirement_age", int),
+    "households.max_age": _model_attr("max_age", int),
+    "households.death_prob_per_year": _model_attr("death_prob_per_year"),
+    "households.birth_rate_per_year": _model_attr("birth_rate_per_year"),
+    "households.fertile_age_min": _model_attr("fertile_age_min", int),
+    "households.fertile_age_max": _model_attr("fertile_age_max", int),
+    "households.child_initial_cash": _model_attr("child_initial_cash"),
+    "households.cash_floor": _model_attr("household_cash_floor"),
+    "households.cash_target": _model_attr("household_cash_target"),
+    "households.debt_service_income_share": _model_attr("household_debt_service_income_share"),
+    "households.debt_service_buffer_multiplier": _model_attr(
+        "household_debt_service_buffer_multiplier"
+    ),
+    "housing.leaving_home_rate_per_month": _model_attr("leaving_home_rate_per_month"),
+    # Verot ja tulonsiirrot
+    "taxes.income_flat_rate": _model_attr("tax_rate"),
+    "taxes.vat_rate": _model_and_state("vat_rate"),
+    "taxes.income_brackets": _reload_state,
+    "taxes.corporate_tax_rate": _reload_state,
+    "taxes.capital_gains_rate": _reload_state,
+    "transfers.unemployment_benefit": _model_and_state("unemployment_benefit"),
+    "transfers.pension": _model_and_state("pension"),
+    "state.debt_interest_rate_annual": _reload_state,
+    "state.public_spending_share": _reload_state,
+    # Pankki
+    **{
+        f"banking.{name}": _bank_attr(name)
+        for name in (
+            "deposit_rate_annual",
+            "loan_rate_base_annual",
+            "household_spread",
+            "firm_spread",
+            "capital_ratio_min",
+            "liquidity_buffer_months",
+            "max_loan_to_income",
+            "max_debt_service_ratio",
+            "default_recovery_rate",
+        )
+    },
+    # Yritykset
+    "firms.investment_interval_months": _firm_attr("investment_interval_months", lambda v: max(0, int(v))),
+    "firms.investment_loan_amount": _firm_attr("investment_loan_amount", float),
+    "firms.investment_loan_term": _firm_attr("investment_loan_term", lambda v: max(1, int(v))),
+    "firms.investment_cash_buffer": _firm_attr("investment_cash_buffer", lambda v: max(0.0, float(v))),
+    # Yrittäjyys
+    "entrepreneurship.rate_per_month": _model_attr("entrepreneurship_rate_per_month"),
+    "entrepreneurship.firm_seed_capital": _model_attr("firm_seed_capital"),
+    "entrepreneurship.entrepreneur_cash_buffer": _model_attr("entrepreneur_cash_buffer"),
+    "entrepreneurship.startup_business_loan": _model_attr("startup_business_loan"),
+    # Ajon ohjaus
+    "simulation.debug_aggregates": _model_attr("debug_aggregates", bool),
+    "simulation.checkpoint_every_months": _model_attr("checkpoint_every_months", int),
+    "simulation.checkpoint_path": _model_attr("checkpoint_path", str),
+}
+
+
+def apply_config_overrides(model: EconomyModel, overrides: dict[str, Any]) -> None:
+    """Aseta pisteerotetut konfiguraatiopolut käynnissä olevaan malliin."""
+    unknown = [path for path in overrides if path not in LIVE_PARAMETERS]
+    if unknown:
+        raise ValueError(
+            f"Config path(s) cannot be changed mid-run: {unknown}. "
+            f"Supported: {sorted(LIVE_PARAMETERS)}"
+        )
+    # Ensin konfiguraatio, jotta konfiguraatiosta lukevat setterit näkevät uudet arvot.
+    # Kopio, ettei kutsujan (tai toisen haaran) konfiguraatio muutu.
+    model._config = deepcopy(model._config)
+    for path, value in overrides.items():
+        set_config_value(model._config, path, value)
+    for path, value in overrides.items():
+        LIVE_PARAMETERS[path](model, value)
@@ -0,0 +1,109 @@
+"""v0.8.3: Kuukausiaskeleen vaiheiden ajanotto.
+
+`PhaseTimer` mittaa `EconomyModel.step`in vaiheiden (työmarkkinat, yritykset,
+tulonsiirrot, kotitaloudet, pankki, asuntomarkkina, datankeruu, ...) kuluttaman
+seinäkelloajan kuukausittain. Valinnaisesti yritysten askel eritellään
+yritystyypeittäin.
+
+Pois päältä ollessaan `phase()` palauttaa jaetun tyhjän kontekstin, joten
+kustannus on yksi attribuuttihaku ja metodikutsu per vaihe.
+"""
+
+from __future__ import annotations
+
+from time import perf_counter
+from typing import Any
+
+import pandas as pd
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("timer", "name", "started")
+
+    def __init__(self, timer: PhaseTimer, name: str) -> None:
+        self.timer = timer
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self) -> None:
+        self.started = perf_counter()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.timer.add(self.name, perf_counter() - self.started)
+
+
+class PhaseTimer:
+    """Vaihekohtaiset ajat (sekunteina) kuukausittain."""
+
+    def __init__(self, enabled: bool = False, per_agent_type: bool = False) -> None:
+        self.enabled = enabled
+        self.per_agent_type = enabled and per_agent_type
+        self._phases: dict[str, _Phase] = {}
+        self._current: dict[str, float] = {}
+        self.rows: list[dict[str, float]] = []
+
+    def phase(self, name: str) -> _Phase | _NullPhase:
+        """Kontekstinhallitsija, joka lisää vaiheen keston kuluvaan kuukauteen."""
+        if not self.enabled:
+            return _NULL_PHASE
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(self, name)
+        return phase
+
+    def add(self, name: str, seconds: float) -> None:
+        self._current[name] = self._current.get(name, 0.0) + seconds
+
+    def end_month(self, month: int) -> None:
+        if not self.enabled:
+            return
+        row = {"month": month, **self._current}
+        row["total"] = sum(v for k, v in self._current.items() if "." not in k)
+        self.rows.append(row)
+        self._current = {}
+
+    # --- Tulokset ---
+    def dataframe(self) -> pd.DataFrame:
+        """Kuukausittainen aikataulukko (sarakkeina vaiheet, sekunteina)."""
+        df = pd.DataFrame.from_records(self.rows)
+        if df.empty:
+            return pd.DataFrame(columns=["month", "total"])
+        return df.fillna(0.0)
+
+    def summary(self) -> pd.DataFrame:
+        """Vaiheet kokonaisajan mukaan: yhteensä (s), ka/kk (ms) ja osuus (%)."""
+        df = self.dataframe()
+        phases = df.drop(columns=["month", "total"], errors="ignore")
+        if phases.empty:
+            return pd.DataFrame(columns=["total_s", "mean_ms", "share"])
+        total = df["total"].sum()
+        summary = pd.DataFrame(
+            {
+                "total_s": phases.sum(),
+                "mean_ms": phases.mean() * 1000.0,
+                "share": phases.sum() / total if total > 0 else 0.0,
+            }
+        )
+        return summary.sort_values("total_s", ascending=False)
+
+    def format_summary(self) -> str:
+        summary = self.summary()
+        lines = [f"{'vaihe':<28}{'yht. s':>10}{'ka ms/kk':>12}{'osuus':>9}"]
+        for name, row in summary.iterrows():
+            lines.append(
+                f"{name:<28}{row['total_s']:>10.3f}{row['mean_ms']:>12.2f}{row['share']:>9.1%}"
+            )
+        return "\n".join(lines)
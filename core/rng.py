@@ -0,0 +1,159 @@
+"""v0.8.3: Laskuripohjaiset, deterministiset satunnaisluvut (Philox4x32-10).
+
+Jokainen arvonta on puhdas funktio avaimista
+
+    (siemen, alijärjestelmä) -> Philox-avain
+    (agentin id, kuukausi, arvonnan indeksi) -> Philox-laskuri
+
+joten tulos ei riipu siitä, missä järjestyksessä agentit käsitellään tai
+montako arvontaa muut alijärjestelmät ovat tehneet. Sama arvonta voidaan
+laskea agentti kerrallaan (`random`) tai koko populaatiolle kerralla
+(`randoms`) bitilleen samana.
+
+Järjestyksestä riippumattomat sekoitus ja otanta (`shuffle`, `sample`)
+järjestävät alkiot niiden omien arvontojen mukaan, joten tulos riippuu vain
+alkioiden joukosta, ei niiden syöttöjärjestyksestä.
+
+Algoritmi: Salmon ym. (2011), "Parallel random numbers: as easy as 1, 2, 3".
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Callable, Sequence, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+_MASK32 = 0xFFFFFFFF
+_M0 = 0xD2511F53
+_M1 = 0xCD9E8D57
+_W0 = 0x9E3779B9
+_W1 = 0xBB67AE85
+ROUNDS = 10
+# 53 bitin liukuluku kahdesta 32 bitin sanasta (kuten genrand_res53)
+_TO_UNIT = 1.0 / 9007199254740992.0
+
+
+def philox4x32(counter: Sequence[int], key: Sequence[int], rounds: int = ROUNDS) -> tuple[int, int, int, int]:
+    """Philox4x32-lohkofunktio yhdelle laskurille (4 x 32 bittiä, avain 2 x 32 bittiä)."""
+    c0, c1, c2, c3 = (int(c) & _MASK32 for c in counter)
+    k0, k1 = int(key[0]) & _MASK32, int(key[1]) & _MASK32
+    for i in range(rounds):
+        if i:
+            k0 = (k0 + _W0) & _MASK32
+            k1 = (k1 + _W1) & _MASK32
+        p0 = _M0 * c0
+        p1 = _M1 * c2
+        c0, c1, c2, c3 = (p1 >> 32) ^ c1 ^ k0, p1 & _MASK32, (p0 >> 32) ^ c3 ^ k1, p0 & _MASK32
+    return c0, c1, c2, c3
+
+
+def philox4x32_array(
+    c0: np.ndarray,
+    c1: np.ndarray,
+    c2: np.ndarray,
+    c3: np.ndarray,
+    key: Sequence[int],
+    rounds: int = ROUNDS,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Vektoroitu `philox4x32`: laskurin sanat taulukkoina (uint64, arvot < 2**32)."""
+    mask = np.uint64(_MASK32)
+    m0, m1, shift = np.uint64(_M0), np.uint64(_M1), np.uint64(32)
+    k0, k1 = int(key[0]) & _MASK32, int(key[1]) & _MASK32
+    for i in range(rounds):
+        if i:
+            k0 = (k0 + _W0) & _MASK32
+            k1 = (k1 + _W1) & _MASK32
+        p0 = m0 * c0
+        p1 = m1 * c2
+        c0, c1, c2, c3 = (p1 >> shift) ^ c1 ^ np.uint64(k0), p1 & mask, (p0 >> shift) ^ c3 ^ np.uint64(k1), p0 & mask
+    return c0, c1, c2, c3
+
+
+def stream_key(seed: int, stream: str) -> tuple[int, int]:
+    """Philox-avain siemenestä ja alijärjestelmän nimestä."""
+    digest = hashlib.blake2b(f"{int(seed)}:{stream}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest[:4], "little"), int.from_bytes(digest[4:], "little")
+
+
+class RandomStream:
+    """Yhden alijärjestelmän arvonnat: arvo = f(agentin id, kuukausi, indeksi)."""
+
+    __slots__ = ("name", "key")
+
+    def __init__(self, seed: int, name: str) -> None:
+        self.name = name
+        self.key = stream_key(seed, name)
+
+    # --- Yksittäiset arvonnat ---
+    def random(self, agent_id: int, month: int, index: int = 0) -> float:
+        """Tasajakautunut [0, 1)."""
+        agent_id = int(agent_id)
+        x0, x1, _, _ = philox4x32((agent_id, month, index, agent_id >> 32), self.key)
+        return ((x0 >> 5) * 67108864 + (x1 >> 6)) * _TO_UNIT
+
+    def randint(self, agent_id: int, month: int, low: int, high: int, index: int = 0) -> int:
+        """Kokonaisluku väliltä [low, high] (kuten `random.randint`)."""
+        return low + int(self.random(agent_id, month, index) * (high - low + 1))
+
+    def choice(self, seq: Sequence[T], agent_id: int, month: int, index: int = 0) -> T:
+        if not seq:
+            raise IndexError("Cannot choose from an empty sequence")
+        return seq[int(self.random(agent_id, month, index) * len(seq))]
+
+    # --- Taulukot ---
+    def randoms(self, agent_ids: np.ndarray, month: int, index: int = 0) -> np.ndarray:
+        """`random` jokaiselle id:lle kerralla (bitilleen sama kuin yksitellen)."""
+        ids = np.asarray(agent_ids, dtype=np.int64).astype(np.uint64)
+        mask = np.uint64(_MASK32)
+        c0 = ids & mask
+        c1 = np.full(ids.shape, int(month) & _MASK32, dtype=np.uint64)
+        c2 = np.full(ids.shape, int(index) & _MASK32, dtype=np.uint64)
+        c3 = ids >> np.uint64(32)
+        x0, x1, _, _ = philox4x32_array(c0, c1, c2, c3, self.key)
+        hi = (x0 >> np.uint64(5)).astype(np.float64)
+        lo = (x1 >> np.uint64(6)).astype(np.float64)
+        return (hi * 67108864.0 + lo) * _TO_UNIT
+
+    def integers(self, agent_ids: np.ndarray, month: int, n: int, index: int = 0) -> np.ndarray:
+        """Kokonaisluvut väliltä [0, n) jokaiselle id:lle."""
+        return (self.randoms(agent_ids, month, index) * n).astype(np.int64)
+
+    # --- Järjestyksestä riippumattomat permutaatiot ---
+    def shuffle(self, items: list[T], month: int, key: Callable[[T], int], index: int = 0) -> None:
+        """Sekoita paikallaan: järjestys arvontojen (ja id:n) mukaan, ei syöttöjärjestyksen."""
+        ids = [int(key(item)) for item in items]
+        draws = self.randoms(np.array(ids, dtype=np.int64), month, index) if ids else []
+        order = sorted(range(len(items)), key=lambda i: (draws[i], ids[i]))
+        items[:] = [items[i] for i in order]
+
+    def sample(self, items: Sequence[T], k: int, month: int, key: Callable[[T], int], index: int = 0) -> list[T]:
+        """`k` alkion otos ilman takaisinpanoa (pienimmät arvonnat)."""
+        if not 0 <= k <= len(items):
+            raise ValueError("Sample larger than population or is negative")
+        ordered = list(items)
+        self.shuffle(ordered, month, key, index)
+        return ordered[:k]
+
+
+class CounterRNG:
+    """Mallin laskuripohjaiset satunnaisvirrat alijärjestelmittäin (`model.counter_rng`)."""
+
+    def __init__(self, seed: int) -> None:
+        self.seed = int(seed)
+        self._streams: dict[str, RandomStream] = {}
+
+    def stream(self, name: str) -> RandomStream:
+        stream = self._streams.get(name)
+        if stream is None:
+            stream = self._streams[name] = RandomStream(self.seed, name)
+        return stream
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Virrat johdetaan siemenestä, joten tallennetaan vain se
+        return {"seed": self.seed}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(state["seed"])
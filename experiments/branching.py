@@ -0,0 +1,185 @@
+"""v0.8.3: Skenaarioiden haarautus yhteisestä lämmittelyjaksosta.
+
+Perusmalli ajetaan kerran kuukauteen T asti, minkä jälkeen siitä haarautetaan
+K kopiota, joihin kuhunkin sovelletaan omat konfiguraatiomuutoksensa
+(`core.overrides`). Haarat ajetaan horisonttiin rinnakkain:
+
+- "fork": POSIX `os.fork` (multiprocessing fork-konteksti) -- lapsiprosessi
+  perii perusmallin muistin copy-on-write-periaatteella, mitään ei sarjallisteta,
+- "clone": perusmalli sarjallistetaan kerran (pickle) ja jokainen haara
+  puretaan siitä omaksi kopiokseen; toimii kaikilla alustoilla.
+
+Kaikki haarat jatkavat samasta satunnaistilasta (yhteiset satunnaisluvut),
+joten haarojen erot johtuvat politiikasta eivätkä arvonnasta. Yhteinen
+alkujakso tallennetaan tuloksiin vain kerran.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import pickle
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.connection import wait
+from typing import Any
+
+import pandas as pd
+
+from core.model import EconomyModel
+
+METHODS = ("auto", "fork", "clone")
+
+
+@dataclass
+class BranchingResult:
+    """Yhteinen alkujakso ja haarojen jatkot (vain kuukaudet > T)."""
+
+    burn_in_months: int
+    prefix: pd.DataFrame
+    branches: dict[str, pd.DataFrame]
+
+    def side_by_side(self, metric: str, include_prefix: bool = True) -> pd.DataFrame:
+        """Yksi mittari haaroittain sarakkeina, indeksinä kuukausi."""
+        columns = {}
+        for name, df in self.branches.items():
+            series = df.set_index("month")[metric]
+            if include_prefix:
+                series = pd.concat([self.prefix.set_index("month")[metric], series])
+            columns[name] = series
+        return pd.DataFrame(columns)
+
+    def combined(self) -> pd.DataFrame:
+        """Pitkä muoto: haarojen rivit `branch`-sarakkeella (alkujakso nimellä "prefix")."""
+        frames = [self.prefix.assign(branch="prefix")]
+        frames += [df.assign(branch=name) for name, df in self.branches.items()]
+        return pd.concat(frames, ignore_index=True)
+
+
+def _continue_branch(
+    model: EconomyModel,
+    random_state: Any,
+    overrides: dict[str, Any],
+    n_months: int,
+) -> pd.DataFrame:
+    """Aja haarautettu kopio horisonttiin ja palauta sen omat rivit."""
+    random.setstate(random_state)
+    # Alkujakso on jo perusmallin tuloksissa; haara ei kirjoita perusmallin suoratoistoon
+    model.datacollector.reset()
+    model.apply_config_overrides(overrides)
+    model.run_for_months(n_months)
+    return model.get_results()["model"]
+
+
+def _run_clone(
+    blob: bytes,
+    overrides: dict[str, Any],
+    n_months: int,
+) -> pd.DataFrame:
+    model, random_state = pickle.loads(blob)
+    return _continue_branch(model, random_state, overrides, n_months)
+
+
+def _fork_child(
+    conn: Any,
+    model: EconomyModel,
+    random_state: Any,
+    overrides: dict[str, Any],
+    n_months: int,
+) -> None:
+    try:
+        conn.send(("ok", _continue_branch(model, random_state, overrides, n_months)))
+    except BaseException as exc:  # välitetään emoprosessille
+        conn.send(("error", repr(exc)))
+    finally:
+        conn.close()
+
+
+def _run_forked(
+    model: EconomyModel,
+    random_state: Any,
+    branches: dict[str, dict[str, Any]],
+    n_months: int,
+    workers: int,
+) -> dict[str, pd.DataFrame]:
+    ctx = mp.get_context("fork")
+    pending = list(branches)
+    running: dict[Any, tuple[str, Any]] = {}
+    results: dict[str, pd.DataFrame] = {}
+    while pending or running:
+        while pending and len(running) < workers:
+            name = pending.pop(0)
+            recv, send = ctx.Pipe(duplex=False)
+            proc = ctx.Process(
+                target=_fork_child,
+                args=(send, model, random_state, branches[name], n_months),
+                name=f"branch-{name}",
+            )
+            proc.start()
+            send.close()
+            running[recv] = (name, proc)
+        for conn in wait(list(running)):
+            name, proc = running.pop(conn)
+            try:
+                status, payload = conn.recv()
+            except EOFError:
+                status, payload = "error", f"process exited with code {proc.exitcode}"
+            conn.close()
+            proc.join()
+            if status != "ok":
+                raise RuntimeError(f"Branch {name!r} failed: {payload}")
+            results[name] = payload
+    return results
+
+
+def run_branches(
+    config: dict[str, Any],
+    branches: dict[str, dict[str, Any]],
+    burn_in_months: int,
+    horizon_months: int,
+    seed: int | None = None,
+    workers: int | None = None,
+    method: str = "auto",
+) -> BranchingResult:
+    """Aja yhteinen alkujakso kerran ja haarat rinnakkain horisonttiin.
+
+    `branches`: haaran nimi -> {konfiguraatiopolku: arvo}. Tyhjä muutosjoukko
+    on vertailuhaara. `horizon_months` on koko ajon pituus (sis. alkujakson).
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown branching method {method!r}; expected one of {METHODS}")
+    if not branches:
+        raise ValueError("At least one branch is required")
+    if horizon_months < burn_in_months:
+        raise ValueError("horizon_months must be >= burn_in_months")
+    if method == "auto":
+        method = "fork" if "fork" in mp.get_all_start_methods() else "clone"
+    elif method == "fork" and "fork" not in mp.get_all_start_methods():
+        raise RuntimeError("os.fork is not available on this platform; use method='clone'")
+
+    if seed is not None:
+        random.seed(seed)
+    base = EconomyModel(config=config, seed=seed)
+    base.run_for_months(burn_in_months)
+    prefix = base.get_results()["model"]
+    random_state = random.getstate()
+
+    n_months = horizon_months - burn_in_months
+    workers = max(1, min(len(branches), workers or mp.cpu_count()))
+
+    if method == "fork":
+        results = _run_forked(base, random_state, branches, n_months, workers)
+    else:
+        blob = pickle.dumps((base, random_state), protocol=pickle.HIGHEST_PROTOCOL)
+        if workers == 1:
+            results = {name: _run_clone(blob, overrides, n_months) for name, overrides in branches.items()}
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    name: pool.submit(_run_clone, blob, overrides, n_months)
+                    for name, overrides in branches.items()
+                }
+                results = {name: future.result() for name, future in futures.items()}
+
+    ordered = {name: results[name] for name in branches}
+    return BranchingResult(burn_in_months=burn_in_months, prefix=prefix, branches=ordered)
@@ -0,0 +1,321 @@
+"""v0.8.3: Lainakannan luottotappioiden Monte Carlo (yhden tekijän malli).
+
+Simulaatiossa pankki näkee tappiot vasta, kun laina epäsuoriutuu. Tämä moduuli
+ottaa lainakannasta tilannekuvan mielivaltaisena kuukautena ja laskee
+ennakoivan tappiojakauman:
+
+- PD: kotitalouksille velanhoitosuhteen (lainanottajan kuukausierät / tulot)
+  luokista, työttömille ja tulottomille vähintään oma PD:nsä, yrityksille
+  kiinteä PD.
+  Vuositason PD skaalataan horisonttiin.
+- LGD: asuntolainoilla vakuutena asunnon markkina-arvo aliarvostuksen
+  jälkeen (jaettuna lainanottajan asuntolainoille saldojen suhteessa),
+  muilla 1 - pankin `default_recovery_rate`.
+- Korreloidut maksukyvyttömyydet: laina i epäsuoriutuu, kun
+  sqrt(rho) Z + sqrt(1 - rho) e_i < Phi^-1(PD_i), Z yhteinen tekijä.
+
+Menetelmät:
+
+- "buckets": lainat ryhmitellään PD-luokkiin. Ehdollisena tekijälle Z
+  luokan tappion odotusarvo ja varianssi saadaan luokan painojen summista,
+  ja luokan tappio arvotaan normaalijakaumasta (rajattuna välille
+  [0, luokan kokonaispaino]). Kustannus on O(L) tilannekuvaan ja
+  O(skenaariot x luokat) simulointiin, joten miljoonan lainan kanta vie sekunteja.
+- "loans": jokainen laina arvotaan erikseen skenaariopaloina (tarkka, O(S x L)).
+- "auto" (oletus): "loans", kun skenaariot x lainat mahtuu yhteen palaan,
+  muuten "buckets" (normaaliapproksimaatio on tarkka vasta rakeisella kannalla).
+
+Tulos raportoi odotetun tappion, VaR:n ja ES:n sekä pankin pääomasuhteen
+jakauman tappioiden jälkeen suhteessa `capital_ratio_min`-rajaan.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Any
+
+import numpy as np
+from scipy.special import ndtr, ndtri
+
+METHODS = ("auto", "buckets", "loans")
+
+
+@dataclass
+class CreditRiskParams:
+    """Tappiosimulaation parametrit (konfiguraation `credit_risk`-osio)."""
+
+    scenarios: int = 20_000
+    horizon_months: int = 12
+    asset_correlation: float = 0.15
+    confidence: float = 0.99
+    dsr_edges: tuple[float, ...] = (0.2, 0.35, 0.5)
+    household_pd: tuple[float, ...] = (0.005, 0.01, 0.03, 0.08)
+    unemployed_pd: float = 0.15
+    firm_pd: float = 0.04
+    collateral_haircut: float = 0.3
+    method: str = "auto"
+    seed: int = 0
+    chunk_size: int = 5_000_000  # "loans": skenaariot x lainat per pala
+
+    def __post_init__(self) -> None:
+        self.dsr_edges = tuple(float(x) for x in self.dsr_edges)
+        self.household_pd = tuple(float(x) for x in self.household_pd)
+        if len(self.household_pd) != len(self.dsr_edges) + 1:
+            raise ValueError("household_pd needs one value per DSR bucket (len(dsr_edges) + 1)")
+        if not 0.0 <= self.asset_correlation < 1.0:
+            raise ValueError("asset_correlation must be in [0, 1)")
+        if not 0.0 < self.confidence < 1.0:
+            raise ValueError("confidence must be in (0, 1)")
+        if self.method not in METHODS:
+            raise ValueError(f"Unknown credit risk method: {self.method!r} (expected one of {METHODS})")
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any] | None) -> CreditRiskParams:
+        """Lue parametrit konfiguraatiosta; puuttuvat kentät oletusarvoilla."""
+        section = dict((config or {}).get("credit_risk") or {})
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in section.items() if key in known})
+
+
+@dataclass
+class LoanBookSnapshot:
+    """Aktiivisten lainojen tilannekuva ja pankin taseen luvut."""
+
+    month: int
+    exposure: np.ndarray  # saldo (EAD)
+    debt_service_ratio: np.ndarray  # lainanottajan kuukausierät / tulot (inf, jos ei tuloja)
+    employed: np.ndarray  # kotitalouslainanottaja työssä
+    collateral: np.ndarray  # lainalle kohdistettu asunnon markkina-arvo (0, jos ei vakuutta)
+    is_firm: np.ndarray
+    is_mortgage: np.ndarray
+    recovery_rate: float
+    equity: float
+    total_loans: float
+    capital_ratio_min: float
+
+    @classmethod
+    def from_model(cls, model: Any) -> LoanBookSnapshot:
+        """Ota tilannekuva mallin pankin lainakannasta (ei muuta mallia)."""
+        bank = model.bank
+        book = bank.loans
+        rows = book.active_rows()
+        rows = rows[book.balance[rows] > 0]
+        borrower_ids = book.borrower_id[rows]
+        is_firm = book.borrower_type[rows] == book.vocabulary("borrower_type").code("firm")
+        is_mortgage = book.purpose[rows] == book.vocabulary("purpose").code("mortgage")
+
+        incomes, employed, dwelling_values = _borrower_attributes(model, bank, rows)
+        scheduled = book.scheduled_payments(borrower_ids)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dsr = np.where(incomes > 0, scheduled / incomes, np.inf)
+
+        # Asunnon arvo jaetaan lainanottajan asuntolainoille saldojen suhteessa
+        exposure = book.balance[rows].astype(np.float64)
+        _, owner = np.unique(borrower_ids, return_inverse=True)
+        mortgage_total = np.bincount(owner, weights=np.where(is_mortgage, exposure, 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            share = np.where(is_mortgage, exposure / mortgage_total[owner], 0.0)
+        collateral = np.nan_to_num(share * dwelling_values)
+
+        return cls(
+            month=int(getattr(model, "month", 0)),
+            exposure=exposure,
+            debt_service_ratio=dsr,
+            employed=employed,
+            collateral=collateral,
+            is_firm=is_firm,
+            is_mortgage=is_mortgage,
+            recovery_rate=float(bank.default_recovery_rate),
+            equity=float(bank.equity),
+            total_loans=float(bank.total_loans),
+            capital_ratio_min=float(bank.capital_ratio_min),
+        )
+
+    def __len__(self) -> int:
+        return int(self.exposure.size)
+
+
+def _borrower_attributes(model: Any, bank: Any, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Lainanottajien kuukausitulot, työllisyys ja asuntojen arvot (populaation sarakkeista, muuten olioista)."""
+    book = bank.loans
+    incomes = np.zeros(rows.size, dtype=np.float64)
+    employed = np.zeros(rows.size, dtype=bool)
+    dwellings = np.zeros(rows.size, dtype=np.float64)
+    population_rows = bank._valid_population_rows(rows)
+    columnar = population_rows >= 0
+    population = getattr(model, "household_population", None)
+    if population is not None and columnar.any():
+        pop_rows = population_rows[columnar]
+        benefit = float(getattr(model, "unemployment_benefit", 0.0))
+        employed[columnar] = population.employed[pop_rows]
+        incomes[columnar] = np.where(employed[columnar], population.wage[pop_rows], benefit)
+        housing = getattr(model, "housing_market", None)
+        if housing is not None and housing.dwellings:
+            ids = np.array([d.id for d in housing.dwellings], dtype=np.int64)
+            value_by_id = np.zeros(int(ids.max()) + 2, dtype=np.float64)
+            value_by_id[ids] = [d.market_value for d in housing.dwellings]
+            dwelling_ids = population.dwelling_id[pop_rows]
+            dwellings[columnar] = np.where(dwelling_ids >= 0, value_by_id[dwelling_ids], 0.0)
+    household_code = book.vocabulary("borrower_type").code("household")
+    for i in np.flatnonzero(~columnar & (book.borrower_type[rows] == household_code)).tolist():
+        borrower = book.borrowers[rows[i]]
+        incomes[i] = getattr(borrower, "expected_monthly_income", lambda: 0.0)()
+        employed[i] = bool(getattr(borrower, "employed", False))
+        dwelling = getattr(borrower, "dwelling", None)
+        dwellings[i] = dwelling.market_value if dwelling is not None else 0.0
+    return incomes, employed, dwellings
+
+
+def probabilities_of_default(snapshot: LoanBookSnapshot, params: CreditRiskParams) -> np.ndarray:
+    """Lainakohtaiset PD:t horisontille PD-luokista."""
+    annual = np.asarray(params.household_pd)[np.searchsorted(params.dsr_edges, snapshot.debt_service_ratio)]
+    no_income = ~snapshot.employed | np.isinf(snapshot.debt_service_ratio)
+    annual = np.where(no_income, np.maximum(annual, params.unemployed_pd), annual)
+    annual = np.where(snapshot.is_firm, params.firm_pd, annual)
+    return 1.0 - (1.0 - annual) ** (params.horizon_months / 12.0)
+
+
+def losses_given_default(snapshot: LoanBookSnapshot, params: CreditRiskParams) -> np.ndarray:
+    """Lainakohtaiset LGD:t: asuntolainoilla vakuus, muilla pankin palautusaste."""
+    unsecured = 1.0 - snapshot.recovery_rate
+    recovered = (1.0 - params.collateral_haircut) * snapshot.collateral
+    with np.errstate(divide="ignore", invalid="ignore"):
+        secured = np.clip(1.0 - recovered / snapshot.exposure, 0.0, 1.0)
+    return np.where(snapshot.is_mortgage, secured, unsecured)
+
+
+@dataclass
+class CreditLossResult:
+    """Skenaariokohtaiset tappiot ja pääomasuhteet sekä niiden tunnusluvut."""
+
+    month: int
+    confidence: float
+    capital_ratio_min: float
+    losses: np.ndarray
+    defaulted_exposure: np.ndarray
+    capital_ratios: np.ndarray
+    analytic_expected_loss: float
+
+    @property
+    def expected_loss(self) -> float:
+        return float(self.losses.mean())
+
+    @property
+    def value_at_risk(self) -> float:
+        return float(np.quantile(self.losses, self.confidence))
+
+    @property
+    def expected_shortfall(self) -> float:
+        tail = self.losses[self.losses >= self.value_at_risk]
+        return float(tail.mean()) if tail.size else self.value_at_risk
+
+    @property
+    def prob_below_capital_min(self) -> float:
+        return float(np.mean(self.capital_ratios < self.capital_ratio_min))
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "month": self.month,
+            "scenarios": int(self.losses.size),
+            "expected_loss": self.expected_loss,
+            "analytic_expected_loss": self.analytic_expected_loss,
+            "var": self.value_at_risk,
+            "es": self.expected_shortfall,
+            "capital_ratio_median": float(np.median(self.capital_ratios)),
+            "capital_ratio_tail": float(np.quantile(self.capital_ratios, 1.0 - self.confidence)),
+            "capital_ratio_min": self.capital_ratio_min,
+            "prob_below_capital_min": self.prob_below_capital_min,
+        }
+
+
+def simulate_credit_losses(snapshot: LoanBookSnapshot, params: CreditRiskParams) -> CreditLossResult:
+    """Simuloi korreloidut maksukyvyttömyydet ja palauta tappiojakauma."""
+    rng = np.random.default_rng(params.seed)
+    pd_ = probabilities_of_default(snapshot, params)
+    loss_weight = snapshot.exposure * losses_given_default(snapshot, params)
+    factor = rng.standard_normal(params.scenarios)
+
+    if len(snapshot) == 0:
+        losses = np.zeros(params.scenarios)
+        defaulted = np.zeros(params.scenarios)
+    elif params.method == "buckets" or (
+        params.method == "auto" and len(snapshot) * params.scenarios > params.chunk_size
+    ):
+        losses, defaulted = _simulate_buckets(pd_, loss_weight, snapshot.exposure, factor, params, rng)
+    else:
+        losses, defaulted = _simulate_loans(pd_, loss_weight, snapshot.exposure, factor, params, rng)
+
+    # Pääomasuhde kuten `BankAgent.capital_ratio`: tappio syö omaa pääomaa, epäsuoriutuneet pois kannasta
+    remaining_loans = snapshot.total_loans - defaulted
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = np.where(remaining_loans > 0, np.maximum(0.0, (snapshot.equity - losses) / remaining_loans), 1.0)
+    return CreditLossResult(
+        month=snapshot.month,
+        confidence=params.confidence,
+        capital_ratio_min=snapshot.capital_ratio_min,
+        losses=losses,
+        defaulted_exposure=defaulted,
+        capital_ratios=ratios,
+        analytic_expected_loss=float(np.dot(pd_, loss_weight)),
+    )
+
+
+def _conditional_pd(pd_: np.ndarray, factor: np.ndarray, rho: float) -> np.ndarray:
+    """PD ehdollisena yhteiselle tekijälle: muoto (skenaariot, len(pd_))."""
+    threshold = ndtri(np.clip(pd_, 1e-12, 1.0 - 1e-12))
+    return ndtr((threshold[None, :] - np.sqrt(rho) * factor[:, None]) / np.sqrt(1.0 - rho))
+
+
+def _simulate_buckets(
+    pd_: np.ndarray,
+    loss_weight: np.ndarray,
+    exposure: np.ndarray,
+    factor: np.ndarray,
+    params: CreditRiskParams,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, np.ndarray]:
+    """PD-luokittainen simulointi: luokan tappio normaaliapproksimaatiolla ehdollisena Z:lle."""
+    bucket_pd, bucket = np.unique(pd_, return_inverse=True)
+    n_buckets = bucket_pd.size
+    w1 = np.bincount(bucket, weights=loss_weight, minlength=n_buckets)
+    w2 = np.bincount(bucket, weights=loss_weight**2, minlength=n_buckets)
+    e1 = np.bincount(bucket, weights=exposure, minlength=n_buckets)
+    e2 = np.bincount(bucket, weights=exposure**2, minlength=n_buckets)
+
+    p = _conditional_pd(bucket_pd, factor, params.asset_correlation)
+    spread = np.sqrt(p * (1.0 - p))
+    # Sama idiosynkraattinen arvonta tappiolle ja epäsuoriutuneelle saldolle (samat lainat)
+    noise = rng.standard_normal(p.shape)
+    losses = np.clip(w1 * p + np.sqrt(w2) * spread * noise, 0.0, w1).sum(axis=1)
+    defaulted = np.clip(e1 * p + np.sqrt(e2) * spread * noise, 0.0, e1).sum(axis=1)
+    return losses, defaulted
+
+
+def _simulate_loans(
+    pd_: np.ndarray,
+    loss_weight: np.ndarray,
+    exposure: np.ndarray,
+    factor: np.ndarray,
+    params: CreditRiskParams,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Lainakohtainen simulointi skenaariopaloina."""
+    rho = params.asset_correlation
+    threshold = ndtri(np.clip(pd_, 1e-12, 1.0 - 1e-12))
+    losses = np.empty(factor.size)
+    defaulted = np.empty(factor.size)
+    step = max(1, params.chunk_size // max(1, pd_.size))
+    for start in range(0, factor.size, step):
+        z = factor[start : start + step, None]
+        assets = np.sqrt(rho) * z + np.sqrt(1.0 - rho) * rng.standard_normal((z.shape[0], pd_.size))
+        defaults = assets < threshold
+        losses[start : start + step] = defaults @ loss_weight
+        defaulted[start : start + step] = defaults @ exposure
+    return losses, defaulted
+
+
+def run_credit_risk(model: Any, params: CreditRiskParams | None = None) -> CreditLossResult:
+    """Tilannekuva mallin nykyisestä lainakannasta ja tappiosimulaatio."""
+    if params is None:
+        params = CreditRiskParams.from_config(getattr(model, "_config", None))
+    return simulate_credit_losses(LoanBookSnapshot.from_model(model), params)
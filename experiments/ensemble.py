@@ -0,0 +1,159 @@
+"""v0.8.3: Monte Carlo -ensemble saman konfiguraation yli.
+
+Ajaa N replikaattia eri siemenillä prosessipoolissa ja kokoaa tulokset:
+
+- kuukausittaiset keskiarvot, keskihajonnat ja kvanttiilivyöt,
+- lopputilan jakauma (yksi rivi per replikaatti).
+
+Siemenet johdetaan juurisiemenestä `numpy.random.SeedSequence`-haarautuksella,
+ja tulokset järjestetään replikaatin indeksin mukaan, joten lopputulos ei
+riipu työprosessien määrästä eikä valmistumisjärjestyksestä.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from copy import deepcopy
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from core.model import EconomyModel
+
+DEFAULT_QUANTILES: tuple[float, ...] = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+ProgressCallback = Callable[[int, int, int], None]
+
+
+def derive_seeds(root_seed: int, n_runs: int) -> list[int]:
+    """Johda `n_runs` riippumatonta siementä juurisiemenestä (toistettava)."""
+    children = np.random.SeedSequence(root_seed).spawn(n_runs)
+    return [int(child.generate_state(1, dtype=np.uint64)[0]) for child in children]
+
+
+def run_replicate(config: dict[str, Any], seed: int, n_months: int) -> pd.DataFrame:
+    """Aja yksi replikaatti ja palauta mallitason aikasarja.
+
+    Myös globaali `random` siemennetään, koska osa agenttien päätöksistä
+    käyttää sitä mallin oman generaattorin sijaan.
+    """
+    cfg = deepcopy(config)
+    # Ensemble tarvitsee vain mallitason sarjat; agenttidata vain kasvattaisi siirtoja
+    output_cfg = dict(cfg.get("output") or {})
+    output_cfg["agent_reporters"] = {"enabled": False}
+    output_cfg.pop("sink", None)
+    cfg["output"] = output_cfg
+
+    random.seed(seed)
+    model = EconomyModel(config=cfg, seed=seed)
+    model.run_for_months(n_months)
+    return model.get_results()["model"]
+
+
+def _run_indexed(config: dict[str, Any], index: int, seed: int, n_months: int) -> tuple[int, pd.DataFrame]:
+    return index, run_replicate(config, seed, n_months)
+
+
+@dataclass
+class EnsembleResult:
+    """Ensemblen replikaatit ja niistä johdetut yhteenvedot."""
+
+    seeds: list[int]
+    runs: list[pd.DataFrame]
+    quantiles: tuple[float, ...] = DEFAULT_QUANTILES
+    bands: pd.DataFrame = field(init=False)
+    final: pd.DataFrame = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.bands = aggregate_bands(self.runs, self.quantiles)
+        self.final = final_distribution(self.runs, self.seeds)
+
+    def mean(self) -> pd.DataFrame:
+        """Kuukausittaiset keskiarvot (sarakkeina mittarit)."""
+        return self.bands.xs("mean", axis=1, level="stat")
+
+
+def _numeric(df: pd.DataFrame) -> pd.DataFrame:
+    return df.select_dtypes(include="number")
+
+
+def quantile_label(q: float) -> str:
+    """Kvanttiilin sarakenimi prosentteina: 0.05 -> "q05", 0.025 -> "q02.5", 0.005 -> "q00.5"."""
+    whole, _, fraction = f"{q * 100:.6f}".rstrip("0").partition(".")
+    return f"q{int(whole):02d}" + (f".{fraction}" if fraction else "")
+
+
+def aggregate_bands(
+    runs: list[pd.DataFrame],
+    quantiles: tuple[float, ...] = DEFAULT_QUANTILES,
+) -> pd.DataFrame:
+    """Kokoa replikaatit kuukausittain: sarakkeet (mittari, tunnusluku)."""
+    stacked = pd.concat([_numeric(df) for df in runs], ignore_index=True)
+    grouped = stacked.groupby("month")
+
+    parts = {"mean": grouped.mean(), "std": grouped.std(ddof=1)}
+    for q in quantiles:
+        label = quantile_label(q)
+        if label in parts:
+            raise ValueError(f"Quantiles map to the same column label {label!r}: {quantiles}")
+        parts[label] = grouped.quantile(q)
+
+    bands = pd.concat(parts, axis=1, names=["stat", "metric"]).swaplevel(axis=1)
+    # Mittarit raportoijajärjestyksessä, tunnusluvut niiden alla
+    columns = [(metric, stat) for metric in parts["mean"].columns for stat in parts]
+    return bands[columns]
+
+
+def final_distribution(runs: list[pd.DataFrame], seeds: list[int]) -> pd.DataFrame:
+    """Lopputilan jakauma: kunkin replikaatin viimeinen rivi."""
+    final = pd.concat([df.iloc[[-1]] for df in runs], ignore_index=True)
+    final.insert(0, "seed", seeds)
+    final.index.name = "replicate"
+    return final
+
+
+def run_ensemble(
+    config: dict[str, Any],
+    n_runs: int,
+    root_seed: int = 0,
+    n_months: int | None = None,
+    workers: int | None = None,
+    quantiles: tuple[float, ...] = DEFAULT_QUANTILES,
+    progress: ProgressCallback | None = None,
+) -> EnsembleResult:
+    """Aja `n_runs` replikaattia prosessipoolissa ja kokoa tulokset.
+
+    `workers=None` käyttää kaikkia ytimiä; `workers=1` ajaa samassa prosessissa.
+    `progress(valmiit, yhteensä, siemen)` kutsutaan jokaisen replikaatin jälkeen.
+    """
+    if n_runs < 1:
+        raise ValueError("n_runs must be >= 1")
+    if n_months is None:
+        n_months = int(config.get("simulation", {}).get("months", 120))
+    workers = min(n_runs, workers or os.cpu_count() or 1)
+
+    seeds = derive_seeds(root_seed, n_runs)
+    runs: list[pd.DataFrame | None] = [None] * n_runs
+
+    if workers == 1:
+        for index, seed in enumerate(seeds):
+            runs[index] = run_replicate(config, seed, n_months)
+            if progress is not None:
+                progress(index + 1, n_runs, seed)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_run_indexed, config, index, seed, n_months)
+                for index, seed in enumerate(seeds)
+            ]
+            for done, future in enumerate(as_completed(futures), start=1):
+                index, df = future.result()
+                runs[index] = df
+                if progress is not None:
+                    progress(done, n_runs, seeds[index])
+
+    return EnsembleResult(seeds=seeds, runs=runs, quantiles=tuple(quantiles))
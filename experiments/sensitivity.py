@@ -0,0 +1,406 @@
+"""v0.8.3: Globaali herkkyysanalyysi (Sobol / Morris) YAML-parametrien yli.
+
+Tutkimus määritellään joukkona konfiguraatiopolkuja vaihteluväleineen
+(esim. `banking.max_debt_service_ratio: [0.25, 0.45]`) ja tarkasteltavina
+lopputilan mittareina. Moduuli
+
+1. muodostaa otosasetelman (Saltelli-asetelma Sobol-indekseille tai
+   Morrisin trajektorit),
+2. ajaa pisteet prosessipoolissa paloina (chunk) ja kirjaa jokaisen valmiin
+   palan heti levylle (`evaluations.jsonl`),
+3. laskee 1. kertaluvun ja kokonaisvaikutuksen Sobol-indeksit (Saltelli 2010 /
+   Jansen) tai Morrisin mu*/sigma-tunnusluvut.
+
+Jo lasketut pisteet tunnistetaan sisältöavaimella (parametriarvot, siemenet,
+kuukaudet, pohjakonfiguraatio), joten keskeytetty tutkimus jatkuu siitä mihin
+jäi ja toistuvia pisteitä ei ajeta uudelleen.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from copy import deepcopy
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+from scipy.stats import qmc
+
+from core.config import set_config_value
+from core.model import EconomyModel
+from experiments.ensemble import derive_seeds
+
+METHODS = ("sobol", "morris")
+
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass(frozen=True)
+class ParameterRange:
+    """Yksi vaihdeltava konfiguraatioparametri."""
+
+    path: str
+    low: float
+    high: float
+    integer: bool = False
+
+    def __post_init__(self) -> None:
+        if not self.high > self.low:
+            raise ValueError(f"Parameter {self.path!r}: high must be greater than low")
+
+    def scale(self, unit: np.ndarray) -> np.ndarray:
+        values = self.low + unit * (self.high - self.low)
+        return np.round(values) if self.integer else values
+
+
+@dataclass
+class SensitivityStudy:
+    """Herkkyysanalyysin määrittely (tallennetaan tutkimushakemistoon)."""
+
+    parameters: list[ParameterRange]
+    metrics: list[str]
+    method: str = "sobol"
+    base_samples: int = 64  # Sobol: N (pisteitä N*(k+2)); Morris: trajektorien määrä
+    levels: int = 4  # Morris: ruudukon tasojen määrä
+    n_months: int = 60
+    replicates: int = 1  # siemeniä per piste (mittari keskiarvoistetaan)
+    seed: int = 0
+    chunk_size: int = 16
+    bootstrap: int = 100  # Sobol-luottamusvälien bootstrap-otokset (0 = ei)
+
+    def __post_init__(self) -> None:
+        if self.method not in METHODS:
+            raise ValueError(f"Unknown sensitivity method {self.method!r}; expected one of {METHODS}")
+        if not self.parameters:
+            raise ValueError("Sensitivity study needs at least one parameter")
+        if not self.metrics:
+            raise ValueError("Sensitivity study needs at least one output metric")
+        if self.base_samples < 2:
+            raise ValueError("base_samples must be >= 2")
+        if self.method == "morris" and self.levels < 2:
+            raise ValueError("Morris design needs levels >= 2")
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> "SensitivityStudy":
+        """Lue tutkimus konfiguraation `sensitivity`-osiosta."""
+        sens_cfg = config.get("sensitivity", {}) or {}
+        parameters = []
+        for path, spec in (sens_cfg.get("parameters", {}) or {}).items():
+            if isinstance(spec, dict):
+                parameters.append(
+                    ParameterRange(path, float(spec["low"]), float(spec["high"]), bool(spec.get("integer", False)))
+                )
+            else:
+                low, high = spec
+                parameters.append(ParameterRange(path, float(low), float(high)))
+        return cls(
+            parameters=parameters,
+            metrics=list(sens_cfg.get("metrics", [])),
+            method=sens_cfg.get("method", "sobol"),
+            base_samples=int(sens_cfg.get("base_samples", 64)),
+            levels=int(sens_cfg.get("levels", 4)),
+            n_months=int(sens_cfg.get("months", config.get("simulation", {}).get("months", 60))),
+            replicates=int(sens_cfg.get("replicates", 1)),
+            seed=int(sens_cfg.get("seed", 0)),
+            chunk_size=int(sens_cfg.get("chunk_size", 16)),
+            bootstrap=int(sens_cfg.get("bootstrap", 100)),
+        )
+
+    @property
+    def num_parameters(self) -> int:
+        return len(self.parameters)
+
+    # --- Otosasetelma ---
+    def unit_design(self) -> np.ndarray:
+        """Otosasetelma yksikkökuutiossa, muoto (pisteet, parametrit)."""
+        if self.method == "sobol":
+            return _saltelli_design(self.num_parameters, self.base_samples, self.seed)
+        return _morris_design(self.num_parameters, self.base_samples, self.levels, self.seed)
+
+    def design(self) -> np.ndarray:
+        unit = self.unit_design()
+        columns = [p.scale(unit[:, j]) for j, p in enumerate(self.parameters)]
+        return np.column_stack(columns)
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["parameters"] = [asdict(p) for p in self.parameters]
+        return data
+
+
+def _saltelli_design(k: int, n: int, seed: int) -> np.ndarray:
+    """Saltelli-asetelma lohkoina [A; B; AB_1; ...; AB_k] (AB_i = A, sarake i B:stä)."""
+    sampler = qmc.Sobol(d=2 * k, scramble=True, seed=seed)
+    base = sampler.random(n)
+    a, b = base[:, :k], base[:, k:]
+    blocks = [a, b]
+    for i in range(k):
+        ab = a.copy()
+        ab[:, i] = b[:, i]
+        blocks.append(ab)
+    return np.vstack(blocks)
+
+
+def _morris_delta(levels: int) -> float:
+    return levels / (2.0 * (levels - 1))
+
+
+def _morris_design(k: int, trajectories: int, levels: int, seed: int) -> np.ndarray:
+    """Morrisin trajektorit: kukin k+1 pistettä, joista peräkkäiset eroavat yhden parametrin osalta."""
+    rng = np.random.default_rng(seed)
+    delta = _morris_delta(levels)
+    grid = np.arange(levels) / (levels - 1)
+    points = []
+    for _ in range(trajectories):
+        x = rng.choice(grid, size=k)
+        points.append(x.copy())
+        for i in rng.permutation(k):
+            x[i] = x[i] + delta if x[i] + delta <= 1.0 + 1e-12 else x[i] - delta
+            points.append(x.copy())
+    return np.vstack(points)
+
+
+# --- Pisteiden arviointi ---
+def _point_key(overrides: dict[str, float], seeds: list[int], n_months: int, config_hash: str) -> str:
+    payload = json.dumps(
+        {
+            "overrides": {k: repr(float(v)) for k, v in sorted(overrides.items())},
+            "seeds": seeds,
+            "months": n_months,
+            "config": config_hash,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _config_hash(config: dict[str, Any]) -> str:
+    base = {k: v for k, v in config.items() if k != "sensitivity"}
+    return hashlib.sha1(json.dumps(base, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def evaluate_point(
+    config: dict[str, Any],
+    overrides: dict[str, float],
+    seeds: list[int],
+    n_months: int,
+    metrics: list[str],
+) -> dict[str, float]:
+    """Aja yksi asetelman piste (yksi ajo per siemen) ja palauta mittareiden lopputila-keskiarvot."""
+    totals = dict.fromkeys(metrics, 0.0)
+    for seed in seeds:
+        cfg = deepcopy(config)
+        for path, value in overrides.items():
+            set_config_value(cfg, path, value)
+        # Vain lopputila ja vain pyydetyt mittarit
+        cfg["output"] = {"model_reporters": list(metrics), "summary_only": True}
+
+        random.seed(seed)
+        model = EconomyModel(config=cfg, seed=seed)
+        model.run_for_months(n_months)
+        last = model.get_results()["model"].iloc[-1]
+        for metric in metrics:
+            totals[metric] += float(last[metric])
+    return {metric: total / len(seeds) for metric, total in totals.items()}
+
+
+def _evaluate_chunk(
+    config: dict[str, Any],
+    chunk: list[tuple[str, dict[str, float]]],
+    seeds: list[int],
+    n_months: int,
+    metrics: list[str],
+) -> list[tuple[str, dict[str, float]]]:
+    return [(key, evaluate_point(config, overrides, seeds, n_months, metrics)) for key, overrides in chunk]
+
+
+class EvaluationCache:
+    """Valmiiden pisteiden JSONL-välimuisti (yksi rivi per piste, lisäys vain loppuun)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.values: dict[str, dict[str, float]] = {}
+        if path.exists():
+            with path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Keskeytyksessä katkennut viimeinen rivi: piste ajetaan uudelleen
+                        continue
+                    self.values[record["key"]] = record["values"]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.values
+
+    def add_many(self, results: list[tuple[str, dict[str, float]]]) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            for key, values in results:
+                f.write(json.dumps({"key": key, "values": values}) + "\n")
+                self.values[key] = values
+            f.flush()
+            os.fsync(f.fileno())
+
+
+@dataclass
+class SensitivityResult:
+    study: SensitivityStudy
+    design: np.ndarray
+    outputs: pd.DataFrame  # yksi rivi per asetelman piste, sarakkeina mittarit
+    indices: pd.DataFrame = field(init=False)
+
+    def __post_init__(self) -> None:
+        if self.study.method == "sobol":
+            self.indices = sobol_indices(self.study, self.outputs)
+        else:
+            self.indices = morris_indices(self.study, self.outputs)
+
+
+def run_study(
+    config: dict[str, Any],
+    study: SensitivityStudy,
+    study_dir: str | Path,
+    workers: int | None = None,
+    progress: ProgressCallback | None = None,
+) -> SensitivityResult:
+    """Aja (tai jatka) tutkimus ja laske herkkyysindeksit.
+
+    Valmiit palat kirjataan `study_dir/evaluations.jsonl`-tiedostoon heti, joten
+    keskeytyksen jälkeen sama kutsu jatkaa puuttuvista pisteistä.
+    `progress(valmiit, yhteensä)` kutsutaan jokaisen palan jälkeen.
+    """
+    study_dir = Path(study_dir)
+    study_dir.mkdir(parents=True, exist_ok=True)
+    config_hash = _config_hash(config)
+    spec = {"study": study.to_dict(), "config_hash": config_hash}
+    spec_path = study_dir / "study.json"
+    if spec_path.exists():
+        if json.loads(spec_path.read_text(encoding="utf-8")) != spec:
+            raise ValueError(f"Study directory {study_dir} belongs to a different study or base config")
+    else:
+        spec_path.write_text(json.dumps(spec, indent=2), encoding="utf-8")
+
+    design = study.design()
+    paths = [p.path for p in study.parameters]
+    seeds = derive_seeds(study.seed, study.replicates)
+    keys = []
+    points: dict[str, dict[str, float]] = {}
+    for row in design:
+        overrides = {path: (int(v) if p.integer else float(v)) for path, p, v in zip(paths, study.parameters, row)}
+        key = _point_key(overrides, seeds, study.n_months, config_hash)
+        keys.append(key)
+        points.setdefault(key, overrides)
+
+    cache = EvaluationCache(study_dir / "evaluations.jsonl")
+    pending = [(key, overrides) for key, overrides in points.items() if key not in cache]
+    chunks = [pending[i : i + study.chunk_size] for i in range(0, len(pending), study.chunk_size)]
+    total = len(points)
+    done = total - len(pending)
+    if progress is not None:
+        progress(done, total)
+
+    workers = min(max(1, len(chunks)), workers or os.cpu_count() or 1)
+    if workers == 1:
+        for chunk in chunks:
+            cache.add_many(_evaluate_chunk(config, chunk, seeds, study.n_months, study.metrics))
+            done += len(chunk)
+            if progress is not None:
+                progress(done, total)
+    else:
+        # Liukuva ikkuna: jonossa korkeintaan 2 palaa per työprosessi
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            queue = iter(chunks)
+            running: set[Future] = set()
+
+            def submit_next() -> bool:
+                chunk = next(queue, None)
+                if chunk is None:
+                    return False
+                running.add(pool.submit(_evaluate_chunk, config, chunk, seeds, study.n_months, study.metrics))
+                return True
+
+            for _ in range(2 * workers):
+                if not submit_next():
+                    break
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    running.discard(future)
+                    results = future.result()
+                    cache.add_many(results)
+                    done += len(results)
+                    if progress is not None:
+                        progress(done, total)
+                    submit_next()
+
+    outputs = pd.DataFrame([cache.values[key] for key in keys], columns=study.metrics)
+    return SensitivityResult(study=study, design=design, outputs=outputs)
+
+
+# --- Indeksit ---
+def _sobol_from_blocks(f_a: np.ndarray, f_b: np.ndarray, f_ab: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """S1 (Saltelli 2010) ja ST (Jansen 1999); f_ab muotoa (N, k)."""
+    variance = np.var(np.concatenate([f_a, f_b]), ddof=1)
+    if variance <= 0.0:
+        k = f_ab.shape[1]
+        return np.zeros(k), np.zeros(k)
+    s1 = np.mean(f_b[:, None] * (f_ab - f_a[:, None]), axis=0) / variance
+    st = 0.5 * np.mean((f_a[:, None] - f_ab) ** 2, axis=0) / variance
+    return s1, st
+
+
+def sobol_indices(study: SensitivityStudy, outputs: pd.DataFrame) -> pd.DataFrame:
+    """Sobol-indeksit mittareittain; rivit (metric, parameter), sarakkeet S1, ST (+ luottamusvälit)."""
+    n, k = study.base_samples, study.num_parameters
+    rng = np.random.default_rng(study.seed)
+    boot_idx = [rng.integers(0, n, size=n) for _ in range(study.bootstrap)]
+    rows = []
+    for metric in study.metrics:
+        y = outputs[metric].to_numpy(dtype=float)
+        f_a, f_b = y[:n], y[n : 2 * n]
+        f_ab = y[2 * n :].reshape(k, n).T
+        s1, st = _sobol_from_blocks(f_a, f_b, f_ab)
+        if boot_idx:
+            samples = [_sobol_from_blocks(f_a[idx], f_b[idx], f_ab[idx]) for idx in boot_idx]
+            s1_conf = 1.96 * np.std([s[0] for s in samples], axis=0, ddof=1)
+            st_conf = 1.96 * np.std([s[1] for s in samples], axis=0, ddof=1)
+        else:
+            s1_conf = st_conf = np.full(k, np.nan)
+        for j, param in enumerate(study.parameters):
+            rows.append((metric, param.path, s1[j], s1_conf[j], st[j], st_conf[j]))
+    return pd.DataFrame(
+        rows, columns=["metric", "parameter", "S1", "S1_conf", "ST", "ST_conf"]
+    ).set_index(["metric", "parameter"])
+
+
+def morris_indices(study: SensitivityStudy, outputs: pd.DataFrame) -> pd.DataFrame:
+    """Morrisin alkeisvaikutukset: mu, mu* ja sigma (yksikkökuution mittakaavassa)."""
+    k = study.num_parameters
+    unit = study.unit_design()
+    rows = []
+    for metric in study.metrics:
+        y = outputs[metric].to_numpy(dtype=float)
+        effects: list[list[float]] = [[] for _ in range(k)]
+        for t in range(study.base_samples):
+            start = t * (k + 1)
+            for step in range(k):
+                a, b = start + step, start + step + 1
+                diff = unit[b] - unit[a]
+                i = int(np.flatnonzero(diff)[0])
+                effects[i].append((y[b] - y[a]) / diff[i])
+        for j, param in enumerate(study.parameters):
+            ee = np.asarray(effects[j])
+            sigma = float(np.std(ee, ddof=1)) if ee.size > 1 else 0.0
+            rows.append((metric, param.path, float(ee.mean()), float(np.abs(ee).mean()), sigma))
+    return pd.DataFrame(
+        rows, columns=["metric", "parameter", "mu", "mu_star", "sigma"]
+    ).set_index(["metric", "parameter"])
@@ -0,0 +1,165 @@
+"""Hyödykemarkkina v0.8.3.
+
+Kotitalouksien kulutusbudjetit kohdistetaan yrityksille kuukauden aikana.
+Yrityksen myynti kirjataan kerran (`FirmAgent.sell_goods`) ja ALV
+tilitetään valtiolle yhtenä summana kotitalousvaiheen lopussa
+(`GoodsMarket.settle`).
+
+Reititys (`goods.routing`):
+- "random": jokainen kotitalous ostaa satunnaiselta elossa olevalta
+  yritykseltä (kuten ennen). Jos yrityksen varasto ei riitä, myyty määrä
+  jaetaan ostajille suhteessa budjettiin.
+- "cheapest": halvin yritys ensin; kun sen varasto loppuu, kysyntä siirtyy
+  seuraavaksi halvimmalle. Eräajossa kaikki ostajat saavat saman
+  täyttöasteen.
+
+Eräajo (`clear`) on O(N + F log F): ostajien budjetit kootaan
+yrityksittäin `np.bincount`illa, joten kotitalouskohtaisia metodikutsuja ei ole.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover
+    from agents.firm import FirmAgent
+    from agents.household import HouseholdAgent
+    from agents.population import HouseholdPopulation
+    from core.model import EconomyModel
+
+ROUTINGS = ("random", "cheapest")
+
+
+class GoodsMarket:
+    """Hyödykemarkkinan koordinaattori: reititys, myynnin kirjaus ja ALV."""
+
+    def __init__(self, model: EconomyModel, routing: str = "random") -> None:
+        if routing not in ROUTINGS:
+            raise ValueError(f"Unknown goods routing: {routing}")
+        self.model = model
+        self.routing = routing
+        self.pending_vat = 0.0
+        # Elossa olevat yritykset kuukausittain: konkurssit tapahtuvat yritysvaiheessa,
+        # kotitalousvaiheessa lista voi vain kasvaa (uudet yritykset)
+        self._firms_key: tuple[int, int] | None = None
+        self._alive_firms: list[FirmAgent] = []
+        self._by_price: list[FirmAgent] = []
+        self._cheapest_index = 0
+
+    # --- Yrityslistat ---
+    def alive_firms(self) -> list[FirmAgent]:
+        """Elossa olevat yritykset (välimuisti kuukauden ja yritysmäärän mukaan)."""
+        firms = self.model.firms
+        key = (self.model.month, len(firms))
+        if key != self._firms_key:
+            self._firms_key = key
+            self._alive_firms = [f for f in firms if f.alive]
+            self._by_price = sorted(
+                (f for f in self._alive_firms if f.price > 0), key=lambda f: (f.price, f.unique_id)
+            )
+            self._cheapest_index = 0
+        return self._alive_firms
+
+    # --- Yksittäinen osto (agents-moottori) ---
+    def purchase(self, household: HouseholdAgent, budget: float) -> float:
+        """Osta `budget`in verran kotitaloudelle. Palauttaa maksetun summan (sis. ALV)."""
+        alive_firms = self.alive_firms()
+        if not alive_firms:
+            return 0.0
+
+        if self.routing == "cheapest":
+            return self._purchase_cheapest(budget)
+
+        if self.model.counter_rng is not None:
+            target_firm = alive_firms[int(household._draw("household.consume_firm") * len(alive_firms))]
+        else:
+            target_firm = household.random.choice(alive_firms)
+
+        if target_firm.price <= 0:
+            return 0.0
+        spent = target_firm.sell_goods(budget / target_firm.price)
+        self.pending_vat += spent * self.model.vat_rate
+        return spent
+
+    def _purchase_cheapest(self, budget: float) -> float:
+        by_price = self._by_price
+        spent = 0.0
+        remaining = budget
+        while remaining > 0 and self._cheapest_index < len(by_price):
+            firm = by_price[self._cheapest_index]
+            units = remaining / firm.price
+            if units < firm.inventory:
+                spent += firm.sell_goods(units)
+                break
+            # Varasto loppuu: loput budjetista seuraavaksi halvimmalle
+            spent += firm.sell_goods(firm.inventory)
+            remaining = budget - spent
+            self._cheapest_index += 1
+        self.pending_vat += spent * self.model.vat_rate
+        return spent
+
+    # --- Eräajo (vectorized-moottori) ---
+    def clear(self, population: HouseholdPopulation, buyers: np.ndarray, budgets: np.ndarray) -> np.ndarray:
+        """Kohdista ostajien budjetit yrityksille kerralla. Palauttaa maksetut summat riveittäin."""
+        alive_firms = self.alive_firms()
+        if buyers.size == 0 or not alive_firms:
+            return np.zeros(buyers.size, dtype=np.float64)
+        if self.routing == "cheapest":
+            spent = self._clear_cheapest(budgets)
+        else:
+            spent = self._clear_random(population, buyers, budgets, alive_firms)
+        self.pending_vat += float(spent.sum()) * self.model.vat_rate
+        return spent
+
+    def _clear_random(
+        self,
+        population: HouseholdPopulation,
+        buyers: np.ndarray,
+        budgets: np.ndarray,
+        alive_firms: list[FirmAgent],
+    ) -> np.ndarray:
+        n_firms = len(alive_firms)
+        if self.model.counter_rng is not None:
+            choices = (population._draws("household.consume_firm", buyers) * n_firms).astype(np.int64)
+        else:
+            choices = self.model.rng.integers(0, n_firms, size=buyers.size)
+        prices = np.array([f.price for f in alive_firms], dtype=np.float64)
+        chosen_prices = prices[choices]
+        priced = chosen_prices > 0
+        units = np.zeros(buyers.size, dtype=np.float64)
+        units[priced] = budgets[priced] / chosen_prices[priced]
+
+        demand = np.bincount(choices[priced], weights=units[priced], minlength=n_firms)
+        fill = np.ones(n_firms, dtype=np.float64)
+        for idx in np.flatnonzero(demand > 0):
+            firm = alive_firms[idx]
+            sold_units = min(firm.inventory, demand[idx])
+            firm.sell_goods(sold_units)
+            fill[idx] = sold_units / demand[idx]
+        return units * fill[choices] * chosen_prices
+
+    def _clear_cheapest(self, budgets: np.ndarray) -> np.ndarray:
+        firms = [f for f in self._by_price if f.inventory > 0]
+        total_budget = float(budgets.sum())
+        if not firms or total_budget <= 0:
+            return np.zeros(budgets.size, dtype=np.float64)
+        prices = np.array([f.price for f in firms], dtype=np.float64)
+        capacity = np.array([f.inventory for f in firms], dtype=np.float64) * prices
+        # Halvimmasta alkaen: kukin yritys myy sen, mitä edellisistä jäi kysyntää
+        before = np.concatenate(([0.0], np.cumsum(capacity)[:-1]))
+        sales = np.clip(total_budget - before, 0.0, capacity)
+        for idx in np.flatnonzero(sales > 0):
+            firm = firms[idx]
+            firm.sell_goods(min(firm.inventory, sales[idx] / prices[idx]))
+        return budgets * (float(sales.sum()) / total_budget)
+
+    # --- Kuukauden lopun tilitys ---
+    def settle(self) -> float:
+        """Tilitä kuukauden ALV valtiolle yhtenä eränä. Palauttaa tilitetyn summan."""
+        vat = self.pending_vat
+        self.pending_vat = 0.0
+        if vat > 0:
+            self.model.state.collect_vat(vat)
+        return vat
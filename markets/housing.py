@@ -8,6 +8,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 if TYPE_CHECKING:  # pragma: no cover
     from agents.household import HouseholdAgent
 
@@ -104,6 +106,7 @@ class HousingMarket:
         2. Yleiseen inflaatioon (CPI)
         """
         self.monthly_transactions = 0
+        buyer_counts = self._buyer_counts_by_size()
         
         for size in [1, 2, 3, 4]:
             # Kokokohtainen kysyntä ja tarjonta
@@ -111,17 +114,13 @@ class HousingMarket:
             if not size_dwellings:
                 continue
             
-            buyers = [
-                h for h in self.model.households
-                if h.alive and h.needs_housing() and h.required_dwelling_size() == size
-            ]
             sellers = [d for d in size_dwellings if d.for_sale]
             
             if not sellers:
                 continue
             
             # Kysyntäpaine
-            pressure = len(buyers) / len(sellers)
+            pressure = buyer_counts.get(size, 0) / len(sellers)
             
             # Paikallinen hintamuutos
             local_change = 1.0
@@ -155,13 +154,16 @@ class HousingMarket:
         transactions = 0
         
         # Kerää ostajat ja myyjät
-        potential_buyers = [
-            h for h in self.model.households
-            if h.alive and h.needs_housing()
-        ]
+        potential_buyers = self._potential_buyers()
         
         # Sekoita ostajat satunnaisessa järjestyksessä
-        self.model.random.shuffle(potential_buyers)
+        counter_rng = getattr(self.model, "counter_rng", None)
+        if counter_rng is not None:
+            counter_rng.stream("housing.buyers").shuffle(
+                potential_buyers, self.model.month, key=lambda hh: hh.unique_id
+            )
+        else:
+            self.model.random.shuffle(potential_buyers)
         
         for buyer in potential_buyers:
             required_size = buyer.required_dwelling_size()
@@ -185,6 +187,27 @@ class HousingMarket:
         
         return transactions
     
+    def _potential_buyers(self) -> list[HouseholdAgent]:
+        """Asuntoa tarvitsevat elävät kotitaloudet elävien järjestyksessä."""
+        if getattr(self.model, "household_engine", "agents") == "vectorized":
+            population = self.model.household_population
+            rows, _ = population.housing_demand()
+            return [population.agents[row] for row in rows]
+        return [h for h in self.model.households if h.alive and h.needs_housing()]
+
+    def _buyer_counts_by_size(self) -> dict[int, int]:
+        """Asunnon tarvitsijoiden määrä tarvitun asuntokoon mukaan."""
+        if getattr(self.model, "household_engine", "agents") == "vectorized":
+            _, required = self.model.household_population.housing_demand()
+            counts = np.bincount(required, minlength=5)
+            return {size: int(counts[size]) for size in (1, 2, 3, 4)}
+        counts: dict[int, int] = {}
+        for h in self.model.households:
+            if h.alive and h.needs_housing():
+                size = h.required_dwelling_size()
+                counts[size] = counts.get(size, 0) + 1
+        return counts
+
     def _try_purchase(
         self,
         buyer: HouseholdAgent,
@@ -0,0 +1,169 @@
+"""Työmarkkina v0.8.3.
+
+Kuukausittainen työmarkkinakierros (`LaborMarket.run`):
+
+1. Yritykset päivittävät työvoimakysynnän ja palkkatason
+2. Ylityölliset yritykset irtisanovat satunnaiset työntekijät
+3. Työttömät kootaan hakijajonoon ja jono sekoitetaan
+4. Avoimet paikat kootaan palkkajärjestettyyn kekoon yrityksittäin (määrä per yritys)
+5. Hakijat täyttävät paikat jonojärjestyksessä, korkeapalkkaisimmat ensin
+
+Tulos on sama kuin aiemmalla listapohjaisella säännöllä: paikat täytetään
+palkan mukaan laskevasti ja samalla palkalla yritysjärjestyksessä. Kustannus
+on O(N + V + F log F): hakijan jäsenyys tarkistetaan kotitalouden
+`job_seeker`-lipusta, työntekijärekisteristä poisto on O(1) eikä avoimia
+paikkoja laajenneta yksittäisiksi alkioiksi.
+"""
+
+from __future__ import annotations
+
+import heapq
+from operator import attrgetter
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+if TYPE_CHECKING:  # pragma: no cover
+    from agents.firm import FirmAgent
+    from agents.household import HouseholdAgent
+    from core.model import EconomyModel
+
+
+class EmployeeRoster:
+    """Yrityksen työntekijät lisäysjärjestyksessä, O(1) lisäys, poisto ja jäsenyys.
+
+    Käyttäytyy iteroinnissa kuten aiempi lista (poisto säilyttää muiden
+    järjestyksen), joten palkanmaksu ja irtisanomisarvonta näkevät saman
+    järjestyksen.
+    """
+
+    __slots__ = ("_members",)
+
+    def __init__(self, members: Iterable[HouseholdAgent] = ()) -> None:
+        self._members: dict[HouseholdAgent, None] = dict.fromkeys(members)
+
+    def append(self, employee: HouseholdAgent) -> None:
+        self._members[employee] = None
+
+    def remove(self, employee: HouseholdAgent) -> None:
+        """Poista työntekijä; ValueError, jos ei rekisterissä (kuten `list.remove`)."""
+        try:
+            del self._members[employee]
+        except KeyError:
+            raise ValueError("Employee not in roster") from None
+
+    def discard(self, employee: HouseholdAgent) -> None:
+        self._members.pop(employee, None)
+
+    def clear(self) -> None:
+        self._members.clear()
+
+    def reverse(self) -> None:
+        self._members = dict.fromkeys(reversed(self._members))
+
+    def __contains__(self, employee: object) -> bool:
+        return employee in self._members
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __iter__(self) -> Iterator[HouseholdAgent]:
+        return iter(self._members)
+
+    def __repr__(self) -> str:
+        return f"EmployeeRoster({len(self._members)} employees)"
+
+    def __getstate__(self) -> dict[str, list[HouseholdAgent]]:
+        return {"members": list(self._members)}
+
+    def __setstate__(self, state: dict[str, list[HouseholdAgent]]) -> None:
+        self._members = dict.fromkeys(state["members"])
+
+
+class LaborMarket:
+    """Työmarkkinan koordinaattori: irtisanomiset, hakijajono ja palkkakeko."""
+
+    def __init__(self, model: EconomyModel) -> None:
+        self.model = model
+        # Viimeisimmän kierroksen tilastot
+        self.last_fired = 0
+        self.last_hired = 0
+
+    def run(self) -> None:
+        """Yksi kuukausittainen kierros."""
+        model = self.model
+        alive_firms = [firm for firm in model.firms if firm.alive]
+
+        # 1) Päivitä kaikkien firmojen työvoimakysyntä ja palkkataso
+        for firm in alive_firms:
+            firm._update_labor_demand()
+            firm._update_wage_level()
+
+        # 2) Irtisanomiset ylityöllisistä firmoista
+        pool = self._lay_off(alive_firms)
+        self.last_fired = len(pool)
+
+        # 3) Kerää kaikki työttömät työnhakijat (lippu korvaa jonon jäsenyystestin)
+        for hh in model.households:
+            if hh.alive and not hh.employed and not hh.job_seeker:
+                hh.job_seeker = True
+                pool.append(hh)
+
+        if model.counter_rng is not None:
+            model.counter_rng.stream("labor.queue").shuffle(pool, model.month, key=attrgetter("unique_id"))
+        else:
+            model.random.shuffle(pool)
+
+        # 4-5) Palkkakeko ja matching
+        self.last_hired = self._match(pool, self._vacancy_heap(alive_firms))
+        for hh in pool:
+            hh.job_seeker = False
+
+    def _lay_off(self, alive_firms: list[FirmAgent]) -> list[HouseholdAgent]:
+        model = self.model
+        fired_pool: list[HouseholdAgent] = []
+        for firm in alive_firms:
+            num_to_fire = len(firm.employees) - firm.target_employees
+            if num_to_fire <= 0:
+                continue
+            employees = list(firm.employees)
+            if model.counter_rng is not None:
+                fired = model.counter_rng.stream("labor.layoffs").sample(
+                    employees, num_to_fire, model.month, key=attrgetter("unique_id")
+                )
+            else:
+                fired = model.random.sample(employees, num_to_fire)
+            for employee in fired:
+                employee.lose_job()
+                firm.employees.discard(employee)
+                employee.job_seeker = True
+                fired_pool.append(employee)
+        return fired_pool
+
+    @staticmethod
+    def _vacancy_heap(alive_firms: list[FirmAgent]) -> list[list]:
+        """Avoimet paikat yrityksittäin: [-palkka, yritysjärjestys, määrä, yritys]."""
+        heap = []
+        for position, firm in enumerate(alive_firms):
+            num_vacancies = firm.target_employees - len(firm.employees)
+            if num_vacancies > 0:
+                heap.append([-firm.wage_level, position, num_vacancies, firm])
+        heapq.heapify(heap)
+        return heap
+
+    @staticmethod
+    def _match(pool: list[HouseholdAgent], heap: list[list]) -> int:
+        """Hakijat jonojärjestyksessä keon huipulle. Palauttaa palkattujen määrän."""
+        hired = 0
+        for job_seeker in pool:
+            if not heap:
+                break
+            bucket = heap[0]
+            neg_wage, _, _, firm = bucket
+            job_seeker.employed = True
+            job_seeker.employer = firm
+            job_seeker.wage = -neg_wage
+            firm.employees.append(job_seeker)
+            hired += 1
+            bucket[2] -= 1
+            if bucket[2] == 0:
+                heapq.heappop(heap)
+        return hired
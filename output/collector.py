@@ -0,0 +1,232 @@
+"""v0.8.3: Konfiguroitava datankeräin.
+
+Korvaa Mesan `DataCollector`in mallissa. Rajapinta (`collect`,
+`get_model_vars_dataframe`, `get_agent_vars_dataframe`) on sama, mutta
+
+- mallitason raportoijat valitaan ryhmittäin tai nimeltä,
+- jokaisella ryhmällä on oma keruuväli (monthly/quarterly/yearly/final),
+- `summary_only` kerää vain ajon lopputilan (parametriajot),
+- agenttitason keruun voi kytkeä pois tai harventaa (väli + otososuus),
+- rivit voidaan suoratoistaa levylle (`attach_sink`), jolloin muistiin ei
+  kerry koko ajon historiaa,
+- ilman suoratoistoa muistissa pidettävän historian voi rajata
+  (`set_history_limit`, rajatun muistin tila).
+
+Oletuksilla (ei `output`-osiota) tulos on sama kuin aiemmin: kaikki
+raportoijat joka kuukausi.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any
+
+import pandas as pd
+
+from output.reporters import (
+    AGENT_REPORTERS,
+    MODEL_REPORTERS,
+    REPORTER_GROUP,
+    cadence_months,
+    resolve_agent_reporters,
+    resolve_model_reporters,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from output.sink import ColumnarResultSink
+
+
+class ScheduledDataCollector:
+    """Kerää malli- ja agenttitason mittarit konfiguraation aikataulun mukaan."""
+
+    def __init__(
+        self,
+        model_reporters: list[str],
+        cadences: dict[str, int],
+        agent_reporters: list[str],
+        agent_every_months: int = 1,
+        agent_sample_stride: int = 1,
+    ) -> None:
+        # Ryhmät keruuvälin mukaan: väli -> raportoijat (0 = vain lopussa)
+        self.model_reporters = list(model_reporters)
+        self._schedule: dict[int, list[str]] = {}
+        for name in self.model_reporters:
+            every = cadences.get(REPORTER_GROUP[name], 1)
+            self._schedule.setdefault(every, []).append(name)
+
+        self.agent_reporters = list(agent_reporters)
+        self.agent_every_months = agent_every_months
+        self.agent_sample_stride = agent_sample_stride
+
+        self._model_rows: list[dict[str, Any]] = []
+        self._final_row: dict[str, Any] | None = None
+        self._agent_records: list[tuple] = []
+        self.sink: ColumnarResultSink | None = None
+        # Muistissa pidettävä historia kuukausina (None = koko ajo)
+        self.history_months: int | None = None
+
+    @classmethod
+    def from_config(cls, output_cfg: dict[str, Any] | None) -> "ScheduledDataCollector":
+        """Rakenna keräin YAML:n `output`-osiosta."""
+        output_cfg = output_cfg or {}
+        summary_only = bool(output_cfg.get("summary_only", False))
+
+        model_reporters = resolve_model_reporters(output_cfg.get("model_reporters", "all"))
+        default_cadence = "final" if summary_only else output_cfg.get("cadence_default", "monthly")
+        cadence_cfg = output_cfg.get("cadence", {}) or {}
+        cadences: dict[str, int] = {}
+        for group in set(REPORTER_GROUP.values()):
+            value = "final" if summary_only else cadence_cfg.get(group, default_cadence)
+            cadences[group] = cadence_months(value)
+
+        agent_cfg = output_cfg.get("agent_reporters", {}) or {}
+        agents_enabled = bool(agent_cfg.get("enabled", True)) and not summary_only
+        agent_reporters = (
+            resolve_agent_reporters(agent_cfg.get("fields", "all")) if agents_enabled else []
+        )
+        every_months = int(agent_cfg.get("every_months", 1))
+        if every_months < 1:
+            raise ValueError("output.agent_reporters.every_months must be >= 1")
+        sample_share = float(agent_cfg.get("sample_share", 1.0))
+        if not 0.0 < sample_share <= 1.0:
+            raise ValueError("output.agent_reporters.sample_share must be in (0, 1]")
+
+        return cls(
+            model_reporters=model_reporters,
+            cadences=cadences,
+            agent_reporters=agent_reporters,
+            agent_every_months=every_months,
+            agent_sample_stride=max(1, round(1.0 / sample_share)),
+        )
+
+    @classmethod
+    def sink_from_config(cls, output_cfg: dict[str, Any] | None) -> ColumnarResultSink | None:
+        """Luo suoratoistokohde `output.sink`-osiosta (None, jos polkua ei ole annettu)."""
+        sink_cfg = (output_cfg or {}).get("sink", {}) or {}
+        if not sink_cfg.get("path"):
+            return None
+        from output.sink import ColumnarResultSink
+
+        return ColumnarResultSink(
+            sink_cfg["path"],
+            fmt=sink_cfg.get("format", "parquet"),
+            chunk_rows=int(sink_cfg.get("chunk_rows", 50_000)),
+        )
+
+    def set_history_limit(self, months: int | None) -> None:
+        """Pidä muistissa vain viimeisten `months` kuukauden rivit (ei koske suoratoistoa)."""
+        self.history_months = None if months is None else max(1, int(months))
+
+    def attach_sink(self, sink: ColumnarResultSink) -> None:
+        """Ohjaa jatkossa kerättävät rivit suoratoistona levylle."""
+        if self._model_rows or self._agent_records:
+            raise RuntimeError("Attach the result sink before the first collection")
+        sink.open(self.model_reporters, self.agent_reporters)
+        self.sink = sink
+
+    def close(self) -> None:
+        """Kirjoita lopputila ja sulje mahdollinen suoratoisto."""
+        if self.sink is not None and not self.sink.closed:
+            if self._final_row is not None:
+                self.sink.write_final_row(self._final_row)
+            self.sink.close()
+
+    def resume(self) -> None:
+        """Jatka suoratoistoa tallennuspisteestä ladatussa mallissa."""
+        if self.sink is not None:
+            self.sink.resume()
+
+    def reset(self) -> None:
+        """Unohda kerätyt rivit ja irrota suoratoisto (haarautetun ajon jatko)."""
+        self._model_rows = []
+        self._final_row = None
+        self._agent_records = []
+        self.sink = None
+
+    # --- Keruu ---
+    def collect(self, model: Any) -> None:
+        """Kuukauden lopun keruu: vain ne ryhmät, joiden väli täyttyy."""
+        month = model.month
+        row: dict[str, Any] | None = None
+        for every, names in self._schedule.items():
+            if every == 0 or month % every != 0:
+                continue
+            if row is None:
+                row = {"month": month}
+            for name in names:
+                row[name] = MODEL_REPORTERS[name](model)
+        if row is not None:
+            if self.sink is not None:
+                self.sink.write_model_row(row)
+            else:
+                self._model_rows.append(row)
+
+        if self.agent_reporters and month % self.agent_every_months == 0:
+            self._record_agents(model)
+
+        if self.history_months is not None and self.sink is None:
+            self._trim_history(month, model.steps)
+
+    def _trim_history(self, month: int, step: int) -> None:
+        oldest = month - self.history_months
+        drop = 0
+        while drop < len(self._model_rows) and self._model_rows[drop]["month"] <= oldest:
+            drop += 1
+        if drop:
+            del self._model_rows[:drop]
+        drop = bisect_left(self._agent_records, step - self.history_months + 1, key=lambda r: r[0])
+        if drop:
+            del self._agent_records[:drop]
+
+    def collect_final(self, model: Any) -> None:
+        """Ajon lopun keruu "final"-ryhmille (korvaa edellisen lopputilan)."""
+        names = self._schedule.get(0)
+        if not names:
+            return
+        row: dict[str, Any] = {"month": model.month}
+        for name in names:
+            row[name] = MODEL_REPORTERS[name](model)
+        self._final_row = row
+
+    def _record_agents(self, model: Any) -> None:
+        step = model.steps
+        stride = self.agent_sample_stride
+        reporters = [AGENT_REPORTERS[name] for name in self.agent_reporters]
+        records = self._agent_records if self.sink is None else []
+        for agent in model.agents:
+            if stride > 1 and agent.unique_id % stride != 0:
+                continue
+            records.append((step, agent.unique_id, *(fn(agent) for fn in reporters)))
+        if self.sink is not None:
+            self.sink.write_agent_records(records)
+
+    # --- Tulokset ---
+    def _read_sink(self) -> dict[str, pd.DataFrame]:
+        from output.sink import read_results
+
+        if not self.sink.closed:
+            if self._final_row is not None:
+                self.sink.write_final_row(self._final_row)
+            self.sink.flush()
+        return read_results(self.sink.path)
+
+    def get_model_vars_dataframe(self) -> pd.DataFrame:
+        if self.sink is not None:
+            return self._read_sink()["model"]
+        rows = list(self._model_rows)
+        if self._final_row is not None:
+            if rows and rows[-1]["month"] == self._final_row["month"]:
+                rows[-1] = {**rows[-1], **self._final_row}
+            else:
+                rows.append(self._final_row)
+        columns = ["month", *self.model_reporters]
+        return pd.DataFrame.from_records(rows, columns=columns)
+
+    def get_agent_vars_dataframe(self) -> pd.DataFrame:
+        if self.sink is not None:
+            return self._read_sink()["agents"]
+        return pd.DataFrame.from_records(
+            data=self._agent_records,
+            columns=["Step", "AgentID", *self.agent_reporters],
+            index=["Step", "AgentID"],
+        )
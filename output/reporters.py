@@ -0,0 +1,149 @@
+"""v0.8.3: Raportoijien rekisteri ryhmittäin.
+
+Mallitason raportoijat on jaettu ryhmiin (core, bank, housing, ...), jotta
+konfiguraatiosta voidaan valita, mitkä mittarit lasketaan ja kuinka usein.
+Keräin tallentaa vain raportoijien nimet, joten itse funktiot pysyvät tässä
+moduulissa eivätkä kulje mallin tilan mukana.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+Reporter = Callable[[Any], Any]
+
+# Ryhmä -> {raportoijan nimi: funktio}. Järjestys määrää sarakkeiden järjestyksen.
+MODEL_REPORTER_GROUPS: dict[str, dict[str, Reporter]] = {
+    "core": {
+        "cpi": lambda m: m.cpi,  # v0.4: Consumer Price Index
+        "unemployment_rate": lambda m: m.unemployment_rate,
+        "state_balance": lambda m: m.state_balance,
+        "total_consumption": lambda m: m.total_consumption,
+        "gini_wealth": lambda m: m.gini_wealth,
+        "avg_age": lambda m: m.aggregates.avg_age,
+        "population": lambda m: m.aggregates.population,
+        "money_supply_m1": lambda m: m.money_supply_m1,
+    },
+    "bank": {
+        "bank_total_loans": lambda m: m.bank_total_loans,
+        "bank_capital_ratio": lambda m: m.bank_capital_ratio,
+        "bank_default_losses": lambda m: getattr(m.bank, "total_defaulted", 0.0),
+        "bank_performing_share": lambda m: m.bank_performing_share,
+        "bank_age_bucket_0_6": lambda m: m.bank_age_bucket_0_6,
+        "bank_age_bucket_6_12": lambda m: m.bank_age_bucket_6_12,
+        "bank_age_bucket_12_24": lambda m: m.bank_age_bucket_12_24,
+        "bank_age_bucket_24_plus": lambda m: m.bank_age_bucket_24_plus,
+        "bank_investment_loan_share": lambda m: m.bank_investment_loan_share,
+        "bank_nonperforming_balance": lambda m: m.bank_nonperforming_balance,
+        "bank_avg_active_loan_age": lambda m: m.bank_avg_active_loan_age,
+    },
+    # v0.5: Asuntomarkkina-mittarit
+    "housing": {
+        "avg_household_size": lambda m: m.avg_household_size,
+        "residents_per_dwelling": lambda m: m.residents_per_dwelling,
+        "housing_ownership_rate": lambda m: m.housing_ownership_rate,
+        "avg_house_price": lambda m: m.avg_house_price,
+        "avg_house_price_size_1": lambda m: m.avg_house_price_by_size(1),
+        "avg_house_price_size_2": lambda m: m.avg_house_price_by_size(2),
+        "avg_house_price_size_3": lambda m: m.avg_house_price_by_size(3),
+        "avg_house_price_size_4": lambda m: m.avg_house_price_by_size(4),
+        "housing_transactions": lambda m: m.housing_market.monthly_transactions,
+    },
+    # v0.6: Yrittäjyys-mittarit
+    "entrepreneurship": {
+        "entrepreneurship_rate": lambda m: m.entrepreneurship_rate,
+        "firm_births_per_month": lambda m: m.firm_births_per_month,
+        "firm_deaths_per_month": lambda m: m.firm_deaths_per_month,
+        "avg_firm_age": lambda m: m.avg_firm_age,
+        "entrepreneur_wealth_share": lambda m: m.entrepreneur_wealth_share,
+        "num_active_firms": lambda m: m.num_active_firms,
+    },
+    # v0.7: Rakennusliike-mittarit
+    "construction": {
+        "construction_projects_active": lambda m: m.construction_projects_active,
+        "construction_employment": lambda m: m.construction_employment,
+        "dwellings_completed_per_month": lambda m: m.dwellings_completed_per_month,
+        "construction_sector_cash": lambda m: m.construction_sector_cash,
+        "avg_construction_profit_margin": lambda m: m.avg_construction_profit_margin,
+    },
+    # v0.8: Valtio-mittarit
+    "state": {
+        "state_monthly_revenue": lambda m: m.state.monthly_revenue,
+        "state_monthly_expenses": lambda m: m.state.monthly_expenses,
+        "state_surplus": lambda m: m.state.monthly_surplus,
+        "state_total_debt": lambda m: m.state.total_debt,
+        "state_debt_to_gdp": lambda m: m.state.debt_to_gdp_ratio,
+        "state_income_tax": lambda m: m.state.income_tax_revenue,
+        "state_corporate_tax": lambda m: m.state.corporate_tax_revenue,
+        "state_vat": lambda m: m.state.vat_revenue,
+        "state_capital_gains_tax": lambda m: m.state.capital_gains_revenue,
+        "state_transfers": lambda m: m.state.transfer_expenses,
+        "state_debt_service": lambda m: m.state.debt_service_expenses,
+        "state_public_procurement": lambda m: m.state.public_procurement_expenses,
+        "effective_tax_rate": lambda m: m.state.effective_tax_rate,
+    },
+}
+
+# Litistetty nimi -> funktio sekä nimi -> ryhmä (nimen perusteella tehtävää valintaa varten)
+MODEL_REPORTERS: dict[str, Reporter] = {
+    name: fn for group in MODEL_REPORTER_GROUPS.values() for name, fn in group.items()
+}
+REPORTER_GROUP: dict[str, str] = {
+    name: group_name
+    for group_name, group in MODEL_REPORTER_GROUPS.items()
+    for name in group
+}
+
+AGENT_REPORTERS: dict[str, Reporter] = {
+    "cash": lambda a: getattr(a, "cash", None),
+    "net_worth": lambda a: getattr(a, "net_worth", 0.0),
+    "age": lambda a: getattr(a, "age", None),
+    "alive": lambda a: getattr(a, "alive", None),
+    "employed": lambda a: getattr(a, "employed", None),
+    "household_size": lambda a: getattr(a, "household_size", None),
+}
+
+CADENCES: dict[str, int] = {
+    "monthly": 1,
+    "quarterly": 3,
+    "yearly": 12,
+    "final": 0,  # vain ajon lopussa
+}
+
+
+def resolve_model_reporters(selection: Any) -> list[str]:
+    """Muunna konfiguraation valinta ("all" tai lista ryhmiä/nimiä) raportoijien nimiksi."""
+    if selection is None or selection == "all":
+        return list(MODEL_REPORTERS)
+    if isinstance(selection, str):
+        selection = [selection]
+
+    chosen: set[str] = set()
+    for item in selection:
+        if item in MODEL_REPORTER_GROUPS:
+            chosen.update(MODEL_REPORTER_GROUPS[item])
+        elif item in MODEL_REPORTERS:
+            chosen.add(item)
+        else:
+            raise ValueError(f"Unknown model reporter or group: {item!r}")
+    # Säilytä rekisterin järjestys
+    return [name for name in MODEL_REPORTERS if name in chosen]
+
+
+def resolve_agent_reporters(selection: Any) -> list[str]:
+    if selection is None or selection == "all":
+        return list(AGENT_REPORTERS)
+    if isinstance(selection, str):
+        selection = [selection]
+    unknown = [name for name in selection if name not in AGENT_REPORTERS]
+    if unknown:
+        raise ValueError(f"Unknown agent reporter(s): {unknown}")
+    return [name for name in AGENT_REPORTERS if name in selection]
+
+
+def cadence_months(value: str) -> int:
+    if value not in CADENCES:
+        raise ValueError(
+            f"Unknown collection cadence {value!r}; expected one of {sorted(CADENCES)}"
+        )
+    return CADENCES[value]
@@ -0,0 +1,278 @@
+"""v0.8.3: Tulosten suoratoisto sarakemuotoisiin tiedostoihin.
+
+`ColumnarResultSink` vastaanottaa keräimeltä jokaisen kuukauden rivit ja
+kirjoittaa ne taustasäikeessä paloittain Parquet- tai Arrow IPC -tiedostoiksi,
+joten muistissa on kerrallaan vain yksi pala eikä koko ajon historiaa.
+
+Hakemistorakenne::
+
+    <polku>/meta.json            sarakkeet ja tiedostomuoto
+    <polku>/model/part-00000.*   mallitason rivit
+    <polku>/model/final.*        "final"-ryhmien lopputila (ylikirjoitetaan)
+    <polku>/agents/part-00000.*  agenttitason rivit
+
+`read_results` palauttaa samat DataFramet kuin `EconomyModel.get_results`.
+pyarrow on valinnainen riippuvuus: se tarvitaan vain tätä moduulia käytettäessä.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import threading
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+FORMATS: dict[str, str] = {"parquet": ".parquet", "arrow": ".arrow"}
+
+_STOP = object()
+
+
+def _require_pyarrow() -> Any:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.feather  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as exc:  # pragma: no cover - riippuu ympäristöstä
+        raise RuntimeError(
+            "Streaming results require pyarrow (pip install pyarrow)"
+        ) from exc
+    return pyarrow
+
+
+def _write_frame(df: pd.DataFrame, path: Path, fmt: str) -> None:
+    pa = _require_pyarrow()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if fmt == "parquet":
+        pa.parquet.write_table(table, path)
+    else:
+        pa.feather.write_feather(table, path)
+
+
+def _read_frame(path: Path, fmt: str) -> pd.DataFrame:
+    pa = _require_pyarrow()
+    if fmt == "parquet":
+        return pa.parquet.read_table(path).to_pandas()
+    return pa.feather.read_table(path).to_pandas()
+
+
+class ColumnarResultSink:
+    """Kirjoittaa keräimen rivit paloittain levylle taustasäikeessä."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        fmt: str = "parquet",
+        chunk_rows: int = 50_000,
+        max_pending: int = 8,
+    ) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown results format {fmt!r}; expected one of {sorted(FORMATS)}")
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be >= 1")
+        _require_pyarrow()
+
+        self.path = Path(path)
+        self.fmt = fmt
+        self.chunk_rows = chunk_rows
+        self.model_columns: list[str] = []
+        self.agent_columns: list[str] = []
+
+        self._buffers: dict[str, list] = {"model": [], "agents": []}
+        self._parts: dict[str, int] = {"model": 0, "agents": 0}
+        # Rajattu jono: jos kirjoitus jää jälkeen, simulaatio odottaa eikä muisti kasva
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._error: BaseException | None = None
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._resumable = False
+
+    # --- Elinkaari ---
+    def open(self, model_columns: list[str], agent_columns: list[str]) -> None:
+        """Luo hakemistot, kirjoita metatiedot ja käynnistä kirjoitussäie."""
+        self.model_columns = list(model_columns)
+        self.agent_columns = list(agent_columns)
+        for kind in ("model", "agents"):
+            directory = self.path / kind
+            directory.mkdir(parents=True, exist_ok=True)
+            for old in directory.glob("*" + FORMATS[self.fmt]):
+                old.unlink()
+        meta = {
+            "format": self.fmt,
+            "model_columns": self.model_columns,
+            "agent_columns": self.agent_columns,
+        }
+        (self.path / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+        self._thread = threading.Thread(target=self._run, name="result-sink", daemon=True)
+        self._thread.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def write_model_row(self, row: dict[str, Any]) -> None:
+        self._put(("model", [row]))
+
+    def write_agent_records(self, records: list[tuple]) -> None:
+        if records:
+            self._put(("agents", records))
+
+    def write_final_row(self, row: dict[str, Any]) -> None:
+        self._put(("final", row))
+
+    def flush(self) -> None:
+        """Odota, että jono on tyhjä ja puskurit kirjoitettu levylle."""
+        done = threading.Event()
+        self._put(("flush", done))
+        done.wait()
+        self._raise_if_failed()
+
+    def close(self) -> None:
+        if self._closed or self._thread is None:
+            return
+        self.flush()
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._closed = True
+        self._raise_if_failed()
+
+    # --- Tallennuspisteet (v0.8.3) ---
+    def __getstate__(self) -> dict[str, Any]:
+        """Tyhjennä puskurit levylle ja tallenna vain kirjoituskohta (ei säiettä/jonoa)."""
+        if self._thread is not None and not self._closed:
+            self.flush()
+        return {
+            "path": self.path,
+            "fmt": self.fmt,
+            "chunk_rows": self.chunk_rows,
+            "max_pending": self._queue.maxsize,
+            "model_columns": self.model_columns,
+            "agent_columns": self.agent_columns,
+            "parts": dict(self._parts),
+            "opened": self._thread is not None,
+            "closed": self._closed,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Palauta vain tila: tiedostoihin ei kosketa eikä säiettä käynnistetä.
+
+        Haarautetut kopiot (experiments.branching) puretaan picklestä samalla
+        tavalla, joten vasta tallennuspisteestä jatkaminen kutsuu `resume`a.
+        """
+        self.__init__(state["path"], state["fmt"], state["chunk_rows"], state["max_pending"])
+        self.model_columns = state["model_columns"]
+        self.agent_columns = state["agent_columns"]
+        self._parts = state["parts"]
+        self._closed = state["closed"]
+        self._resumable = state["opened"] and not state["closed"]
+
+    def resume(self) -> None:
+        """Jatka tallennuspisteestä: poista sen jälkeen kirjoitetut palat ja käynnistä säie."""
+        if not self._resumable:
+            return
+        # Tallennuspisteen jälkeen kirjoitetut palat kuuluvat hylättyyn jatkoon
+        suffix = FORMATS[self.fmt]
+        for kind, next_part in self._parts.items():
+            for part in (self.path / kind).glob("part-*" + suffix):
+                if int(part.stem.split("-")[1]) >= next_part:
+                    part.unlink()
+        final = self.path / "model" / ("final" + suffix)
+        if final.exists():
+            final.unlink()
+        self._resumable = False
+        self._thread = threading.Thread(target=self._run, name="result-sink", daemon=True)
+        self._thread.start()
+
+    # --- Sisäiset ---
+    def _put(self, item: tuple) -> None:
+        self._raise_if_failed()
+        if self._thread is None or self._closed:
+            raise RuntimeError("Result sink is not open")
+        self._queue.put(item)
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"Result sink failed: {self._error}") from self._error
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            if self._error is not None:
+                # Virheen jälkeen vain vapautetaan odottajat
+                if item[0] == "flush":
+                    item[1].set()
+                continue
+            kind, payload = item
+            try:
+                if kind == "flush":
+                    self._write_chunk("model")
+                    self._write_chunk("agents")
+                elif kind == "final":
+                    df = pd.DataFrame.from_records([payload], columns=["month", *self.model_columns])
+                    _write_frame(df, self.path / "model" / ("final" + FORMATS[self.fmt]), self.fmt)
+                else:
+                    buffer = self._buffers[kind]
+                    buffer.extend(payload)
+                    if len(buffer) >= self.chunk_rows:
+                        self._write_chunk(kind)
+            except BaseException as exc:  # välitetään simulaatiosäikeelle
+                self._error = exc
+            finally:
+                if kind == "flush":
+                    payload.set()
+
+    def _write_chunk(self, kind: str) -> None:
+        buffer = self._buffers[kind]
+        if not buffer:
+            return
+        if kind == "model":
+            df = pd.DataFrame.from_records(buffer, columns=["month", *self.model_columns])
+        else:
+            df = pd.DataFrame.from_records(buffer, columns=["Step", "AgentID", *self.agent_columns])
+        name = f"part-{self._parts[kind]:05d}{FORMATS[self.fmt]}"
+        _write_frame(df, self.path / kind / name, self.fmt)
+        self._parts[kind] += 1
+        self._buffers[kind] = []
+
+
+def read_results(path: str | Path) -> dict[str, pd.DataFrame]:
+    """Lue suoratoistettu ajo samaan muotoon kuin `EconomyModel.get_results`."""
+    path = Path(path)
+    meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+    fmt = meta["format"]
+    suffix = FORMATS[fmt]
+    model_columns = ["month", *meta["model_columns"]]
+    agent_columns = ["Step", "AgentID", *meta["agent_columns"]]
+
+    model_parts = [_read_frame(p, fmt) for p in sorted((path / "model").glob("part-*" + suffix))]
+    model_df = (
+        pd.concat(model_parts, ignore_index=True)
+        if model_parts
+        else pd.DataFrame(columns=model_columns)
+    )
+    final_path = path / "model" / ("final" + suffix)
+    if final_path.exists():
+        final = _read_frame(final_path, fmt)
+        month = final["month"].iloc[0]
+        if len(model_df) and model_df["month"].iloc[-1] == month:
+            last = model_df.index[-1]
+            for column in final.columns:
+                if pd.notna(final[column].iloc[0]):
+                    model_df.loc[last, column] = final[column].iloc[0]
+        else:
+            model_df = pd.concat([model_df, final], ignore_index=True)
+    model_df = model_df.reindex(columns=model_columns)
+
+    agent_parts = [_read_frame(p, fmt) for p in sorted((path / "agents").glob("part-*" + suffix))]
+    agent_df = (
+        pd.concat(agent_parts, ignore_index=True)
+        if agent_parts
+        else pd.DataFrame(columns=agent_columns)
+    )
+    agent_df = agent_df.set_index(["Step", "AgentID"])
+    return {"model": model_df, "agents": agent_df}
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from dataclasses import replace
+
+from core.config import load_config
+from core.model import EconomyModel
+from experiments.credit_risk import CreditRiskParams, LoanBookSnapshot, simulate_credit_losses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Aja malli ja simuloi pankin lainakannan luottotappiojakauma (yhden tekijän malli)."
+    )
+    parser.add_argument(
+        "--config",
+        type=str,
+        default="config/base.yaml",
+        help="Polku konfiguraatiotiedostoon (oletus: config/base.yaml)",
+    )
+    parser.add_argument(
+        "--months",
+        type=int,
+        default=None,
+        help="Kuukausia ennen tilannekuvaa (oletus: simulation.months tai 120)",
+    )
+    parser.add_argument(
+        "--scenarios",
+        type=int,
+        default=None,
+        help="Skenaarioiden määrä (oletus: credit_risk.scenarios tai 20000)",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Mallin siemen (oletus: 42)")
+
+    args = parser.parse_args()
+
+    cfg = load_config(args.config)
+    params = CreditRiskParams.from_config(cfg)
+    if args.scenarios is not None:
+        params = replace(params, scenarios=args.scenarios)
+    n_months = args.months if args.months is not None else cfg.get("simulation", {}).get("months", 120)
+
+    print(f"Konfiguraatio: {args.config}")
+    print(f"Simulaation pituus ennen tilannekuvaa: {n_months} kuukautta\n")
+
+    random.seed(args.seed)
+    model = EconomyModel(config=cfg, seed=args.seed)
+    model.run_for_months(n_months)
+
+    started = time.perf_counter()
+    snapshot = LoanBookSnapshot.from_model(model)
+    result = simulate_credit_losses(snapshot, params)
+    elapsed = time.perf_counter() - started
+
+    summary = result.summary()
+    print(f"=== Luottotappiot, kuukausi {result.month} ===")
+    print(f"Lainoja: {len(snapshot)}, saldo {snapshot.exposure.sum():,.0f}")
+    print(f"Skenaarioita: {summary['scenarios']} ({elapsed:.2f} s)")
+    print(f"Odotettu tappio: {summary['expected_loss']:,.0f} (analyyttinen {summary['analytic_expected_loss']:,.0f})")
+    print(f"VaR {params.confidence:.1%}: {summary['var']:,.0f}")
+    print(f"ES {params.confidence:.1%}: {summary['es']:,.0f}")
+    print(
+        f"Pääomasuhde: mediaani {summary['capital_ratio_median']:.4f}, "
+        f"häntä {summary['capital_ratio_tail']:.4f} (raja {summary['capital_ratio_min']:.4f})"
+    )
+    print(f"Todennäköisyys alittaa raja: {summary['prob_below_capital_min']:.2%}")
+
+
+if __name__ == "__main__":
+    main()
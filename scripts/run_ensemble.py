@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from core.config import load_config
+from experiments.ensemble import run_ensemble
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Aja saman konfiguraation Monte Carlo -ensemble usealla siemenellä."
+    )
+    parser.add_argument(
+        "--config",
+        type=str,
+        default="config/base.yaml",
+        help="Polku konfiguraatiotiedostoon (oletus: config/base.yaml)",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=None,
+        help="Replikaattien määrä (oletus: ensemble.runs tai 20)",
+    )
+    parser.add_argument(
+        "--root-seed",
+        type=int,
+        default=None,
+        help="Juurisiemen, josta replikaattien siemenet johdetaan (oletus: ensemble.root_seed tai 42)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Työprosessien määrä (oletus: kaikki ytimet)",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Hakemisto, johon vyöt (bands.csv) ja lopputilat (final.csv) tallennetaan",
+    )
+
+    args = parser.parse_args()
+
+    cfg = load_config(args.config)
+    ensemble_cfg = cfg.get("ensemble", {})
+    n_runs = args.runs if args.runs is not None else int(ensemble_cfg.get("runs", 20))
+    root_seed = args.root_seed if args.root_seed is not None else int(ensemble_cfg.get("root_seed", 42))
+    quantiles = tuple(ensemble_cfg.get("quantiles", (0.05, 0.25, 0.5, 0.75, 0.95)))
+    n_months = cfg.get("simulation", {}).get("months", 120)
+
+    print(f"Konfiguraatio: {args.config}")
+    print(f"Replikaatteja: {n_runs} (juurisiemen {root_seed})")
+    print(f"Simulaation pituus: {n_months} kuukautta\n")
+
+    started = time.perf_counter()
+
+    def report(done: int, total: int, seed: int) -> None:
+        elapsed = time.perf_counter() - started
+        print(f"  [{done}/{total}] siemen {seed} valmis ({elapsed:.1f} s)")
+
+    result = run_ensemble(
+        cfg,
+        n_runs=n_runs,
+        root_seed=root_seed,
+        n_months=n_months,
+        workers=args.workers,
+        quantiles=quantiles,
+        progress=report,
+    )
+
+    final = result.final
+    print("\n=== Lopputilan jakauma ===")
+    for metric in ("unemployment_rate", "gini_wealth", "state_balance", "cpi"):
+        if metric not in final.columns:
+            continue
+        values = final[metric]
+        print(
+            f"{metric}: ka {values.mean():.4g}, "
+            f"5 % {values.quantile(0.05):.4g}, 95 % {values.quantile(0.95):.4g}"
+        )
+
+    if args.output:
+        output_dir = Path(args.output)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        result.bands.to_csv(output_dir / "bands.csv")
+        final.to_csv(output_dir / "final.csv")
+        print(f"\nTulokset tallennettu: {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
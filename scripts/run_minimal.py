@@ -87,6 +87,10 @@ def main() -> None:
     print(f"Velka suhteessa BKT:hen: {last['state_debt_to_gdp']:.1%}")
     print(f"Efektiivinen veroprosentti: {last['effective_tax_rate']:.1%}")
 
+    if model.phase_timer.enabled:
+        print("\n=== Vaiheiden ajat (v0.8.3) ===")
+        print(model.phase_timer.format_summary())
+
 
 if __name__ == "__main__":
     main()
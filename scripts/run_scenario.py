@@ -7,6 +7,14 @@ import pandas as pd
 
 from core.config import load_config
 from core.model import EconomyModel
+from output.sink import FORMATS, ColumnarResultSink, read_results
+
+# Yhteenvedon sarakkeet: (sarake, otsikko, muotoilu)
+SUMMARY_COLUMNS = [
+    ("unemployment_rate", "Työttömyysaste", "{:.1%}"),
+    ("gini_wealth", "Gini (varallisuus)", "{:.3f}"),
+    ("state_balance", "Valtion saldo", "{:,.0f} €"),
+]
 
 
 def main() -> None:
@@ -23,7 +31,16 @@ def main() -> None:
         "--output",
         type=str,
         default=None,
-        help="Polku tulosten tallennukseen CSV-muodossa (oletus: ei tallenneta)",
+        help=(
+            "Tulosten tallennus: .csv-pääte = mallitason CSV ajon lopussa, muuten "
+            "hakemisto, johon tulokset suoratoistetaan ajon aikana (oletus: ei tallenneta)"
+        ),
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(FORMATS),
+        default="parquet",
+        help="Suoratoiston tiedostomuoto (oletus: parquet)",
     )
     parser.add_argument(
         "--seed",
@@ -32,29 +49,56 @@ def main() -> None:
         help="Satunnaissiemen (oletus: 42)",
     )
 
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Mittaa kuukausiaskeleen vaiheiden ajat ja tulosta yhteenveto",
+    )
+
     args = parser.parse_args()
 
     cfg = load_config(args.config)
+    if args.profile:
+        cfg.setdefault("simulation", {})["profile_phases"] = True
     n_months = cfg.get("simulation", {}).get("months", 120)
 
     print(f"Konfiguraatio: {args.config}")
     print(f"Siemen: {args.seed}")
     print(f"Simulaation pituus: {n_months} kuukautta\n")
 
+    output_path = Path(args.output) if args.output else None
+    stream = output_path is not None and output_path.suffix.lower() != ".csv"
+
     model = EconomyModel(config=cfg, seed=args.seed)
+    if stream:
+        # v0.8.3: kuukausittaiset rivit kirjoitetaan levylle ajon aikana
+        model.datacollector.attach_sink(ColumnarResultSink(output_path, fmt=args.format))
     model.run_for_months(n_months)
-    results = model.get_results()
+    if stream:
+        model.datacollector.close()
+        results = read_results(output_path)
+    else:
+        results = model.get_results()
     model_df = results["model"]
 
     print("\n=== Simulaatio valmis ===")
-    last = model_df.iloc[-1]
-    print(f"Viimeinen kuukausi: {int(last['month'])}")
-    print(f"Työttömyysaste: {last['unemployment_rate']:.1%}")
-    print(f"Gini (varallisuus): {last['gini_wealth']:.3f}")
-    print(f"Valtion saldo: {last['state_balance']:,.0f} €")
-
-    if args.output:
-        output_path = Path(args.output)
+    print(f"Viimeinen kuukausi: {int(model_df['month'].iloc[-1])}")
+    # Harvemmin kerätyt (output.cadence) tai pois jätetyt sarakkeet: viimeisin
+    # kerätty arvo, tai rivi jätetään pois
+    for column, label, fmt in SUMMARY_COLUMNS:
+        if column not in model_df:
+            continue
+        values = model_df[column].dropna()
+        if not values.empty:
+            print(f"{label}: {fmt.format(values.iloc[-1])}")
+
+    if model.phase_timer.enabled:
+        print("\n=== Vaiheiden ajat ===")
+        print(model.phase_timer.format_summary())
+
+    if stream:
+        print(f"\nTulokset suoratoistettu: {output_path}")
+    elif output_path is not None:
         output_path.parent.mkdir(parents=True, exist_ok=True)
         model_df.to_csv(output_path, index=False)
         print(f"\nTulokset tallennettu: {output_path}")
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+from core.config import load_config
+from experiments.sensitivity import SensitivityStudy, run_study
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Aja globaali herkkyysanalyysi (Sobol/Morris) konfiguraation sensitivity-osion mukaan."
+    )
+    parser.add_argument(
+        "--config",
+        type=str,
+        default="config/base.yaml",
+        help="Polku konfiguraatiotiedostoon (oletus: config/base.yaml)",
+    )
+    parser.add_argument(
+        "--study-dir",
+        type=str,
+        default="results/sensitivity",
+        help="Tutkimushakemisto: välimuisti ja tulokset; sama hakemisto jatkaa keskeytynyttä ajoa",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Työprosessien määrä (oletus: kaikki ytimet)",
+    )
+
+    args = parser.parse_args()
+
+    cfg = load_config(args.config)
+    study = SensitivityStudy.from_config(cfg)
+    n_points = len(study.unit_design())
+
+    print(f"Konfiguraatio: {args.config}")
+    print(f"Menetelmä: {study.method}, parametreja {study.num_parameters}, pisteitä {n_points}")
+    print(f"Mittarit: {', '.join(study.metrics)}\n")
+
+    started = time.perf_counter()
+
+    def report(done: int, total: int) -> None:
+        elapsed = time.perf_counter() - started
+        print(f"  {done}/{total} pistettä valmiina ({elapsed:.1f} s)")
+
+    result = run_study(cfg, study, args.study_dir, workers=args.workers, progress=report)
+
+    print("\n=== Herkkyysindeksit ===")
+    print(result.indices.to_string(float_format=lambda v: f"{v:.3f}"))
+
+    result.indices.to_csv(f"{args.study_dir}/indices.csv")
+    result.outputs.to_csv(f"{args.study_dir}/outputs.csv", index=False)
+    print(f"\nTulokset tallennettu: {args.study_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import pytest
+
+from core.aggregates import AggregateLedger
+from tests.test_bank import _make_model
+
+
+def _ledger(engine: str) -> dict:
+    return {
+        "agents": {"households": 40, "firms": 3},
+        "households": {"death_prob_per_year": 0.2, "birth_rate_per_year": 0.3},
+        "simulation": {"household_engine": engine, "debug_aggregates": True},
+    }
+
+
+@pytest.mark.parametrize("engine", ["agents", "vectorized"])
+def test_ledger_matches_full_rescan_over_run(engine: str) -> None:
+    model = _make_model(_ledger(engine))
+    model.run_for_months(36)  # debug_aggregates tarkistaa joka kuukausi
+
+    expected = AggregateLedger.rescan(model)
+    assert {key: getattr(model.aggregates, key) for key in expected} == expected
+
+
+def test_verify_reports_drift() -> None:
+    model = _make_model(_ledger("agents"))
+    model.aggregates.employed += 1
+
+    with pytest.raises(RuntimeError, match="employed"):
+        model.aggregates.verify(model)
@@ -52,7 +52,7 @@ def _base_config() -> dict[str, dict[str, float | int]]:
     }
 
 
-def _make_model(overrides: dict | None = None) -> EconomyModel:
+def _make_config(overrides: dict | None = None) -> dict:
     cfg = deepcopy(_base_config())
     if overrides:
         for section, data in overrides.items():
@@ -60,7 +60,11 @@ def _make_model(overrides: dict | None = None) -> EconomyModel:
                 cfg[section].update(data)
             else:
                 cfg[section] = data
-    return EconomyModel(config=cfg, seed=123)
+    return cfg
+
+
+def _make_model(overrides: dict | None = None) -> EconomyModel:
+    return EconomyModel(config=_make_config(overrides), seed=123)
 
 
 def test_collect_payments_reduces_balance() -> None:
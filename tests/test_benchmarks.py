@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.scaling import compare, complexity_exponents, scaled_config
+from tests.test_bank import _base_config
+
+
+def _result(n: int, step_s: float, phases: dict[str, float]) -> dict:
+    return {"households": n, "step_s": step_s, "months_per_s": 1.0 / step_s, "phase_s": phases}
+
+
+def test_scaled_config_keeps_household_to_firm_ratio() -> None:
+    cfg = scaled_config(_base_config(), 10_000, engine="vectorized")
+    assert cfg["agents"] == {"households": 10_000, "firms": 300}
+    assert cfg["simulation"]["household_engine"] == "vectorized"
+    assert cfg["simulation"]["profile_phases"] is True
+    assert cfg["output"]["agent_reporters"] == {"enabled": False}
+
+
+def test_exponents_and_regression_detection() -> None:
+    sizes = [100, 1_000, 10_000]
+    baseline = {"results": [_result(n, n * 1e-5, {"linear": n * 1e-6, "quad": n * 1e-9}) for n in sizes]}
+    baseline["exponents"] = complexity_exponents(baseline["results"])
+    assert baseline["exponents"]["linear"] == pytest.approx(1.0)
+    assert baseline["exponents"]["quad"] == pytest.approx(1.0)
+
+    current = {"results": [_result(n, n * 1e-5, {"linear": n * 1e-6, "quad": n**2 * 1e-11}) for n in sizes]}
+    current["results"][-1]["months_per_s"] /= 2
+    current["exponents"] = complexity_exponents(current["results"])
+    assert current["exponents"]["quad"] == pytest.approx(2.0)
+
+    regressions = compare(current, baseline)
+    assert any("10,000 households" in line for line in regressions)
+    assert any("phase quad" in line for line in regressions)
+    assert not any("phase linear" in line for line in regressions)
+
+
+def test_microbenchmarks_run_on_tiny_fixtures() -> None:
+    from benchmarks.micro import BENCHMARKS, build_model, measure, synthetic_loan_book
+
+    model = build_model(50, seed=1)
+    before = model.bank.total_loans
+    synthetic_loan_book(model, 200, seed=1)
+    assert len(model.bank.loans) >= 200
+    assert model.bank.total_loans > before
+
+    for name in BENCHMARKS:
+        result = measure(name, 200, repeat=1, seed=1)
+        assert result.size == 200
+        assert result.best_s >= 0.0
+        assert result.peak_alloc_bytes >= 0
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.soak import bounded_violations, structure_sizes
+from core.events import EVENT_KINDS
+from core.model import EconomyModel
+from tests.test_bank import _make_config
+
+
+def _run(bounded: bool, engine: str, months: int = 96, rare_events: str = "monthly") -> EconomyModel:
+    cfg = _make_config(
+        {
+            "agents": {"households": 60, "firms": 3},
+            "simulation": {
+                "household_engine": engine,
+                "bounded_memory": bounded,
+                "history_months": 24,
+                "rare_events": rare_events,
+            },
+            "households": {
+                "initial_age_min": 20,
+                "initial_age_max": 75,
+                "max_age": 80,
+                "death_prob_per_year": 0.1,
+                "birth_rate_per_year": 0.05,
+                "cash_floor": 2000.0,
+                "cash_target": 4000.0,
+                "propensity_to_consume": 0.9,
+            },
+        }
+    )
+    random.seed(5)
+    model = EconomyModel(config=cfg, seed=5)
+    model.run_for_months(months)
+    return model
+
+
+@pytest.mark.parametrize("engine", ["agents", "vectorized"])
+def test_bounded_memory_keeps_results_and_bounds_structures(engine: str) -> None:
+    full = _run(False, engine)
+    bounded = _run(True, engine)
+
+    # Sama simulaatio: rajattu tila pitää vain viimeiset 24 kuukautta muistissa
+    expected = full.get_results()["model"].tail(24).reset_index(drop=True)
+    actual = bounded.get_results()["model"]
+    pd.testing.assert_frame_equal(actual, expected, rtol=1e-9)
+    assert actual["month"].min() == full.month - 23
+
+    assert full.household_archive
+    sizes = structure_sizes(bounded)
+    assert sizes["households_archived"] == 0
+    assert sizes["mesa_agents"] < structure_sizes(full)["mesa_agents"]
+    assert sizes["population_rows"] < full.household_population.size
+    assert sizes["bank_loan_history"] == 24
+    assert all(loan.status == "active" for loan in bounded.bank.loans)
+    assert all(loan.status == "active" for loan in full.bank.loans)
+    assert sizes["bank_loan_archive"] == 0 and len(full.bank.loan_archive) > 0
+
+    agents = bounded.get_results()["agents"]
+    assert agents.index.get_level_values("Step").min() == full.month - 23
+
+    # Kuolleiden rivit on käytetty uudelleen: jokainen elävä osoittaa omaan riviinsä
+    population = bounded.household_population
+    for hh in bounded.households:
+        assert population.agents[hh._row] is hh
+    assert np.array_equal(
+        np.sort(population.alive_rows()), np.sort([hh._row for hh in bounded.households])
+    )
+
+
+@pytest.mark.parametrize("engine", ["agents", "vectorized"])
+def test_event_calendar_forgets_dead_households(engine: str) -> None:
+    model = _run(True, engine, months=48, rare_events="calendar")
+    calendar = model.event_calendar
+    for month in range(12):
+        # Jokainen muutos arpoo kuolemakellot uudelleen ja vanhentaa edelliset
+        model.apply_config_overrides({"households.death_prob_per_year": 0.1 + 0.01 * (month % 2)})
+        model.run_for_months(1)
+
+    # Kalenteri ei pidä kuolleita agentteja elossa, ja korit siivotaan
+    assert set(calendar._agents) == {hh.unique_id for hh in model.households}
+    assert model.household_archive == []
+    pending = structure_sizes(model)["event_calendar"]
+    assert 0 < pending <= 2 * len(model.households) * len(EVENT_KINDS)
+    assert pending == sum(len(bucket) for bucket in calendar._buckets.values())
+
+
+def test_bounded_violations_flags_growth_beyond_population() -> None:
+    samples = pd.DataFrame(
+        {
+            "month": [100, 200, 300, 400],
+            "rss_bytes": [1, 1, 1, 1],
+            "households_live": [100, 100, 110, 110],
+            "bank_loans": [50, 55, 60, 60],
+            "collector_model_rows": [100, 200, 300, 400],
+        }
+    )
+    violations = bounded_violations(samples)
+    assert len(violations) == 1
+    assert violations[0].startswith("collector_model_rows")
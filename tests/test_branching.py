@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import random
+
+import pandas as pd
+import pytest
+
+from core.model import EconomyModel
+from experiments.branching import run_branches
+from tests.test_bank import _make_config
+
+
+def _config(overrides: dict | None = None) -> dict:
+    return _make_config({"agents": {"households": 30, "firms": 3}, **(overrides or {})})
+
+
+@pytest.mark.parametrize("method", ["fork", "clone"])
+def test_branches_continue_from_shared_burn_in(method: str) -> None:
+    random.seed(4)
+    reference = EconomyModel(config=_config(), seed=4)
+    reference.run_for_months(8)
+    expected = reference.get_results()["model"]
+
+    result = run_branches(
+        _config(),
+        branches={
+            "baseline": {},
+            "tax_hike": {"taxes.income_brackets": [[0.0, 1e12, 0.5]]},
+        },
+        burn_in_months=5,
+        horizon_months=8,
+        seed=4,
+        workers=2,
+        method=method,
+    )
+
+    pd.testing.assert_frame_equal(result.prefix, expected.iloc[:5])
+    baseline = result.branches["baseline"]
+    assert list(baseline["month"]) == [6, 7, 8]
+    pd.testing.assert_frame_equal(baseline, expected.iloc[5:].reset_index(drop=True))
+
+    balance = result.side_by_side("state_balance")
+    assert list(balance.columns) == ["baseline", "tax_hike"]
+    assert list(balance.index) == list(range(1, 9))
+    assert (balance.loc[:5, "baseline"] == balance.loc[:5, "tax_hike"]).all()
+    assert balance.loc[8, "tax_hike"] > balance.loc[8, "baseline"]
+
+
+def test_overrides_reject_construction_only_parameters() -> None:
+    model = EconomyModel(config=_config(), seed=1)
+    with pytest.raises(ValueError):
+        model.apply_config_overrides({"agents.households": 10})
+
+    config = _config()
+    model = EconomyModel(config=config, seed=1)
+    model.apply_config_overrides({"banking.loan_rate_base_annual": 0.05, "taxes.corporate_tax_rate": 0.3})
+    assert model.bank.loan_rate_base_annual == 0.05
+    assert model.state.corporate_tax_rate == 0.3
+    assert config["banking"]["loan_rate_base_annual"] != 0.05
+
+
+def test_debt_service_overrides_reach_agent_engine_households() -> None:
+    config = _config({"simulation": {"household_engine": "agents"}})
+    model = EconomyModel(config=config, seed=1)
+    model.apply_config_overrides(
+        {"households.debt_service_income_share": 0.5, "households.debt_service_buffer_multiplier": 2.0}
+    )
+    hh = list(model.households)[0]
+    hh.cash = 10_000.0
+    hh.debt_service_reserve = 0.0
+    hh._allocate_debt_service_share(1_000.0)
+    assert hh.debt_service_reserve == pytest.approx(500.0)
+
+    model.bank.loans.add(hh, "household", 12_000.0, 0.0, 12)
+    hh.rebalance_debt_service_reserve()
+    assert hh.debt_service_reserve == pytest.approx(2.0 * model.bank.expected_payment_for(hh))
+
+
+def test_clone_branches_leave_base_results_untouched(tmp_path) -> None:
+    pytest.importorskip("pyarrow")
+    import threading
+
+    from output.sink import read_results
+
+    config = _config({"output": {"cadence": {"state": "final"}, "sink": {"path": str(tmp_path / "run")}}})
+    sinks_before = sum(t.name == "result-sink" for t in threading.enumerate())
+    result = run_branches(
+        config,
+        branches={"a": {}, "b": {}},
+        burn_in_months=3,
+        horizon_months=5,
+        seed=4,
+        workers=1,
+        method="clone",
+    )
+
+    assert (tmp_path / "run" / "model" / "final.parquet").exists()
+    pd.testing.assert_frame_equal(read_results(tmp_path / "run")["model"], result.prefix, check_dtype=False)
+    # Vain perusmallin oma kirjoitussäie; haarat eivät avaa suoratoistoa uudelleen
+    assert sum(t.name == "result-sink" for t in threading.enumerate()) == sinks_before + 1
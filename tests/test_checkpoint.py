@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import random
+
+import pandas as pd
+import pytest
+
+from core.model import EconomyModel
+from tests.test_bank import _make_config
+
+
+def _config(engine: str) -> dict:
+    return _make_config(
+        {
+            "agents": {"households": 40, "firms": 3},
+            "simulation": {"household_engine": engine},
+            "households": {"death_prob_per_year": 0.5, "birth_rate_per_year": 0.5, "initial_age_max": 80},
+        }
+    )
+
+
+@pytest.mark.parametrize("engine", ["agents", "vectorized"])
+def test_restored_run_continues_bit_for_bit(tmp_path, engine: str) -> None:
+    random.seed(5)
+    reference = EconomyModel(config=_config(engine), seed=21)
+    reference.run_for_months(12)
+
+    random.seed(5)
+    interrupted = EconomyModel(config=_config(engine), seed=21)
+    interrupted.run_for_months(6)
+    path = interrupted.save_checkpoint(tmp_path / "month_6.pkl.gz")
+    # Alkuperäinen ajo jatkuu eri suuntaan; palautuksen ei pidä välittää
+    interrupted.run_for_months(3)
+    random.seed(999)
+
+    restored = EconomyModel.load_checkpoint(path)
+    assert restored.month == 6
+    restored.run_for_months(6)
+
+    expected, actual = reference.get_results(), restored.get_results()
+    pd.testing.assert_frame_equal(actual["model"], expected["model"])
+    pd.testing.assert_frame_equal(actual["agents"], expected["agents"])
+    assert restored.steps == reference.steps
+
+
+def test_run_for_months_writes_periodic_checkpoints(tmp_path) -> None:
+    cfg = _config("agents")
+    cfg["simulation"]["checkpoint_every_months"] = 2
+    cfg["simulation"]["checkpoint_path"] = str(tmp_path / "run_{month:03d}.pkl")
+    model = EconomyModel(config=cfg, seed=1)
+    model.run_for_months(5)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["run_002.pkl", "run_004.pkl"]
+    assert EconomyModel.load_checkpoint(tmp_path / "run_004.pkl").month == 4
+
+
+def test_restored_run_resumes_streamed_results(tmp_path) -> None:
+    pytest.importorskip("pyarrow")
+    from output.sink import read_results
+
+    cfg = _config("agents")
+    random.seed(5)
+    reference = EconomyModel(config=cfg, seed=21)
+    reference.run_for_months(8)
+
+    cfg = _config("agents")
+    cfg["output"] = {"sink": {"path": str(tmp_path / "run"), "chunk_rows": 1}}
+    random.seed(5)
+    interrupted = EconomyModel(config=cfg, seed=21)
+    interrupted.run_for_months(4)
+    path = interrupted.save_checkpoint(tmp_path / "month_4.pkl")
+    # Hylätty jatko kirjoittaa paloja ja lopputilan, jotka palautuksen pitää poistaa
+    interrupted.run_for_months(2)
+    interrupted.datacollector.close()
+
+    restored = EconomyModel.load_checkpoint(path)
+    restored.run_for_months(4)
+    restored.datacollector.close()
+
+    expected = reference.get_results()["model"]
+    actual = read_results(tmp_path / "run")["model"]
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
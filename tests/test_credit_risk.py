@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from benchmarks.micro import build_model, synthetic_loan_book
+from experiments.credit_risk import (
+    CreditRiskParams,
+    LoanBookSnapshot,
+    losses_given_default,
+    probabilities_of_default,
+    simulate_credit_losses,
+)
+
+
+@pytest.fixture(scope="module")
+def snapshot() -> LoanBookSnapshot:
+    model = build_model(200, seed=3)
+    synthetic_loan_book(model, 3_000, seed=3)
+    households = list(model.households)
+    for i, hh in enumerate(households):
+        hh.employed = i % 5 != 0
+        hh.wage = 3_000.0 + 40.0 * i
+    return LoanBookSnapshot.from_model(model)
+
+
+def test_bucketed_and_per_loan_simulations_agree(snapshot: LoanBookSnapshot) -> None:
+    params = CreditRiskParams(scenarios=4_000, seed=1)
+    buckets = simulate_credit_losses(snapshot, replace(params, method="buckets"))
+    loans = simulate_credit_losses(snapshot, replace(params, method="loans"))
+
+    assert buckets.expected_loss == pytest.approx(buckets.analytic_expected_loss, rel=0.05)
+    assert loans.expected_loss == pytest.approx(loans.analytic_expected_loss, rel=0.05)
+    assert buckets.value_at_risk == pytest.approx(loans.value_at_risk, rel=0.15)
+    assert buckets.expected_shortfall >= buckets.value_at_risk >= buckets.expected_loss
+
+
+def test_correlation_fattens_the_tail(snapshot: LoanBookSnapshot) -> None:
+    low = simulate_credit_losses(snapshot, CreditRiskParams(scenarios=4_000, asset_correlation=0.0))
+    high = simulate_credit_losses(snapshot, CreditRiskParams(scenarios=4_000, asset_correlation=0.4))
+    assert high.expected_loss == pytest.approx(low.expected_loss, rel=0.1)
+    assert high.value_at_risk > 2 * low.value_at_risk
+
+
+def test_pd_buckets_and_mortgage_collateral(snapshot: LoanBookSnapshot) -> None:
+    params = CreditRiskParams(horizon_months=12)
+    pd_ = probabilities_of_default(snapshot, params)
+    table = np.array([*params.household_pd, params.unemployed_pd])
+    assert np.all(np.isclose(pd_[:, None], table[None, :]).any(axis=1))
+    assert np.allclose(pd_[~snapshot.employed], params.unemployed_pd)
+
+    lgd = losses_given_default(snapshot, params)
+    assert snapshot.is_mortgage.all() and np.all((lgd >= 0.0) & (lgd <= 1.0))
+    covered = (1.0 - params.collateral_haircut) * snapshot.collateral >= snapshot.exposure
+    assert np.all(lgd[covered] == 0.0)
+
+
+def test_capital_ratio_distribution_against_minimum(snapshot: LoanBookSnapshot) -> None:
+    rich = replace(snapshot, equity=snapshot.total_loans)
+    poor = replace(snapshot, equity=snapshot.capital_ratio_min * snapshot.total_loans)
+    params = CreditRiskParams(scenarios=2_000, method="buckets")
+    assert simulate_credit_losses(rich, params).prob_below_capital_min == 0.0
+    assert simulate_credit_losses(poor, params).prob_below_capital_min > 0.5
+
+
+def test_invalid_parameters_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        CreditRiskParams(asset_correlation=1.0)
+    with pytest.raises(ValueError):
+        CreditRiskParams(household_pd=(0.01, 0.02))
+    with pytest.raises(ValueError):
+        CreditRiskParams(method="copula")
+    assert CreditRiskParams.from_config({"credit_risk": {"scenarios": 10, "unknown": 1}}).scenarios == 10
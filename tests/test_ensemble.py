@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from experiments.ensemble import aggregate_bands, derive_seeds, run_ensemble
+from tests.test_bank import _make_config
+
+
+def _config() -> dict:
+    return _make_config({"agents": {"households": 15, "firms": 2}})
+
+
+def test_derived_seeds_are_reproducible_and_distinct() -> None:
+    seeds = derive_seeds(123, 5)
+    assert seeds == derive_seeds(123, 5)
+    assert len(set(seeds)) == 5
+    assert derive_seeds(123, 3) == seeds[:3]
+
+
+def test_ensemble_aggregates_bands_and_is_independent_of_worker_count() -> None:
+    serial = run_ensemble(_config(), n_runs=3, root_seed=9, n_months=4, workers=1)
+    pooled = run_ensemble(_config(), n_runs=3, root_seed=9, n_months=4, workers=2)
+
+    pd.testing.assert_frame_equal(serial.bands, pooled.bands)
+    pd.testing.assert_frame_equal(serial.final, pooled.final)
+
+    assert list(serial.bands.index) == [1, 2, 3, 4]
+    stats = set(serial.bands["unemployment_rate"].columns)
+    assert {"mean", "std", "q05", "q50", "q95"} <= stats
+    assert len(serial.final) == 3
+    assert list(serial.final["seed"]) == serial.seeds
+    mean = serial.mean()["population"]
+    expected = sum(run["population"] for run in serial.runs) / 3
+    assert mean.tolist() == expected.tolist()
+
+
+def test_band_labels_keep_fractional_quantiles_apart() -> None:
+    runs = [pd.DataFrame({"month": [1, 2], "population": [float(i), float(i + 1)]}) for i in range(5)]
+    bands = aggregate_bands(runs, quantiles=(0.0, 0.005, 0.02, 0.025, 0.975))
+    assert list(bands["population"].columns) == ["mean", "std", "q00", "q00.5", "q02", "q02.5", "q97.5"]
+    assert bands[("population", "q00")].tolist() == [0.0, 1.0]
+
+    with pytest.raises(ValueError):
+        aggregate_bands(runs, quantiles=(0.05, 0.0500000001))
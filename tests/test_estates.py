@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import pytest
+
+from tests.test_bank import _make_model
+
+
+def _estates(inheritance: str = "uniform") -> dict:
+    return {"agents": {"households": 20, "firms": 3}, "households": {"inheritance": inheritance}}
+
+
+def test_single_death_matches_per_death_rule() -> None:
+    model = _make_model(_estates())
+    deceased, *others = list(model.households)
+    deceased.cash = 9_500.0
+    estate = deceased.net_worth
+    before = {hh.unique_id: hh.cash for hh in others}
+
+    deceased.die()
+    assert model.estates.pending() == pytest.approx(estate)
+    assert all(hh.cash == before[hh.unique_id] for hh in others)
+
+    assert model.estates.settle() == pytest.approx(estate)
+    for hh in others:
+        assert hh.cash == pytest.approx(before[hh.unique_id] + estate / len(others))
+    assert model.estates.pending() == 0.0
+
+
+def test_month_of_deaths_transfers_total_positive_net_worth() -> None:
+    model = _make_model(_estates())
+    households = list(model.households)
+    households[0].cash = 4_000.0
+    households[1].cash = 6_000.0
+    households[2].debt += households[2].net_worth + 1_000.0  # negatiivinen pesä ei siirry
+    estates = households[0].net_worth + households[1].net_worth
+    survivors = households[3:]
+    total_before = sum(hh.cash for hh in survivors)
+
+    for hh in households[:3]:
+        hh.die()
+    model.estates.settle()
+
+    assert sum(hh.cash for hh in survivors) == pytest.approx(total_before + estates)
+    assert model.estates.total_settled == pytest.approx(estates)
+
+
+def test_children_inherit_when_targeted() -> None:
+    model = _make_model(_estates("children"))
+    parent = next(hh for hh in model.households if hh.num_children == 0)
+    parent.num_children = 1
+    parent.household_size += 1
+    parent._child_leaves_home()
+    child = parent.heirs[0]
+    others = [hh for hh in model.households if hh is not parent and hh is not child]
+    before = {hh.unique_id: hh.cash for hh in others}
+    child_cash = child.cash
+
+    parent.cash = 3_000.0
+    estate = parent.net_worth
+    parent.die()
+    model.estates.settle()
+
+    assert child.cash == pytest.approx(child_cash + estate)
+    assert all(hh.cash == before[hh.unique_id] for hh in others)
+
+
+def test_targeted_estate_without_living_heirs_is_pooled() -> None:
+    model = _make_model(_estates("children"))
+    parent, heir, *others = list(model.households)
+    parent.heirs.append(heir)
+    parent.cash = 2_000.0
+    estate_total = parent.net_worth + max(0.0, heir.net_worth)
+    heir.die()
+    before = sum(hh.cash for hh in others)
+    parent.die()
+    model.estates.settle()
+    assert sum(hh.cash for hh in others) == pytest.approx(before + estate_total)
+
+
+def test_unknown_inheritance_mode_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        _make_model(_estates("eldest"))
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pytest
+
+from tests.test_bank import _make_model
+
+
+def _events(mode: str, engine: str = "vectorized", households: int = 1000) -> dict:
+    return {
+        "agents": {"households": households, "firms": 10},
+        "simulation": {"household_engine": engine, "rare_events": mode},
+        "households": {
+            "initial_age_min": 20,
+            "initial_age_max": 60,
+            "max_age": 200,
+            "death_prob_per_year": 0.36,
+            "birth_rate_per_year": 0.12,
+        },
+    }
+
+
+def test_waiting_times_are_geometric() -> None:
+    random.seed(4)
+    model = _make_model(_events("calendar", households=10))
+    agents = list(model.households) * 2000
+    waits = model.event_calendar._waiting_times("death", agents, 0, 0.05, 0)
+    assert waits.min() >= 1
+    assert np.mean(waits) == pytest.approx(1 / 0.05, rel=0.05)
+    assert np.mean(waits == 1) == pytest.approx(0.05, abs=0.01)
+
+
+@pytest.mark.parametrize("engine", ["agents", "vectorized"])
+def test_calendar_matches_monthly_event_rates(engine: str) -> None:
+    counts = {}
+    for mode in ("monthly", "calendar"):
+        random.seed(4)
+        model = _make_model(_events(mode, engine))
+        model.run_for_months(12)
+        counts[mode] = (len(model.household_archive), model.aggregates.household_size_sum)
+    # ~1000 * 0.03 * 12 = 300 kuolemaa
+    assert counts["calendar"][0] == pytest.approx(counts["monthly"][0], rel=0.2)
+    assert counts["calendar"][1] == pytest.approx(counts["monthly"][1], rel=0.1)
+
+
+def test_only_due_households_are_touched() -> None:
+    random.seed(4)
+    model = _make_model(_events("calendar"))
+    model.run_for_months(3)
+    due = model.event_calendar.due("death")
+    # p = 3 % kuukaudessa: noin 30 kotitaloutta, ei koko väestöä
+    assert 0 < len(due) < 80
+
+
+def test_probability_change_reschedules_pending_events() -> None:
+    random.seed(4)
+    model = _make_model(_events("calendar"))
+    model.run_for_months(3)
+    model.apply_config_overrides({"households.death_prob_per_year": 0.0})
+    deaths_before = len(model.household_archive)
+    model.run_for_months(12)
+    assert len(model.household_archive) == deaths_before
+
+    model.apply_config_overrides({"households.death_prob_per_year": 2.4})
+    model.run_for_months(1)
+    # p = 20 %: noin viidesosa kuolee heti seuraavassa kuussa
+    died = len(model.household_archive) - deaths_before
+    assert died == pytest.approx(0.2 * len(model.households) / 0.8, rel=0.25)
+
+
+def test_unknown_rare_events_mode_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        _make_model({"simulation": {"rare_events": "poisson"}})
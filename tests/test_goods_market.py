@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from core.model import EconomyModel
+from tests.test_bank import _make_model
+
+
+def _goods(routing: str = "random", engine: str = "agents") -> dict:
+    return {
+        "agents": {"households": 30, "firms": 4},
+        "simulation": {"household_engine": engine},
+        "goods": {"routing": routing},
+        "taxes": {"vat_rate": 0.24},
+    }
+
+
+def _priced(model: EconomyModel) -> EconomyModel:
+    for firm, price in zip(model.firms, (12.0, 8.0, 10.0, 9.0)):
+        firm.price = price
+    return model
+
+
+def _consume(model: EconomyModel) -> float:
+    if model.household_engine == "vectorized":
+        return model.household_population.consume()
+    return sum(hh.consume() for hh in model.households)
+
+
+@pytest.mark.parametrize("routing", ["random", "cheapest"])
+@pytest.mark.parametrize("engine", ["agents", "vectorized"])
+def test_sales_and_vat_are_settled_consistently(routing: str, engine: str) -> None:
+    model = _priced(_make_model(_goods(routing, engine)))
+    for firm in model.firms:
+        firm.inventory = 50.0  # osa kysynnästä jää täyttämättä
+    cash_before = sum(hh.cash for hh in model.households)
+    vat_before = model.state.vat_revenue
+
+    net = _consume(model)
+    assert model.state.vat_revenue == vat_before
+    model.goods_market.settle()
+
+    spent = cash_before - sum(hh.cash for hh in model.households)
+    assert spent > 0
+    assert sum(f.revenue_this_month for f in model.firms) == pytest.approx(spent)
+    assert model.state.vat_revenue - vat_before == pytest.approx(spent * 0.24)
+    assert net == pytest.approx(spent * 0.76)
+    assert all(f.inventory >= -1e-9 for f in model.firms)
+
+
+@pytest.mark.parametrize("engine", ["agents", "vectorized"])
+def test_cheapest_routing_fills_cheapest_firms_first(engine: str) -> None:
+    model = _priced(_make_model(_goods("cheapest", engine)))
+    cheapest, second, third, priciest = sorted(model.firms, key=lambda f: f.price)
+    cheapest.inventory = 100.0
+    second.inventory = 100.0
+    third.inventory = 1e9
+    priciest.inventory = 1e9
+
+    _consume(model)
+
+    assert cheapest.inventory == pytest.approx(0.0, abs=1e-6)
+    assert second.inventory == pytest.approx(0.0, abs=1e-6)
+    assert third.revenue_this_month > 0
+    assert priciest.revenue_this_month == 0.0
+
+
+def test_engines_sell_the_same_total_with_cheapest_routing() -> None:
+    totals = []
+    for engine in ("agents", "vectorized"):
+        model = _priced(_make_model(_goods("cheapest", engine)))
+        for firm, inventory in zip(model.firms, (40.0, 60.0, 80.0, 100.0)):
+            firm.inventory = inventory
+        _consume(model)
+        totals.append(sum(f.revenue_this_month for f in model.firms))
+    assert totals[0] == pytest.approx(totals[1])
+
+
+def test_clear_without_alive_firms_spends_nothing() -> None:
+    model = _priced(_make_model(_goods(engine="vectorized")))
+    for firm in model.firms:
+        firm.alive = False
+    spent = model.goods_market.clear(model.household_population, np.arange(3), np.ones(3))
+    assert np.array_equal(spent, np.zeros(3))
+
+
+def test_unknown_routing_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        _make_model(_goods("auction"))
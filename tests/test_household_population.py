@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from tests.test_bank import _make_model
+
+
+def _population(n_households: int = 20, engine: str = "vectorized") -> dict:
+    return {"agents": {"households": n_households, "firms": 3}, "simulation": {"household_engine": engine}}
+
+
+def test_household_view_reads_and_writes_population_columns() -> None:
+    model = _make_model(_population())
+    population = model.household_population
+    hh = model.households[3]
+
+    hh.cash = 1234.5
+    hh.employed = False
+    hh.age += 1
+
+    assert population.cash[hh._row] == 1234.5
+    assert not population.employed[hh._row]
+    assert population.age[hh._row] == hh.age
+    assert isinstance(hh.cash, float)
+    assert population.employer_id[hh._row] == -1 or hh.employer is not None
+
+
+def test_vectorized_consumption_settles_firm_sales_and_vat_once() -> None:
+    model = _make_model(_population())
+    population = model.household_population
+    for firm in model.firms:
+        firm.inventory = 1e9
+    model.vat_rate = 0.24
+
+    cash_before = population.column("cash").sum()
+    revenue_before = sum(f.revenue_this_month for f in model.firms)
+    vat_before = model.state.vat_revenue
+
+    net = population.consume()
+    # v0.8.3: ALV tilitetään kerran kotitalousvaiheen lopussa
+    assert model.state.vat_revenue == vat_before
+    model.goods_market.settle()
+
+    spent = cash_before - population.column("cash").sum()
+    assert spent > 0
+    assert sum(f.revenue_this_month for f in model.firms) - revenue_before == pytest.approx(spent)
+    assert model.state.vat_revenue - vat_before == pytest.approx(spent * 0.24)
+    assert net == pytest.approx(spent * 0.76)
+
+
+def test_vectorized_engine_runs_and_keeps_reserves_within_cash() -> None:
+    model = _make_model(_population(n_households=50))
+    model.run_for_months(24)
+
+    population = model.household_population
+    alive = population.column("alive")
+    assert alive.any()
+    reserve = population.column("debt_service_reserve")[alive]
+    cash = population.column("cash")[alive]
+    assert np.all(reserve <= np.maximum(cash, 0.0) + 1e-9)
+    assert len(model.households) == model.aggregates.population
+
+
+@pytest.mark.parametrize("engine", ["agents", "vectorized"])
+def test_dead_households_are_compacted_into_archive(engine: str) -> None:
+    model = _make_model(_population(n_households=60, engine=engine))
+    model.death_prob_per_year = 6.0  # ~50 % kuolee kuukaudessa
+    model.run_for_months(3)
+
+    assert model.household_archive
+    assert all(hh.alive for hh in model.households)
+    assert all(not hh.alive for hh in model.household_archive)
+    assert len(model.households) + len(model.household_archive) == model.household_population.size
+    assert model.household_population.alive_rows().size == len(model.households)
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import pickle
+
+import pytest
+
+from core.model import EconomyModel
+from markets.labor import EmployeeRoster
+from tests.test_bank import _make_model
+
+
+def _with_layoffs(model: EconomyModel) -> EconomyModel:
+    # Osa yrityksistä irtisanoo, osa palkkaa; kahdella sama palkka
+    for firm, wage in zip(model.firms, (2600.0, 2400.0, 2600.0, 2200.0, 2500.0)):
+        firm.wage_level = wage
+    for hh in list(model.households)[::3]:
+        if hh.employer is not None:
+            hh.employer.employees.discard(hh)
+        hh.lose_job()
+    return model
+
+
+def _reference_matching(model: EconomyModel) -> None:
+    """Aiempi listapohjainen sääntö (v0.7), vertailukohdaksi."""
+    for firm in model.firms:
+        if firm.alive:
+            firm._update_labor_demand()
+            firm._update_wage_level()
+    pool = []
+    for firm in model.firms:
+        if firm.alive and len(firm.employees) > firm.target_employees:
+            for employee in model.random.sample(list(firm.employees), len(firm.employees) - firm.target_employees):
+                employee.lose_job()
+                firm.employees.remove(employee)
+                pool.append(employee)
+    for hh in model.households:
+        if hh.alive and not hh.employed and hh not in pool:
+            pool.append(hh)
+    model.random.shuffle(pool)
+    vacancies = []
+    for firm in model.firms:
+        if firm.alive:
+            vacancies.extend((firm, firm.wage_level) for _ in range(firm.target_employees - len(firm.employees)))
+    vacancies.sort(key=lambda x: x[1], reverse=True)
+    for job_seeker in pool:
+        if not vacancies:
+            break
+        firm, wage = vacancies.pop(0)
+        job_seeker.employed = True
+        job_seeker.employer = firm
+        job_seeker.wage = wage
+        firm.employees.append(job_seeker)
+
+
+def _outcome(model: EconomyModel) -> dict:
+    return {
+        hh.unique_id: (getattr(hh.employer, "unique_id", None), hh.wage, hh.employed)
+        for hh in model.households
+    }
+
+
+def test_matching_matches_reference_rule() -> None:
+    model = _with_layoffs(_make_model({"agents": {"households": 80, "firms": 5}}))
+    reference = pickle.loads(pickle.dumps(model))
+    model._run_labor_market()
+    _reference_matching(reference)
+
+    assert _outcome(model) == _outcome(reference)
+    for firm, ref_firm in zip(model.firms, reference.firms):
+        assert [hh.unique_id for hh in firm.employees] == [hh.unique_id for hh in ref_firm.employees]
+    assert model.labor_market.last_hired > 0
+    assert not any(hh.job_seeker for hh in model.households)
+
+
+def test_highest_wage_vacancies_are_filled_first() -> None:
+    model = _with_layoffs(_make_model({"agents": {"households": 80, "firms": 5}}))
+    for firm in model.firms:
+        firm._update_labor_demand = lambda: None
+        firm._update_wage_level = lambda: None
+        firm.target_employees = len(firm.employees)
+    low, high = model.firms[3], model.firms[0]
+    low.target_employees += 50
+    high.target_employees += 2
+    staff_before = set(high.employees)
+    model._run_labor_market()
+    assert len(high.employees) == high.target_employees
+    hires = [hh for hh in high.employees if hh not in staff_before]
+    assert len(hires) == 2 and all(hh.wage == high.wage_level for hh in hires)
+    assert len(low.employees) > low.target_employees - 50
+
+
+def test_roster_keeps_order_and_rejects_unknown_removal() -> None:
+    model = _with_layoffs(_make_model({"agents": {"households": 80, "firms": 5}}))
+    a, b, c = list(model.households)[:3]
+    roster = EmployeeRoster([a, b])
+    roster.append(c)
+    roster.append(a)  # ei kaksoiskappaletta
+    roster.remove(b)
+    assert list(roster) == [a, c] and len(roster) == 2
+    assert b not in roster
+    with pytest.raises(ValueError):
+        roster.remove(b)
+    roster.discard(b)
+    roster.reverse()
+    assert list(roster) == [c, a]
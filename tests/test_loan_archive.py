@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from collections import deque
+
+import numpy as np
+
+from tests.test_bank import _make_model
+from tests.test_loan_book import _book_with_shortfalls
+
+
+def test_closed_loans_move_to_archive_each_month() -> None:
+    model = _book_with_shortfalls()
+    bank = model.bank
+    model.month = 7
+    bank.step()
+
+    book, archive = bank.loans, bank.loan_archive
+    assert all(loan.status == "active" for loan in book)
+    assert len(archive) > 0
+    assert set(archive.column("status").tolist()) == {1, 2}  # repaid, defaulted
+    assert np.all(archive.column("closed_month") == 7)
+    assert not np.intersect1d(archive.column("loan_id"), book.column("loan_id")).size
+    defaulted = archive.column("original_balance")[archive.status_mask("defaulted")].sum()
+    assert bank.loan_metrics["nonperforming_balance"] == defaulted
+
+
+def test_archive_and_history_retention_are_configurable() -> None:
+    model = _make_model({"banking": {"loan_archive": False, "metrics_history_months": 3}})
+    bank = model.bank
+    assert bank.loan_archive is None
+    assert bank.request_loan(model.households[0], 1_000.0, term_months=1)
+    for month in range(1, 6):
+        model.month = month
+        bank.step()
+    assert len(bank.loans) == 0
+    assert isinstance(bank.loan_metrics_history, deque)
+    assert [row["month"] for row in bank.loan_metrics_history] == [3, 4, 5]
+
+    bank.set_bounded_memory(history_months=12)
+    assert bank.loan_metrics_history.maxlen == 3
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import pickle
+
+import numpy as np
+import pytest
+
+from tests.test_bank import _make_model
+
+
+def _applications(model):
+    households = list(model.households)
+    firm = model.firms[0]
+    firm.equity = 4_000.0
+    for i, hh in enumerate(households):
+        hh.employed = i % 3 != 0
+        hh.wage = 2_500.0 + 100.0 * i
+        hh.debt = (0.0, 40_000.0, 120_000.0)[i % 3]
+    borrowers = households[:8] + [households[1], firm, firm]
+    amounts = np.array(
+        [3_000.0, 150_000.0, 9_000.0, 80_000.0, 2_000.0, 500.0, 60_000.0, 7_000.0, 5_000.0, 10_000.0, 30_000.0]
+    )
+    types = ["household"] * 9 + ["firm", "firm"]
+    purposes = ["general", "mortgage", "general", "mortgage", "buffer_top_up", "general", "mortgage"]
+    purposes += ["general", "general", "startup", "investment"]
+    terms = np.array([24, 300, 0, 240, 24, 12, 300, 36, 24, 60, 48])
+    return borrowers, amounts, types, purposes, terms
+
+
+def _outcome(model):
+    bank = model.bank
+    return (
+        [(loan.borrower.unique_id, loan.balance, loan.purpose, loan.term_months) for loan in bank.loans],
+        bank.total_loans,
+        bank.total_deposits,
+        [(hh.cash, hh.debt) for hh in model.households],
+    )
+
+
+@pytest.mark.parametrize("engine", ["agents", "vectorized"])
+@pytest.mark.parametrize("equity", [1e9, 15_000.0])
+def test_batch_matches_sequential_requests(engine: str, equity: float) -> None:
+    model = _make_model({"agents": {"households": 10, "firms": 2}, "simulation": {"household_engine": engine}})
+    model.bank.equity = equity  # pieni oma pääoma: pääomaehto katkaisee hyväksynnät kesken erän
+    reference = pickle.loads(pickle.dumps(model))
+
+    approved = model.bank.request_loans_batch(*_batch_args(model))
+    expected = [
+        reference.bank.request_loan(b, float(a), borrower_type=t, term_months=int(m), purpose=p)
+        for b, a, t, p, m in zip(*_applications(reference))
+    ]
+
+    assert approved.tolist() == expected
+    assert 0 < sum(expected) < len(expected)
+    assert _outcome(model) == _outcome(reference)
+    assert model.bank.loan_metrics == reference.bank.loan_metrics
+
+
+def _batch_args(model):
+    borrowers, amounts, types, purposes, terms = _applications(model)
+    return borrowers, amounts, types, terms, purposes
+
+
+def test_priority_decides_who_gets_scarce_capital() -> None:
+    model = _make_model({"agents": {"households": 4, "firms": 1}})
+    bank = model.bank
+    households = list(model.households)
+    for hh in households:
+        hh.employed, hh.wage, hh.debt = True, 5_000.0, 0.0
+    bank.equity = bank.capital_ratio_min * (bank.total_loans + 10_000.0)  # tilaa yhdelle lainalle
+    amounts = np.full(3, 10_000.0)
+
+    approved = bank.request_loans_batch(households[:3], amounts, priority=np.array([1.0, 3.0, 2.0]))
+
+    assert approved.tolist() == [False, True, False]
+    assert bank.loans[-1].borrower is households[1]
+
+
+def test_stop_lending_rejects_whole_batch() -> None:
+    model = _make_model()
+    model.bank.stop_lending = True
+    approved = model.bank.request_loans_batch(list(model.households), np.array([1_000.0]))
+    assert not approved.any() and len(model.bank.loans) == 0
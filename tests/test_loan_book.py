@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import pickle
+
+import numpy as np
+import pytest
+
+from agents.bank import BankAgent, LoanRecord
+from tests.test_bank import _make_model
+
+
+def _reference_collect(bank: BankAgent) -> None:
+    """Aiempi lainakohtainen sääntö (v0.3), vertailukohdaksi."""
+    for loan in list(bank.loans):
+        if loan.status != "active":
+            continue
+        if loan.balance <= 1e-6:
+            loan.status = "repaid"
+            continue
+        if loan.age_months == 0:
+            loan.age_months += 1
+            continue
+        payment = bank._annuity_payment(loan.balance, loan.monthly_rate, loan.remaining_term)
+        interest_due = loan.balance * loan.monthly_rate
+        total_due = interest_due + max(payment - interest_due, 0.0)
+        paid = loan.borrower.pay_debt(total_due)
+        if paid + 1e-9 < interest_due:
+            balance = loan.balance
+            bank.total_loans = max(0.0, bank.total_loans - balance)
+            bank.cash_reserves += balance * bank.default_recovery_rate
+            bank.equity -= balance * (1.0 - bank.default_recovery_rate)
+            bank.total_defaulted += balance * (1.0 - bank.default_recovery_rate)
+            loan.borrower.decrease_debt(balance)
+            loan.balance = 0.0
+            loan.remaining_term = 0
+            loan.status = "defaulted"
+            continue
+        interest_paid = min(interest_due, paid)
+        principal_paid = max(0.0, paid - interest_paid)
+        loan.balance -= principal_paid
+        loan.remaining_term = max(loan.remaining_term - 1, 0)
+        loan.age_months += 1
+        loan.borrower.decrease_debt(principal_paid)
+        bank.total_loans = max(0.0, bank.total_loans - principal_paid)
+        bank.total_deposits = max(0.0, bank.total_deposits - paid)
+        bank.cash_reserves += paid
+        bank.equity += interest_paid
+        if loan.balance <= 1e-6 or loan.remaining_term <= 0:
+            loan.status = "repaid"
+
+
+def _book_with_shortfalls():
+    model = _make_model({"agents": {"households": 12, "firms": 2}})
+    bank = model.bank
+    rng = np.random.default_rng(8)
+    households = list(model.households)[:12]
+    for i in range(60):
+        hh = households[int(rng.integers(len(households)))]
+        bank.loans.append(
+            LoanRecord(
+                borrower=hh,
+                borrower_type="household",
+                balance=float(rng.uniform(1_000.0, 20_000.0)),
+                annual_rate=0.05,
+                term_months=24,
+                remaining_term=int(rng.integers(1, 24)),
+                age_months=int(rng.integers(0, 3)),
+                purpose=("mortgage", "general")[i % 2],
+            )
+        )
+    # Viimeinen erä: maksetaan loppuun
+    bank.loans.append(LoanRecord(households[0], "household", 5_000.0, 0.05, 24, 1, age_months=3))
+    firm = model.firms[-1]
+    bank.loans.append(LoanRecord(firm, "firm", 50_000.0, 0.045, 48, 48, age_months=5, purpose="investment"))
+    # Osa maksaa kaiken, osa osan, osa ei mitään, yhdellä negatiivinen kassa
+    for i, hh in enumerate(households):
+        hh.cash = (50_000.0, 2_500.0, 0.0, -300.0)[i % 4]
+    firm.cash = 1_000.0
+    return model
+
+
+def test_vectorized_collection_matches_per_loan_rule() -> None:
+    model = _book_with_shortfalls()
+    reference = pickle.loads(pickle.dumps(model))
+
+    model.bank._collect_payments()
+    _reference_collect(reference.bank)
+
+    for loan, ref in zip(model.bank.loans, reference.bank.loans):
+        assert loan.status == ref.status
+        assert loan.balance == pytest.approx(ref.balance)
+        assert (loan.remaining_term, loan.age_months) == (ref.remaining_term, ref.age_months)
+    assert {loan.status for loan in model.bank.loans} == {"active", "repaid", "defaulted"}
+    for hh, ref in zip(model.households, reference.households):
+        assert hh.cash == pytest.approx(ref.cash)
+        assert hh.debt == pytest.approx(ref.debt)
+        assert hh.debt_service_reserve == pytest.approx(ref.debt_service_reserve)
+    assert model.firms[-1].cash == pytest.approx(reference.firms[-1].cash)
+    for name in ("total_loans", "total_deposits", "cash_reserves", "equity", "total_defaulted"):
+        assert getattr(model.bank, name) == pytest.approx(getattr(reference.bank, name))
+
+
+def test_views_follow_rows_through_pruning() -> None:
+    model = _book_with_shortfalls()
+    bank = model.bank
+    first, last = bank.loans[0], bank.loans[-1]
+    assert bank.loans[-1] is last and last.borrower is model.firms[-1]
+
+    last.balance = 123.0
+    assert bank.loans.balance[len(bank.loans) - 1] == 123.0
+    first.status = "repaid"
+    bank.prune_closed_loans()
+
+    assert first.status == "repaid" and first.borrower is not None  # irrotettu arvoineen
+    assert bank.loans[-1] is last and last.balance == 123.0
+    assert all(loan.status == "active" for loan in bank.loans)
+
+
+def test_metrics_report_purposes_in_order_of_appearance() -> None:
+    model = _book_with_shortfalls()
+    bank = model.bank
+    bank._update_loan_metrics()
+    purposes = [key for key in bank.loan_metrics if key.startswith("purpose_")]
+    assert purposes[:3] == ["purpose_mortgage_share", "purpose_general_share", "purpose_investment_share"]
+    assert sum(bank.loan_metrics[key] for key in purposes) == pytest.approx(1.0)
+    active = [loan for loan in bank.loans if loan.status == "active" and loan.balance > 0]
+    assert bank.loan_metrics["active_balance"] == pytest.approx(sum(loan.balance for loan in active))
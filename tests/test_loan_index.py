@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from agents.bank import BankAgent
+from tests.test_loan_book import _book_with_shortfalls
+
+
+def _brute_force_payment(bank: BankAgent, borrower) -> float:
+    """Aiempi koko lainakannan läpikäynti, vertailukohdaksi."""
+    return sum(
+        bank._annuity_payment(loan.balance, loan.monthly_rate, loan.remaining_term)
+        for loan in bank.loans
+        if loan.borrower is borrower and loan.status == "active"
+    )
+
+
+def _borrowers(model):
+    return list(model.households)[:12] + [model.firms[-1]]
+
+
+def test_cached_payments_follow_origination_and_collection() -> None:
+    model = _book_with_shortfalls()
+    bank = model.bank
+    hh = list(model.households)[3]
+    bank.loans.add(hh, "household", 8_000.0, 0.04, 36, purpose="general")
+
+    for _ in range(3):
+        for borrower in _borrowers(model):
+            assert bank.expected_payment_for(borrower) == pytest.approx(_brute_force_payment(bank, borrower))
+        bank._collect_payments()
+        bank.prune_closed_loans()
+
+    payments = bank.expected_payments_by_row(model.household_population.size)
+    for borrower in list(model.households)[:12]:
+        assert payments[borrower._row] == pytest.approx(_brute_force_payment(bank, borrower))
+
+
+def test_index_lists_only_active_loans_after_pruning() -> None:
+    model = _book_with_shortfalls()
+    bank = model.bank
+    bank._collect_payments()
+    bank.prune_closed_loans()
+    book = bank.loans
+
+    for borrower in _borrowers(model):
+        rows = book.rows_for(borrower.unique_id)
+        expected = [i for i, loan in enumerate(book) if loan.borrower is borrower and loan.status == "active"]
+        assert rows.tolist() == expected
+
+
+def test_view_writes_update_index_and_payment() -> None:
+    model = _book_with_shortfalls()
+    bank = model.bank
+    firm = model.firms[-1]
+    loan = bank.loans[int(bank.loans.rows_for(firm.unique_id)[0])]
+
+    loan.balance = 10_000.0
+    assert bank.expected_payment_for(firm) == pytest.approx(_brute_force_payment(bank, firm))
+    loan.status = "repaid"
+    assert bank.loans.rows_for(firm.unique_id).size == 0
+    assert bank.expected_payment_for(firm) == 0.0
+    loan.status = "active"
+    assert bank.expected_payment_for(firm) == pytest.approx(_brute_force_payment(bank, firm))
+
+
+def test_firm_bankruptcy_defaults_only_that_firms_loans() -> None:
+    model = _book_with_shortfalls()
+    bank = model.bank
+    firm = model.firms[-1]
+    bank.request_loan(firm, 5_000.0, borrower_type="firm", term_months=12, purpose="investment")
+    firm_rows = bank.loans.rows_for(firm.unique_id)
+    others_before = int(np.sum(bank.loans.column("status") == 0)) - firm_rows.size
+    assert firm_rows.size >= 1
+
+    bank.handle_firm_bankruptcy(firm, recovery_value=1_000.0)
+
+    assert all(bank.loans[int(row)].status == "defaulted" for row in firm_rows)
+    assert bank.expected_payment_for(firm) == 0.0
+    assert bank.loans.rows_for(firm.unique_id).size == 0
+    assert int(np.sum(bank.loans.column("status") == 0)) == others_before
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import pytest
+
+from agents.bank import BankAgent
+from tests.test_loan_book import _book_with_shortfalls
+
+
+def _reference_metrics(bank: BankAgent, pruned_defaulted: float = 0.0) -> dict[str, float]:
+    """Aiempi koko lainakannan läpikäynti, vertailukohdaksi."""
+    active = [loan for loan in bank.loans if loan.status == "active" and loan.balance > 0]
+    outstanding = sum(loan.balance for loan in active)
+    defaulted = pruned_defaulted + sum(loan.original_balance for loan in bank.loans if loan.status == "defaulted")
+    metrics = {
+        "active_balance": outstanding,
+        "performing_share": outstanding / (outstanding + defaulted) if outstanding + defaulted > 0 else 1.0,
+        "nonperforming_balance": defaulted,
+        "avg_active_age": sum(loan.age_months for loan in active) / len(active) if active else 0.0,
+    }
+    for label, _, _ in bank._loan_age_buckets:
+        metrics[f"age_bucket_{label}_share"] = 0.0
+    for loan in active:
+        key = f"age_bucket_{bank._loan_age_bucket_label(loan.age_months)}_share"
+        metrics[key] += loan.balance / outstanding
+        key = f"purpose_{loan.purpose}_share"
+        metrics[key] = metrics.get(key, 0.0) + loan.balance / outstanding
+    return metrics
+
+
+def _assert_metrics_match(bank: BankAgent, pruned_defaulted: float = 0.0) -> None:
+    bank._update_loan_metrics()
+    expected = _reference_metrics(bank, pruned_defaulted)
+    assert set(bank.loan_metrics) == set(expected)
+    for key, value in expected.items():
+        assert bank.loan_metrics[key] == pytest.approx(value, abs=1e-9), key
+
+
+def test_running_totals_match_full_scan_through_loan_events() -> None:
+    model = _book_with_shortfalls()
+    bank = model.bank
+    households = list(model.households)[:12]
+    firm = model.firms[-1]
+    _assert_metrics_match(bank)
+
+    bank.loans.add(households[1], "household", 9_000.0, 0.04, 36, purpose="car")
+    _assert_metrics_match(bank)
+    bank._collect_payments()
+    _assert_metrics_match(bank)
+
+    bank.loans[0].balance = 777.0
+    bank.loans[1].status = "defaulted"
+    _assert_metrics_match(bank)
+    bank.handle_firm_bankruptcy(firm, recovery_value=2_000.0)
+    _assert_metrics_match(bank)
+
+    defaulted_before_pruning = sum(loan.original_balance for loan in bank.loans if loan.status == "defaulted")
+    bank.prune_closed_loans()
+    for _ in range(8):
+        bank._collect_payments()
+        _assert_metrics_match(bank, defaulted_before_pruning)
+
+
+def test_loans_migrate_between_age_buckets_as_they_age() -> None:
+    model = _book_with_shortfalls()
+    bank = model.bank
+    for loan in list(bank.loans):
+        loan.status = "repaid"
+    hh = list(model.households)[0]
+    hh.cash = 1e9
+    bank.loans.add(hh, "household", 12_000.0, 0.0, 120, age_months=4)
+
+    bank._collect_payments()
+    assert bank.loan_metrics["age_bucket_0_6_share"] == pytest.approx(1.0)
+    bank._collect_payments()
+    assert bank.loan_metrics["age_bucket_0_6_share"] == 0.0
+    assert bank.loan_metrics["age_bucket_6_12_share"] == pytest.approx(1.0)
+    assert bank.loan_metrics["avg_active_age"] == 6.0
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from agents.loans import annuity_factor, annuity_payments
+from tests.test_bank import _make_model
+
+
+def _recomputed(book) -> np.ndarray:
+    rows = book.active_rows()
+    return annuity_payments(book.balance[rows], book.annual_rate[rows] / 12.0, book.remaining_term[rows])
+
+
+def test_installment_stays_on_schedule_through_full_payments() -> None:
+    model = _make_model({"agents": {"households": 4, "firms": 1}})
+    bank = model.bank
+    hh = model.households[0]
+    hh.cash = 1e7
+    row = bank.loans.add(hh, "household", 50_000.0, 0.05, 36, age_months=1)
+    installment = bank.loans.installment[row]
+
+    for _ in range(35):
+        bank._collect_payments()
+        assert bank.loans.installment[row] == installment
+        assert np.allclose(bank.loans.installment[bank.loans.active_rows()], _recomputed(bank.loans), rtol=1e-9)
+    bank._collect_payments()
+    assert bank.loans[row].status == "repaid"
+    assert bank.loans.balance[row] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_partial_payment_and_restructuring_reschedule() -> None:
+    model = _make_model({"agents": {"households": 4, "firms": 1}})
+    bank = model.bank
+    hh = model.households[0]
+    row = bank.loans.add(hh, "household", 50_000.0, 0.05, 36, age_months=1)
+    loan = bank.loans[row]
+    installment = loan.installment
+    interest = 50_000.0 * 0.05 / 12.0
+    hh.cash = interest + 0.5 * (installment - interest)  # korko ja puolet lyhennyksestä
+    hh.debt_service_reserve = 0.0
+
+    bank._collect_payments()
+    assert loan.status == "active"
+    assert loan.installment != installment
+    assert loan.installment == pytest.approx(bank._annuity_payment(loan.balance, loan.monthly_rate, loan.remaining_term))
+
+    loan.remaining_term = 120  # uudelleenjärjestely
+    assert loan.installment == pytest.approx(bank._annuity_payment(loan.balance, loan.monthly_rate, 120))
+    assert bank.expected_payment_for(hh) == pytest.approx(loan.installment)
+
+
+def test_annuity_factors_are_shared_between_approval_checks() -> None:
+    model = _make_model()
+    bank = model.bank
+    annuity_factor.cache_clear()
+    for amount in (1_000.0, 2_000.0, 3_000.0):
+        bank._annuity_payment(amount, 0.004, 240)
+    info = annuity_factor.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
+    assert bank._annuity_payment(1_200.0, 0.0, 12) == 100.0
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import random
+
+import pandas as pd
+import pytest
+
+from output.reporters import MODEL_REPORTER_GROUPS
+from tests.test_bank import _make_model
+
+
+def _output(output_cfg: dict) -> dict:
+    return {"agents": {"households": 20, "firms": 3}, "output": output_cfg}
+
+
+def test_group_cadences_and_final_only_groups() -> None:
+    model = _make_model(
+        _output(
+            {
+                "model_reporters": ["core", "bank", "state"],
+                "cadence": {"bank": "quarterly", "state": "final"},
+                "agent_reporters": {"enabled": False},
+            }
+        )
+    )
+    model.run_for_months(7)
+
+    df = model.get_results()["model"]
+    assert "avg_house_price" not in df.columns
+    assert list(df["month"]) == list(range(1, 8))
+    assert df["bank_total_loans"].notna().tolist() == [m % 3 == 0 for m in range(1, 8)]
+    assert df["state_vat"].notna().sum() == 1
+    assert df["state_vat"].iloc[-1] == pytest.approx(model.state.vat_revenue)
+    assert model.get_results()["agents"].empty
+
+
+def test_summary_only_collects_single_final_row() -> None:
+    model = _make_model(_output({"summary_only": True}))
+    model.run_for_months(5)
+    model.run_for_months(2)
+
+    df = model.get_results()["model"]
+    assert len(df) == 1
+    assert int(df["month"].iloc[0]) == 7
+    assert set(MODEL_REPORTER_GROUPS["housing"]) <= set(df.columns)
+
+
+def test_agent_collection_can_be_thinned() -> None:
+    model = _make_model(
+        _output({"agent_reporters": {"every_months": 2, "sample_share": 0.5, "fields": ["cash"]}})
+    )
+    model.run_for_months(4)
+
+    agent_df = model.get_results()["agents"]
+    assert list(agent_df.columns) == ["cash"]
+    assert set(agent_df.index.get_level_values("Step")) == {2, 4}
+    assert all(uid % 2 == 0 for uid in agent_df.index.get_level_values("AgentID"))
+
+
+def test_unknown_reporter_raises() -> None:
+    with pytest.raises(ValueError):
+        _make_model(_output({"model_reporters": ["no_such_metric"]}))
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_streamed_results_match_in_memory_results(tmp_path, fmt: str) -> None:
+    pytest.importorskip("pyarrow")
+    output_cfg = {"cadence": {"state": "final"}}
+    in_memory = _make_model(_output(output_cfg))
+    streamed = _make_model(
+        _output({**output_cfg, "sink": {"path": str(tmp_path / "run"), "format": fmt, "chunk_rows": 50}})
+    )
+    # Sama satunnaistila molemmille ajoille (age_one_month käyttää globaalia randomia)
+    random.seed(11)
+    in_memory.run_for_months(6)
+    random.seed(11)
+    streamed.run_for_months(6)
+    streamed.datacollector.close()
+
+    from output.sink import read_results
+
+    expected = in_memory.get_results()
+    actual = read_results(tmp_path / "run")
+    pd.testing.assert_frame_equal(actual["model"], expected["model"], check_dtype=False)
+    pd.testing.assert_frame_equal(actual["agents"], expected["agents"], check_dtype=False)
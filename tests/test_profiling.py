@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from tests.test_bank import _make_model
+
+
+def _profiling(**simulation: bool) -> dict:
+    return {"agents": {"households": 20, "firms": 3}, "simulation": simulation}
+
+
+def test_phase_timings_are_recorded_per_month() -> None:
+    model = _make_model(_profiling(profile_phases=True, profile_agent_types=True))
+    model.run_for_months(3)
+
+    timings = model.get_results()["timings"]
+    assert list(timings["month"]) == [1, 2, 3]
+    for phase in ("labor_market", "firms", "households", "bank", "housing_market", "data_collection"):
+        assert (timings[phase] > 0).all()
+    assert (timings["firms.construction"] > 0).all()
+    top_level = timings.drop(columns=["month", "total"]).filter(regex=r"^[^.]+$")
+    assert (top_level.sum(axis=1) - timings["total"]).abs().max() < 1e-9
+
+    summary = model.phase_timer.summary()
+    assert abs(summary["share"].loc[top_level.columns].sum() - 1.0) < 1e-9
+
+
+def test_disabled_timer_records_nothing() -> None:
+    model = _make_model(_profiling())
+    model.run_for_months(2)
+    assert model.get_results()["timings"].empty
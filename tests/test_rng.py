@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pytest
+
+from core.model import EconomyModel
+from core.rng import CounterRNG, RandomStream, philox4x32
+from tests.test_bank import _make_config
+
+
+def test_philox_known_answers() -> None:
+    # Random123:n tarkistusvektorit (philox4x32-10)
+    assert philox4x32((0, 0, 0, 0), (0, 0)) == (0x6627E8D5, 0xE169C58D, 0xBC57AC4C, 0x9B00DBD8)
+    assert philox4x32((0xFFFFFFFF,) * 4, (0xFFFFFFFF,) * 2) == (0x408F276D, 0x41C83B0E, 0xA20BC7C6, 0x6D5451FD)
+    assert philox4x32(
+        (0x243F6A88, 0x85A308D3, 0x13198A2E, 0x03707344), (0xA4093822, 0x299F31D0)
+    ) == (0xD16CFE09, 0x94FDCCEB, 0x5001E420, 0x24126EA1)
+
+
+def test_draws_are_pure_functions_of_their_keys() -> None:
+    stream = RandomStream(7, "household.death")
+    ids = np.array([0, 1, 5, 2**40 + 3], dtype=np.int64)
+    vector = stream.randoms(ids, month=12)
+    assert list(vector) == [stream.random(int(i), 12) for i in ids]
+    assert list(stream.randoms(ids[::-1], month=12)) == list(vector[::-1])
+    assert ((vector >= 0.0) & (vector < 1.0)).all()
+
+    assert stream.random(1, 12) != stream.random(1, 13)
+    assert stream.random(1, 12) != stream.random(1, 12, index=1)
+    assert stream.random(1, 12) != RandomStream(7, "household.birth").random(1, 12)
+    assert stream.random(1, 12) != RandomStream(8, "household.death").random(1, 12)
+
+
+def test_shuffle_and_sample_ignore_input_order() -> None:
+    stream = CounterRNG(3).stream("labor.queue")
+    items = list(range(50))
+    first, second = list(items), list(reversed(items))
+    stream.shuffle(first, 4, key=int)
+    stream.shuffle(second, 4, key=int)
+    assert first == second and first != items
+    assert stream.sample(items, 5, 4, key=int) == first[:5]
+    with pytest.raises(ValueError):
+        stream.sample(items, 51, 4, key=int)
+
+
+def _config(engine: str) -> dict:
+    return _make_config(
+        {
+            "agents": {"households": 40, "firms": 3},
+            "simulation": {"household_engine": engine, "rng": "counter"},
+            "households": {"initial_age_max": 80, "death_prob_per_year": 0.05, "birth_rate_per_year": 0.05},
+        }
+    )
+
+
+@pytest.mark.parametrize("engine", ["agents", "vectorized"])
+def test_counter_mode_does_not_depend_on_global_random(engine: str) -> None:
+    results = []
+    for global_seed in (1, 2):
+        random.seed(global_seed)
+        model = EconomyModel(config=_config(engine), seed=11)
+        model.run_for_months(24)
+        results.append(model.get_results()["model"])
+    assert results[0].equals(results[1])
+
+
+def test_labor_market_matching_is_order_independent() -> None:
+    outcomes = []
+    for reverse in (False, True):
+        model = EconomyModel(config=_config("agents"), seed=11)
+        for firm in model.firms:
+            firm.target_employees = max(0, len(firm.employees) - 3)
+        model.firms[-1].target_employees += 8
+        if reverse:
+            model.households._items.reverse()
+            for firm in model.firms:
+                firm.employees.reverse()
+        before = {hh.unique_id: getattr(hh.employer, "unique_id", None) for hh in model.households}
+        model._run_labor_market()
+        outcomes.append(
+            {hh.unique_id: getattr(hh.employer, "unique_id", None) for hh in model.households}
+        )
+    assert outcomes[0] != before
+    assert outcomes[0] == outcomes[1]
+
+
+def test_unknown_rng_mode_is_rejected() -> None:
+    cfg = _config("agents")
+    cfg["simulation"]["rng"] = "mersenne"
+    with pytest.raises(ValueError):
+        EconomyModel(config=cfg, seed=1)
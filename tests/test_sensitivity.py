@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from experiments.sensitivity import ParameterRange, SensitivityStudy, run_study, sobol_indices
+from tests.test_bank import _make_config
+
+
+def test_sobol_indices_recover_ishigami_reference_values() -> None:
+    params = [ParameterRange(f"x{i}", -np.pi, np.pi) for i in range(3)]
+    study = SensitivityStudy(parameters=params, metrics=["y"], base_samples=1024, seed=1, bootstrap=0)
+    x = study.design()
+    y = np.sin(x[:, 0]) + 7 * np.sin(x[:, 1]) ** 2 + 0.1 * x[:, 2] ** 4 * np.sin(x[:, 0])
+
+    indices = sobol_indices(study, pd.DataFrame({"y": y})).loc["y"]
+
+    assert indices["S1"].to_numpy() == pytest.approx([0.314, 0.442, 0.0], abs=0.05)
+    assert indices["ST"].to_numpy() == pytest.approx([0.558, 0.442, 0.244], abs=0.05)
+
+
+def test_study_resumes_from_cache_after_interruption(tmp_path) -> None:
+    cfg = _make_config({"agents": {"households": 10, "firms": 2}})
+    study = SensitivityStudy(
+        parameters=[
+            ParameterRange("taxes.income_flat_rate", 0.05, 0.3),
+            ParameterRange("wages.initial", 2000.0, 4000.0),
+        ],
+        metrics=["unemployment_rate", "state_balance"],
+        method="morris",
+        base_samples=2,
+        n_months=2,
+        chunk_size=2,
+    )
+
+    first = run_study(cfg, study, tmp_path, workers=1)
+    assert len(first.outputs) == 6
+    assert set(first.indices.columns) == {"mu", "mu_star", "sigma"}
+
+    # Simuloi keskeytys: viimeinen pala katosi ennen kirjausta
+    cache_path = tmp_path / "evaluations.jsonl"
+    lines = cache_path.read_text(encoding="utf-8").splitlines()
+    cache_path.write_text("\n".join(lines[:-2]) + "\n", encoding="utf-8")
+
+    progress: list[tuple[int, int]] = []
+    resumed = run_study(cfg, study, tmp_path, workers=1, progress=lambda d, t: progress.append((d, t)))
+
+    assert progress[0] == (len(lines) - 2, len(lines))
+    pd.testing.assert_frame_equal(resumed.outputs, first.outputs)
+    assert len(cache_path.read_text(encoding="utf-8").splitlines()) == len(lines)
+
+    other = SensitivityStudy(**{**study.to_dict(), "parameters": study.parameters, "seed": 5})
+    with pytest.raises(ValueError):
+        run_study(cfg, other, tmp_path, workers=1)
+    assert json.loads((tmp_path / "study.json").read_text())["study"]["seed"] == 0